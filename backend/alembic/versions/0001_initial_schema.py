@@ -0,0 +1,185 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 16:27:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENUM_TYPES = [
+    'importjobkind', 'importmode', 'importjobstatus', 'projectstatus',
+    'resourcetype', 'resourcestatus', 'taskstatus', 'taskpriority',
+]
+
+# import_jobs creates the type; import_files only refers to it.
+IMPORT_JOB_KIND = sa.Enum('CSV', 'EXCEL', 'PARQUET', name='importjobkind').with_variant(
+    postgresql.ENUM('CSV', 'EXCEL', 'PARQUET', name='importjobkind', create_type=False),
+    'postgresql',
+)
+
+
+def upgrade() -> None:
+    op.create_table('import_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.Enum('CSV', 'EXCEL', 'PARQUET', name='importjobkind'), nullable=False),
+    sa.Column('mode', sa.Enum('INSERT', 'UPSERT', name='importmode'), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED', 'CANCELLED', 'INTERRUPTED', name='importjobstatus'), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('file_path', sa.String(length=1024), nullable=True),
+    sa.Column('content_hash', sa.String(length=64), nullable=True),
+    sa.Column('created_by', sa.String(length=255), nullable=True),
+    sa.Column('progress', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('cancel_requested', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_import_jobs_content_hash'), 'import_jobs', ['content_hash'], unique=False)
+    op.create_index(op.f('ix_import_jobs_id'), 'import_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_import_jobs_status'), 'import_jobs', ['status'], unique=False)
+    op.create_table('projects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('PLANNING', 'IN_PROGRESS', 'ON_HOLD', 'COMPLETED', 'CANCELLED', name='projectstatus'), nullable=True),
+    sa.Column('start_date', sa.DateTime(), nullable=True),
+    sa.Column('planned_end_date', sa.DateTime(), nullable=True),
+    sa.Column('actual_end_date', sa.DateTime(), nullable=True),
+    sa.Column('total_budget', sa.Float(), nullable=True),
+    sa.Column('spent_amount', sa.Float(), nullable=True),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_projects_id'), 'projects', ['id'], unique=False)
+    op.create_index(op.f('ix_projects_name'), 'projects', ['name'], unique=False)
+    op.create_table('budgets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('planned_amount', sa.Float(), nullable=True),
+    sa.Column('actual_amount', sa.Float(), nullable=True),
+    sa.Column('budget_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_budgets_id'), 'budgets', ['id'], unique=False)
+    op.create_table('import_files',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('kind', IMPORT_JOB_KIND, nullable=False),
+    sa.Column('mode', sa.String(length=16), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=True),
+    sa.Column('stats', sa.JSON(), nullable=True),
+    sa.Column('imported_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['import_jobs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_import_files_content_hash'), 'import_files', ['content_hash'], unique=True)
+    op.create_index(op.f('ix_import_files_id'), 'import_files', ['id'], unique=False)
+    op.create_table('project_rollups',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('total_tasks', sa.Integer(), nullable=False),
+    sa.Column('not_started_tasks', sa.Integer(), nullable=False),
+    sa.Column('in_progress_tasks', sa.Integer(), nullable=False),
+    sa.Column('completed_tasks', sa.Integer(), nullable=False),
+    sa.Column('delayed_tasks', sa.Integer(), nullable=False),
+    sa.Column('blocked_tasks', sa.Integer(), nullable=False),
+    sa.Column('overdue_candidate_tasks', sa.Integer(), nullable=False),
+    sa.Column('total_resources', sa.Integer(), nullable=False),
+    sa.Column('material_resources', sa.Integer(), nullable=False),
+    sa.Column('equipment_resources', sa.Integer(), nullable=False),
+    sa.Column('labor_resources', sa.Integer(), nullable=False),
+    sa.Column('material_cost', sa.Float(), nullable=False),
+    sa.Column('equipment_cost', sa.Float(), nullable=False),
+    sa.Column('labor_cost', sa.Float(), nullable=False),
+    sa.Column('budget_lines', sa.Integer(), nullable=False),
+    sa.Column('budget_planned', sa.Float(), nullable=False),
+    sa.Column('budget_actual', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+    op.create_table('resources',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('resource_type', sa.Enum('MATERIAL', 'EQUIPMENT', 'LABOR', name='resourcetype'), nullable=False),
+    sa.Column('status', sa.Enum('AVAILABLE', 'IN_USE', 'DEPLETED', 'MAINTENANCE', name='resourcestatus'), nullable=True),
+    sa.Column('quantity', sa.Float(), nullable=True),
+    sa.Column('unit', sa.String(length=50), nullable=True),
+    sa.Column('unit_cost', sa.Float(), nullable=True),
+    sa.Column('total_cost', sa.Float(), nullable=True),
+    sa.Column('supplier', sa.String(length=255), nullable=True),
+    sa.Column('allocated_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_resources_id'), 'resources', ['id'], unique=False)
+    op.create_table('tasks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('NOT_STARTED', 'IN_PROGRESS', 'COMPLETED', 'DELAYED', 'BLOCKED', name='taskstatus'), nullable=True),
+    sa.Column('priority', sa.Enum('LOW', 'MEDIUM', 'HIGH', 'CRITICAL', name='taskpriority'), nullable=True),
+    sa.Column('start_date', sa.DateTime(), nullable=True),
+    sa.Column('planned_end_date', sa.DateTime(), nullable=True),
+    sa.Column('actual_end_date', sa.DateTime(), nullable=True),
+    sa.Column('progress_percentage', sa.Float(), nullable=True),
+    sa.Column('assigned_to', sa.String(length=255), nullable=True),
+    sa.Column('depends_on_task_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['depends_on_task_id'], ['tasks.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tasks_id'), 'tasks', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tasks_id'), table_name='tasks')
+    op.drop_table('tasks')
+    op.drop_index(op.f('ix_resources_id'), table_name='resources')
+    op.drop_table('resources')
+    op.drop_table('project_rollups')
+    op.drop_index(op.f('ix_import_files_id'), table_name='import_files')
+    op.drop_index(op.f('ix_import_files_content_hash'), table_name='import_files')
+    op.drop_table('import_files')
+    op.drop_index(op.f('ix_budgets_id'), table_name='budgets')
+    op.drop_table('budgets')
+    op.drop_index(op.f('ix_projects_name'), table_name='projects')
+    op.drop_index(op.f('ix_projects_id'), table_name='projects')
+    op.drop_table('projects')
+    op.drop_index(op.f('ix_import_jobs_status'), table_name='import_jobs')
+    op.drop_index(op.f('ix_import_jobs_id'), table_name='import_jobs')
+    op.drop_index(op.f('ix_import_jobs_content_hash'), table_name='import_jobs')
+    op.drop_table('import_jobs')
+    
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        for name in ENUM_TYPES:
+            postgresql.ENUM(name=name).drop(bind, checkfirst=True)
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""query indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 16:28:13
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Enum columns store member names, so the predicate compares against
+# 'COMPLETED' rather than the 'completed' value.
+OPEN_TASKS = sa.text("status <> 'COMPLETED'")
+
+
+def upgrade() -> None:
+    # Databases created by create_all before Parquet imports existed are
+    # stamped at 0001 without this label.
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TYPE importjobkind ADD VALUE IF NOT EXISTS 'PARQUET'")
+    
+    op.create_index(op.f('ix_budgets_project_id'), 'budgets', ['project_id'], unique=False)
+    op.create_index('ix_resources_project_id_resource_type', 'resources', ['project_id', 'resource_type'], unique=False)
+    op.create_index('ix_tasks_project_id_status', 'tasks', ['project_id', 'status'], unique=False)
+    op.create_index('ix_tasks_assigned_to_status_planned_end_date', 'tasks', ['assigned_to', 'status', 'planned_end_date'], unique=False)
+    op.create_index('ix_tasks_open_project_id_planned_end_date', 'tasks', ['project_id', 'planned_end_date'], unique=False, postgresql_where=OPEN_TASKS, sqlite_where=OPEN_TASKS)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_open_project_id_planned_end_date', table_name='tasks')
+    op.drop_index('ix_tasks_assigned_to_status_planned_end_date', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_status', table_name='tasks')
+    op.drop_index('ix_resources_project_id_resource_type', table_name='resources')
+    op.drop_index(op.f('ix_budgets_project_id'), table_name='budgets')
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""cascade deletes and archive tables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 16:43:57
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# PostgreSQL's default names, which 0001 and create_all both produced. On
+# SQLite the same names are assigned to the reflected, unnamed constraints.
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+FOREIGN_KEYS = [
+    # table, column, referred table, ON DELETE
+    ('tasks', 'project_id', 'projects', 'CASCADE'),
+    ('tasks', 'depends_on_task_id', 'tasks', 'SET NULL'),
+    ('resources', 'project_id', 'projects', 'CASCADE'),
+    ('budgets', 'project_id', 'projects', 'CASCADE'),
+    ('project_rollups', 'project_id', 'projects', 'CASCADE'),
+]
+
+ARCHIVE_TABLES = ['archived_projects', 'archived_tasks', 'archived_resources', 'archived_budgets']
+
+
+def _existing_enum(name, *values):
+    # The archive columns reuse the live tables' enum types.
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), 'postgresql'
+    )
+
+
+def _replace_foreign_key(table, column, referred, ondelete):
+    name = f'{table}_{column}_fkey'
+    with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.create_foreign_key(name, referred, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    op.create_table('archived_budgets',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('category', sa.String(length=255), autoincrement=False, nullable=False),
+    sa.Column('description', sa.Text(), autoincrement=False, nullable=True),
+    sa.Column('planned_amount', sa.Float(), autoincrement=False, nullable=True),
+    sa.Column('actual_amount', sa.Float(), autoincrement=False, nullable=True),
+    sa.Column('budget_date', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('created_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('updated_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_budgets_project_id'), 'archived_budgets', ['project_id'], unique=False)
+    op.create_table('archived_projects',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(length=255), autoincrement=False, nullable=False),
+    sa.Column('description', sa.Text(), autoincrement=False, nullable=True),
+    sa.Column('status', _existing_enum('projectstatus', 'PLANNING', 'IN_PROGRESS', 'ON_HOLD', 'COMPLETED', 'CANCELLED'), autoincrement=False, nullable=True),
+    sa.Column('start_date', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('planned_end_date', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('actual_end_date', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('total_budget', sa.Float(), autoincrement=False, nullable=True),
+    sa.Column('spent_amount', sa.Float(), autoincrement=False, nullable=True),
+    sa.Column('location', sa.String(length=255), autoincrement=False, nullable=True),
+    sa.Column('created_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('updated_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('archived_resources',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(length=255), autoincrement=False, nullable=False),
+    sa.Column('resource_type', _existing_enum('resourcetype', 'MATERIAL', 'EQUIPMENT', 'LABOR'), autoincrement=False, nullable=False),
+    sa.Column('status', _existing_enum('resourcestatus', 'AVAILABLE', 'IN_USE', 'DEPLETED', 'MAINTENANCE'), autoincrement=False, nullable=True),
+    sa.Column('quantity', sa.Float(), autoincrement=False, nullable=True),
+    sa.Column('unit', sa.String(length=50), autoincrement=False, nullable=True),
+    sa.Column('unit_cost', sa.Float(), autoincrement=False, nullable=True),
+    sa.Column('total_cost', sa.Float(), autoincrement=False, nullable=True),
+    sa.Column('supplier', sa.String(length=255), autoincrement=False, nullable=True),
+    sa.Column('allocated_date', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('created_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('updated_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_resources_project_id'), 'archived_resources', ['project_id'], unique=False)
+    op.create_table('archived_tasks',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(length=255), autoincrement=False, nullable=False),
+    sa.Column('description', sa.Text(), autoincrement=False, nullable=True),
+    sa.Column('status', _existing_enum('taskstatus', 'NOT_STARTED', 'IN_PROGRESS', 'COMPLETED', 'DELAYED', 'BLOCKED'), autoincrement=False, nullable=True),
+    sa.Column('priority', _existing_enum('taskpriority', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL'), autoincrement=False, nullable=True),
+    sa.Column('start_date', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('planned_end_date', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('actual_end_date', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('progress_percentage', sa.Float(), autoincrement=False, nullable=True),
+    sa.Column('assigned_to', sa.String(length=255), autoincrement=False, nullable=True),
+    sa.Column('depends_on_task_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('created_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('updated_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_tasks_project_id'), 'archived_tasks', ['project_id'], unique=False)
+    
+    for table, column, referred, ondelete in FOREIGN_KEYS:
+        _replace_foreign_key(table, column, referred, ondelete)
+
+
+def downgrade() -> None:
+    for table, column, referred, _ in reversed(FOREIGN_KEYS):
+        _replace_foreign_key(table, column, referred, None)
+    
+    for table in reversed(ARCHIVE_TABLES):
+        op.drop_table(table)
\ No newline at end of file
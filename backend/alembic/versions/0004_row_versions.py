@@ -0,0 +1,38 @@
+"""row versions
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 17:02:41
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ['projects', 'tasks', 'resources', 'budgets']
+ARCHIVE_TABLES = ['archived_projects', 'archived_tasks', 'archived_resources', 'archived_budgets']
+
+
+def upgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    # Archive tables keep no defaults; the default only fills existing rows.
+    for table in ARCHIVE_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('version', server_default=None)
+
+
+def downgrade() -> None:
+    for table in reversed(ARCHIVE_TABLES + VERSIONED_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""rollup data version
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 19:41:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('project_rollups', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('project_rollups') as batch_op:
+        batch_op.drop_column('data_version')
\ No newline at end of file
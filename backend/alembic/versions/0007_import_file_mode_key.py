@@ -0,0 +1,33 @@
+"""import file mode key
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 22:05:41
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_import_files_content_hash', table_name='import_files')
+    op.create_index('ix_import_files_content_hash_mode', 'import_files', ['content_hash', 'mode'], unique=True)
+
+
+def downgrade() -> None:
+    # Keep the first entry per file so the hash can be unique again.
+    op.execute(
+        "DELETE FROM import_files WHERE id NOT IN "
+        "(SELECT MIN(id) FROM import_files GROUP BY content_hash)"
+    )
+    op.drop_index('ix_import_files_content_hash_mode', table_name='import_files')
+    op.create_index('ix_import_files_content_hash', 'import_files', ['content_hash'], unique=True)
\ No newline at end of file
@@ -1,6 +1,7 @@
 from app.auth.jwt_handler import create_access_token, verify_token
 from app.auth.dependencies import get_current_user, require_role
 from app.auth.demo_users import DEMO_USERS, get_user_by_username
+from app.auth.scoping import scope_to_user
 
 __all__ = [
     "create_access_token",
@@ -9,4 +10,5 @@ __all__ = [
     "require_role",
     "DEMO_USERS",
     "get_user_by_username",
+    "scope_to_user",
 ]
\ No newline at end of file
@@ -0,0 +1,27 @@
+from sqlalchemy import false
+from app.models.project import Project
+from app.models.task import Task
+from app.models.resource import Resource
+from app.models.budget import Budget
+
+
+def user_scope(model, current_user: dict):
+    # Same visibility as the list endpoints: managers see their managed
+    # projects, workers see their assigned tasks and no resources or budgets.
+    # None means the user is not restricted.
+    role = current_user["role"]
+    if role == "manager":
+        managed_projects = current_user.get("managed_projects", [])
+        column = model.id if model is Project else model.project_id
+        return column.in_(managed_projects)
+    elif role == "worker":
+        if model is Task:
+            return Task.assigned_to == current_user.get("worker_name")
+        elif model in (Resource, Budget):
+            return false()
+    return None
+
+
+def scope_to_user(stmt, model, current_user: dict):
+    scope = user_scope(model, current_user)
+    return stmt if scope is None else stmt.where(scope)
\ No newline at end of file
@@ -0,0 +1,15 @@
+from app.cache.backends import CacheBackend, InMemoryBackend, RedisBackend
+from app.cache.analytics_cache import AnalyticsCache, analytics_cache
+from app.cache.etag import make_etag, not_modified, row_marker, scope_etag
+
+__all__ = [
+    "CacheBackend",
+    "InMemoryBackend",
+    "RedisBackend",
+    "AnalyticsCache",
+    "analytics_cache",
+    "make_etag",
+    "not_modified",
+    "row_marker",
+    "scope_etag",
+]
\ No newline at end of file
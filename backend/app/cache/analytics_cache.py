@@ -0,0 +1,143 @@
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from app.cache.backends import CacheBackend, build_backend
+from app.config import settings
+
+GLOBAL_TAG = "all"
+EPOCH_TAG = "epoch"
+
+
+class AnalyticsCache:
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def scope_key(current_user: dict) -> str:
+        role = current_user["role"]
+        if role == "manager":
+            managed = sorted(current_user.get("managed_projects", []))
+            return f"manager:{','.join(str(pid) for pid in managed)}"
+        if role == "worker":
+            return f"worker:{current_user.get('worker_name')}"
+        return role
+    
+    @staticmethod
+    def project_tag(project_id: int) -> str:
+        return f"project:{project_id}"
+    
+    def tags_for(
+        self,
+        current_user: dict,
+        project_ids: Optional[Iterable[int]] = None,
+        global_scope: bool = False,
+    ) -> List[str]:
+        # Project-scoped entries depend only on those projects; anything that
+        # spans the whole portfolio (admin, worker views) depends on GLOBAL_TAG.
+        if global_scope:
+            return [GLOBAL_TAG]
+        if project_ids is not None:
+            return [self.project_tag(pid) for pid in sorted(set(project_ids))]
+        if current_user["role"] == "manager":
+            return [
+                self.project_tag(pid)
+                for pid in sorted(set(current_user.get("managed_projects", [])))
+            ]
+        return [GLOBAL_TAG]
+    
+    def build_key(
+        self,
+        endpoint: str,
+        current_user: dict,
+        params: Optional[Dict] = None,
+        project_ids: Optional[Iterable[int]] = None,
+        global_scope: bool = False,
+    ) -> str:
+        tags = [EPOCH_TAG] + self.tags_for(current_user, project_ids, global_scope)
+        generations = self.backend.get_counters([f"gen:{tag}" for tag in tags])
+        versions = ",".join(f"{tag}@{gen}" for tag, gen in zip(tags, generations))
+        
+        param_key = ""
+        if params:
+            param_key = ",".join(f"{k}={params[k]}" for k in sorted(params))
+        
+        return (
+            f"analytics:{endpoint}:{self.scope_key(current_user)}:"
+            f"{param_key}:{versions}"
+        )
+    
+    def get_or_compute(
+        self,
+        endpoint: str,
+        current_user: dict,
+        compute: Callable[[], Any],
+        params: Optional[Dict] = None,
+        project_ids: Optional[Iterable[int]] = None,
+        global_scope: bool = False,
+    ) -> Any:
+        key = self.build_key(endpoint, current_user, params, project_ids, global_scope)
+        value = self._lookup(key)
+        if value is not None:
+            return value
+        
+        value = compute()
+        self.backend.set(key, value, self.ttl)
+        return value
+    
+    async def get_or_compute_async(
+        self,
+        endpoint: str,
+        current_user: dict,
+        compute: Callable[[], Awaitable[Any]],
+        params: Optional[Dict] = None,
+        project_ids: Optional[Iterable[int]] = None,
+        global_scope: bool = False,
+    ) -> Any:
+        key = self.build_key(endpoint, current_user, params, project_ids, global_scope)
+        value = self._lookup(key)
+        if value is not None:
+            return value
+        
+        value = await compute()
+        self.backend.set(key, value, self.ttl)
+        return value
+    
+    def _lookup(self, key: str) -> Any:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return value
+    
+    def invalidate_project(self, project_id: int):
+        self.backend.incr_counter(f"gen:{self.project_tag(project_id)}")
+        self.backend.incr_counter(f"gen:{GLOBAL_TAG}")
+    
+    def invalidate_projects(self, project_ids: Iterable[int]):
+        project_ids = set(project_ids)
+        if not project_ids:
+            return
+        for project_id in project_ids:
+            self.backend.incr_counter(f"gen:{self.project_tag(project_id)}")
+        self.backend.incr_counter(f"gen:{GLOBAL_TAG}")
+    
+    def invalidate_all(self):
+        self.backend.incr_counter(f"gen:{EPOCH_TAG}")
+    
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits / total * 100) if total > 0 else 0, 2),
+            "ttl_seconds": self.ttl,
+            **self.backend.stats(),
+        }
+
+
+analytics_cache = AnalyticsCache(build_backend(), ttl=settings.CACHE_TTL_SECONDS)
\ No newline at end of file
@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from app.config import settings
+
+
+class CacheBackend:
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+    
+    def set(self, key: str, value: Any, ttl: int):
+        raise NotImplementedError
+    
+    def get_counters(self, keys: List[str]) -> List[int]:
+        raise NotImplementedError
+    
+    def incr_counter(self, key: str) -> int:
+        raise NotImplementedError
+    
+    def stats(self) -> Dict:
+        raise NotImplementedError
+
+
+class InMemoryBackend(CacheBackend):
+    def __init__(self, max_entries: int = 1024, max_counters: int = 10000):
+        self.max_entries = max_entries
+        self.max_counters = max_counters
+        # Entries pushed out by capacity vs. ones that outlived their TTL.
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Generation counters live outside the LRU so they are never evicted
+        # one by one. When there are too many, they are all dropped and read
+        # as _counter_floor: above every dropped value, so no tag returns to
+        # a generation an older cache key was built with.
+        self._counters: Dict[str, int] = {}
+        self._counter_floor = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def get_counters(self, keys: List[str]) -> List[int]:
+        with self._lock:
+            return [self._counters.get(key, self._counter_floor) for key in keys]
+    
+    def incr_counter(self, key: str) -> int:
+        with self._lock:
+            if key not in self._counters and len(self._counters) >= self.max_counters:
+                self._counter_floor = max(self._counters.values()) + 1
+                self._counters.clear()
+            self._counters[key] = self._counters.get(key, self._counter_floor) + 1
+            return self._counters[key]
+    
+    def stats(self) -> Dict:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "counters": len(self._counters),
+        }
+
+
+class RedisBackend(CacheBackend):
+    def __init__(self, url: str, prefix: str = "buildflow:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the 'redis' package"
+            )
+        
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+    
+    def get(self, key: str) -> Optional[Any]:
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        return json.loads(value)
+    
+    def set(self, key: str, value: Any, ttl: int):
+        # LRU eviction is delegated to the server (maxmemory-policy allkeys-lru).
+        self.client.set(self.prefix + key, json.dumps(value, default=str), ex=ttl)
+    
+    def get_counters(self, keys: List[str]) -> List[int]:
+        if not keys:
+            return []
+        values = self.client.mget([self.prefix + key for key in keys])
+        return [int(value) if value is not None else 0 for value in values]
+    
+    def incr_counter(self, key: str) -> int:
+        return self.client.incr(self.prefix + key)
+    
+    def stats(self) -> Dict:
+        info = self.client.info("stats")
+        return {
+            "backend": "redis",
+            "entries": self.client.dbsize(),
+            "evictions": info.get("evicted_keys", 0),
+            "expirations": info.get("expired_keys", 0),
+        }
+
+
+def build_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        return RedisBackend(settings.CACHE_REDIS_URL)
+    if settings.CACHE_BACKEND == "memory":
+        return InMemoryBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+    raise ValueError(f"Unknown CACHE_BACKEND '{settings.CACHE_BACKEND}'")
\ No newline at end of file
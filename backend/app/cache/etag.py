@@ -0,0 +1,103 @@
+import hashlib
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth.scoping import user_scope
+from app.cache.analytics_cache import AnalyticsCache
+from app.models.project import Project
+from app.models.project_rollup import ProjectRollup
+from app.models.task import Task, TaskStatus
+
+# Same window as the dashboard's upcoming_tasks.
+UPCOMING_WINDOW = timedelta(days=7)
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison, so a W/ prefix added by a
+    # proxy (e.g. after compressing the body) still matches.
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    # no-cache lets browsers keep the body but revalidate before every use;
+    # private keeps shared caches out, as the body depends on the user.
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+async def scope_etag(
+    db: AsyncSession,
+    request: Request,
+    current_user: dict,
+    project_ids: Optional[Iterable[int]] = None,
+    clock: bool = False,
+) -> str:
+    # The marker is one row per project in scope: its version (the project
+    # row) and its rollup data_version (everything under it). It is read
+    # before the response data and from the same session, so a concurrent
+    # write can only make the ETag older than the body, never newer.
+    # created_at tells a project apart from an earlier one with the same id.
+    criteria = []
+    scope = user_scope(Project, current_user)
+    if scope is not None:
+        criteria.append(scope)
+    if project_ids is not None:
+        criteria.append(Project.id.in_(list(project_ids)))
+    
+    stmt = (
+        select(Project.id, Project.created_at, Project.version, ProjectRollup.data_version)
+        .outerjoin(ProjectRollup, ProjectRollup.project_id == Project.id)
+        .where(*criteria)
+        .order_by(Project.id)
+    )
+    projects = [tuple(row) for row in (await db.execute(stmt)).all()]
+    
+    parts = [
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        AnalyticsCache.scope_key(current_user),
+        projects,
+    ]
+    if clock:
+        parts.append(await _clock_marker(db, criteria))
+    return make_etag(*parts)
+
+
+async def _clock_marker(db: AsyncSession, project_criteria: list):
+    # Responses that compare dates with the current time change without any
+    # write: overdue flags and counts, the upcoming window, days elapsed.
+    # These counts only move when an open task in the projects crosses one
+    # of those boundaries.
+    now = datetime.utcnow()
+    stmt = select(
+        func.count(Task.id).filter(Task.planned_end_date < now),
+        func.count(Task.id).filter(Task.planned_end_date < now + UPCOMING_WINDOW),
+    ).where(Task.status != TaskStatus.COMPLETED)
+    if project_criteria:
+        stmt = stmt.where(Task.project_id.in_(select(Project.id).where(*project_criteria)))
+    overdue, upcoming = (await db.execute(stmt)).one()
+    return now.date().isoformat(), overdue, upcoming
+
+
+async def row_marker(db: AsyncSession, model, row_id: int, *columns):
+    # The detail counterpart: the row's version plus whatever the caller
+    # needs for its access check, without loading the entity.
+    result = await db.execute(
+        select(model.version, model.created_at, *columns).where(model.id == row_id)
+    )
+    return result.one_or_none()
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -10,6 +10,27 @@ class Settings(BaseSettings):
     DATABASE_URL: str = (
         "postgresql://buildflow:buildflow123@db:5432/buildflow_db"
     )
+    # Defaults to DATABASE_URL with the asyncpg driver.
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Per engine and per worker process: each uvicorn worker opens up to
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW connections for the sync and async engines.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 disables
+    # Transaction-pooling PgBouncer: no server-side prepared statements and no
+    # startup parameters.
+    DB_PGBOUNCER: bool = False
+    # Optional streaming replica for analytics, list and export reads.
+    READ_REPLICA_URL: Optional[str] = None
+    ASYNC_READ_REPLICA_URL: Optional[str] = None  # defaults to READ_REPLICA_URL with asyncpg
+    READ_REPLICA_MAX_LAG_SECONDS: float = 10.0
+    READ_REPLICA_CHECK_INTERVAL: float = 5.0  # seconds between health/lag probes
+    READ_REPLICA_CONNECT_TIMEOUT: int = 2
+    # After a write, that user's reads stay on the primary for this long.
+    READ_YOUR_WRITES_SECONDS: int = 10
     
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
     ALLOWED_EXTENSIONS: str = ".xlsx,.xls,.csv"
@@ -19,6 +40,39 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
+    MAX_CSV_UPLOAD_SIZE: int = 4 * 1024 * 1024 * 1024  # 4GB, streamed from disk
+    MAX_PARQUET_UPLOAD_SIZE: int = 4 * 1024 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    IMPORT_CSV_CHUNK_ROWS: int = 50000
+    IMPORT_SNIFF_BYTES: int = 16 * 1024
+    IMPORT_EXCEL_BATCH_ROWS: int = 20000
+    IMPORT_EXCEL_PROCESSES: int = 3
+    IMPORT_EXCEL_PARALLEL_MIN_BYTES: int = 5 * 1024 * 1024
+    # Columns identifying an existing row in upsert mode (JSON in the env).
+    IMPORT_NATURAL_KEYS: Dict[str, List[str]] = {
+        "projects": ["name"],
+        "tasks": ["project_id", "name"],
+        "resources": ["project_id", "name"],
+        "budgets": ["project_id", "category"],
+    }
+    IMPORT_WORKERS: int = 2
+    # Running jobs are heartbeated by the process running them; a job whose
+    # heartbeat is older than IMPORT_STALE_AFTER_SECONDS is interrupted.
+    IMPORT_HEARTBEAT_SECONDS: int = 10
+    IMPORT_STALE_AFTER_SECONDS: int = 60
+    IMPORT_SPOOL_DIR: Optional[str] = None  # defaults to the system temp dir
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_USE_COPY: bool = True
+    IMPORT_COPY_BATCH_SIZE: int = 50000
+    EXPORT_BATCH_ROWS: int = 10000
+    TASK_BULK_UPDATE_MAX_ITEMS: int = 500
+    BULK_CREATE_MAX_ITEMS: int = 5000
+    BULK_CREATE_BATCH_SIZE: int = 1000
+    
+    CACHE_BACKEND: str = "memory"  # memory | redis
+    CACHE_REDIS_URL: Optional[str] = None
+    CACHE_TTL_SECONDS: int = 30
+    CACHE_MAX_ENTRIES: int = 1024
     
     @property
     def cors_origins_list(self) -> list[str]:
@@ -1,11 +1,148 @@
-from sqlalchemy import create_engine
+from typing import Dict, Optional
+from uuid import uuid4
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedAsyncReplicaQueuePool,
+    InstrumentedQueuePool,
+    InstrumentedReplicaQueuePool,
+)
 
-engine = create_engine(settings.DATABASE_URL)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    # The async engine reaches the same database through an asyncio driver.
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _connect_args(is_async: bool, connect_timeout: Optional[int] = None) -> Dict:
+    args = {}
+    if connect_timeout:
+        args["timeout" if is_async else "connect_timeout"] = connect_timeout
+    
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+    if is_async and settings.DB_PGBOUNCER:
+        # PgBouncer hands each transaction to any server connection, where
+        # asyncpg's named prepared statements may not exist or may clash.
+        args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+        return args
+    if not timeout or settings.DB_PGBOUNCER:
+        return args
+    if is_async:
+        args["server_settings"] = {"statement_timeout": str(timeout)}
+    else:
+        args["options"] = f"-c statement_timeout={timeout}"
+    return args
+
+
+def engine_options(url: str, is_async: bool = False, replica: bool = False) -> Dict:
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if make_url(url).get_backend_name() != "postgresql":
+        return options
+    
+    if replica:
+        poolclass = InstrumentedAsyncReplicaQueuePool if is_async else InstrumentedReplicaQueuePool
+    else:
+        poolclass = InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool
+    # A replica that is down should fail fast so reads can fall back.
+    connect_timeout = settings.READ_REPLICA_CONNECT_TIMEOUT if replica else None
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args=_connect_args(is_async, connect_timeout),
+    )
+    return options
+
+
+def _set_local_statement_timeout(connection):
+    connection.exec_driver_sql(
+        f"SET LOCAL statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}"
+    )
+
+
+def _apply_statement_timeout(target: Engine, url: str):
+    # PgBouncer rejects startup parameters, so behind it the timeout is set
+    # at the start of every transaction instead.
+    if (
+        settings.DB_PGBOUNCER
+        and settings.DB_STATEMENT_TIMEOUT_MS
+        and make_url(url).get_backend_name() == "postgresql"
+    ):
+        event.listen(target, "begin", _set_local_statement_timeout)
+
+
+def _set_sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _enforce_foreign_keys(target: Engine, url: str):
+    # SQLite ignores foreign keys, and so ON DELETE CASCADE, unless asked
+    # per connection.
+    if make_url(url).get_backend_name() == "sqlite":
+        event.listen(target, "connect", _set_sqlite_foreign_keys)
+
+
+ASYNC_URL = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+_apply_statement_timeout(engine, settings.DATABASE_URL)
+_enforce_foreign_keys(engine, settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(ASYNC_URL, **engine_options(ASYNC_URL, is_async=True))
+_apply_statement_timeout(async_engine.sync_engine, ASYNC_URL)
+_enforce_foreign_keys(async_engine.sync_engine, ASYNC_URL)
+# Attributes stay loaded after commit: lazy refreshes cannot run outside
+# the session's greenlet once a handler has returned.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# The replica engines stay None unless READ_REPLICA_URL is set; see
+# app.read_replica for how reads are routed to them.
+read_engine: Optional[Engine] = None
+ReadSessionLocal: Optional[sessionmaker] = None
+async_read_engine: Optional[AsyncEngine] = None
+AsyncReadSessionLocal: Optional[async_sessionmaker] = None
+
+if settings.READ_REPLICA_URL:
+    READ_URL = settings.READ_REPLICA_URL
+    ASYNC_READ_URL = settings.ASYNC_READ_REPLICA_URL or async_database_url(READ_URL)
+    
+    read_engine = create_engine(READ_URL, **engine_options(READ_URL, replica=True))
+    _apply_statement_timeout(read_engine, READ_URL)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    
+    async_read_engine = create_async_engine(
+        ASYNC_READ_URL, **engine_options(ASYNC_READ_URL, is_async=True, replica=True)
+    )
+    _apply_statement_timeout(async_read_engine.sync_engine, ASYNC_READ_URL)
+    AsyncReadSessionLocal = async_sessionmaker(
+        async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
 Base = declarative_base()
 
 
@@ -17,5 +154,6 @@ def get_db():
         db.close()
 
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
@@ -2,7 +2,8 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import init_db
+from app.database import async_engine, async_read_engine
+from app.services.import_jobs import import_job_runner
 from app.routes import (
     auth,
     users,
@@ -12,14 +13,21 @@ from app.routes import (
     budgets,
     analytics,
     import_data,
+    export,
+    metrics,
 )
 from app.middleware.error_handler import add_exception_handlers
+from app.middleware.read_your_writes import add_read_your_writes
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()
+    import_job_runner.recover()
     yield
+    import_job_runner.shutdown()
+    await async_engine.dispose()
+    if async_read_engine is not None:
+        await async_read_engine.dispose()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -34,9 +42,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count-Estimate", "ETag", "X-Query-Count"],
 )
 
 add_exception_handlers(app)
+add_read_your_writes(app)
 
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/api/users", tags=["Users"])
@@ -50,6 +60,8 @@ app.include_router(
     analytics.router, prefix="/api/analytics", tags=["Analytics"]
 )
 app.include_router(import_data.router, prefix="/api/import", tags=["Import"])
+app.include_router(export.router, prefix="/api/export", tags=["Export"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["Metrics"])
 
 
 @app.get("/")
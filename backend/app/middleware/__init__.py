@@ -1,3 +1,4 @@
 from app.middleware.error_handler import add_exception_handlers
+from app.middleware.read_your_writes import add_read_your_writes
 
-__all__ = ["add_exception_handlers"]
\ No newline at end of file
+__all__ = ["add_exception_handlers", "add_read_your_writes"]
\ No newline at end of file
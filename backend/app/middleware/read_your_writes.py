@@ -0,0 +1,27 @@
+from fastapi import FastAPI, Request
+from app.auth.jwt_handler import verify_token
+from app.read_replica import write_marks
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _username(request: Request):
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = verify_token(token)
+    return payload.get("sub") if payload else None
+
+
+def add_read_your_writes(app: FastAPI):
+    
+    @app.middleware("http")
+    async def mark_writes(request: Request, call_next):
+        response = await call_next(request)
+        # Marked once the write has committed, so the user's next reads go to
+        # the primary until the replica has had time to catch up.
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            username = _username(request)
+            if username:
+                write_marks.mark(username)
+        return response
\ No newline at end of file
@@ -2,10 +2,25 @@ from app.models.project import Project, ProjectStatus
 from app.models.task import Task, TaskStatus, TaskPriority
 from app.models.resource import Resource, ResourceType, ResourceStatus
 from app.models.budget import Budget
+from app.models.project_rollup import ProjectRollup
+from app.models.import_job import ImportJob, ImportJobStatus, ImportJobKind, ImportMode
+from app.models.import_file import ImportFile
+from app.models.archive import (
+    ARCHIVE_TABLES,
+    archived_projects,
+    archived_tasks,
+    archived_resources,
+    archived_budgets,
+)
 
 __all__ = [
     "Project", "ProjectStatus",
     "Task", "TaskStatus", "TaskPriority",
     "Resource", "ResourceType", "ResourceStatus",
-    "Budget"
+    "Budget",
+    "ProjectRollup",
+    "ImportJob", "ImportJobStatus", "ImportJobKind", "ImportMode",
+    "ImportFile",
+    "ARCHIVE_TABLES",
+    "archived_projects", "archived_tasks", "archived_resources", "archived_budgets",
 ]
\ No newline at end of file
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, DateTime, Table
+from datetime import datetime
+from app.database import Base
+from app.models.project import Project
+from app.models.task import Task
+from app.models.resource import Resource
+from app.models.budget import Budget
+
+
+def archive_table(source: Table) -> Table:
+    # Same columns and types as the live table, minus foreign keys and
+    # defaults: archived rows are copied verbatim and never edited.
+    columns = [
+        Column(
+            column.name,
+            column.type,
+            primary_key=column.primary_key,
+            autoincrement=False,
+            nullable=column.nullable,
+            index=column.name == "project_id",
+        )
+        for column in source.columns
+    ]
+    return Table(
+        f"archived_{source.name}",
+        Base.metadata,
+        *columns,
+        Column("archived_at", DateTime, nullable=False, default=datetime.utcnow),
+    )
+
+
+archived_projects = archive_table(Project.__table__)
+archived_tasks = archive_table(Task.__table__)
+archived_resources = archive_table(Resource.__table__)
+archived_budgets = archive_table(Budget.__table__)
+
+# Live table -> archive table, parents first.
+ARCHIVE_TABLES = {
+    Project.__table__: archived_projects,
+    Task.__table__: archived_tasks,
+    Resource.__table__: archived_resources,
+    Budget.__table__: archived_budgets,
+}
\ No newline at end of file
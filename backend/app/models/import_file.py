@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Index, JSON
+from datetime import datetime
+from app.database import Base
+from app.models.import_job import ImportJobKind
+
+
+class ImportFile(Base):
+    __tablename__ = "import_files"
+    __table_args__ = (
+        # The same bytes imported in another mode do something different,
+        # so each mode has its own entry.
+        Index("ix_import_files_content_hash_mode", "content_hash", "mode", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    # SHA-256 of the uploaded bytes; an identical re-upload is skipped.
+    content_hash = Column(String(64), nullable=False)
+    filename = Column(String(255), nullable=False)
+    kind = Column(Enum(ImportJobKind), nullable=False)
+    mode = Column(String(16), nullable=False)
+    job_id = Column(Integer, ForeignKey("import_jobs.id"), nullable=True)
+    stats = Column(JSON, default=dict)
+    
+    imported_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, Boolean, JSON
+from datetime import datetime
+import enum
+from app.database import Base
+
+
+class ImportJobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    INTERRUPTED = "interrupted"
+
+
+class ImportJobKind(str, enum.Enum):
+    CSV = "csv"
+    EXCEL = "excel"
+    PARQUET = "parquet"
+
+
+class ImportMode(str, enum.Enum):
+    INSERT = "insert"
+    UPSERT = "upsert"
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(Enum(ImportJobKind), nullable=False)
+    mode = Column(Enum(ImportMode), default=ImportMode.INSERT, nullable=False)
+    status = Column(
+        Enum(ImportJobStatus), default=ImportJobStatus.QUEUED, nullable=False, index=True
+    )
+    
+    filename = Column(String(255), nullable=False)
+    # Spooled upload on disk; removed once the job reaches a final state.
+    file_path = Column(String(1024))
+    content_hash = Column(String(64), index=True)
+    created_by = Column(String(255))
+    
+    # Per-entity counters: {"tasks": {"processed": .., "imported": .., "rejected": ..}}
+    progress = Column(JSON, default=dict)
+    error = Column(Text)
+    cancel_requested = Column(Boolean, default=False, nullable=False)
+    # The process running the job, and when it last reported being alive.
+    owner = Column(String(255))
+    heartbeat_at = Column(DateTime, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @property
+    def is_finished(self):
+        return self.status in (
+            ImportJobStatus.COMPLETED,
+            ImportJobStatus.FAILED,
+            ImportJobStatus.CANCELLED,
+            ImportJobStatus.INTERRUPTED,
+        )
\ No newline at end of file
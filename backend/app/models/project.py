@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Enum, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -32,10 +32,26 @@ class Project(Base):
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("version + 1"))
     
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
-    resources = relationship("Resource", back_populates="project", cascade="all, delete-orphan")
-    budgets = relationship("Budget", back_populates="project", cascade="all, delete-orphan")
+    # Children are removed by ON DELETE CASCADE in the database; passive
+    # deletes keep the ORM from loading them just to delete them row by row.
+    tasks = relationship(
+        "Task", back_populates="project", cascade="all, delete-orphan", passive_deletes=True
+    )
+    resources = relationship(
+        "Resource", back_populates="project", cascade="all, delete-orphan", passive_deletes=True
+    )
+    budgets = relationship(
+        "Budget", back_populates="project", cascade="all, delete-orphan", passive_deletes=True
+    )
+    rollup = relationship(
+        "ProjectRollup",
+        back_populates="project",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
     
     @property
     def budget_utilization(self):
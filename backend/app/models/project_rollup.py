@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.database import Base
+
+
+class ProjectRollup(Base):
+    __tablename__ = "project_rollups"
+    
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    
+    total_tasks = Column(Integer, nullable=False, default=0)
+    not_started_tasks = Column(Integer, nullable=False, default=0)
+    in_progress_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+    delayed_tasks = Column(Integer, nullable=False, default=0)
+    blocked_tasks = Column(Integer, nullable=False, default=0)
+    # Open tasks with a planned end date; only these can ever be overdue.
+    overdue_candidate_tasks = Column(Integer, nullable=False, default=0)
+    
+    total_resources = Column(Integer, nullable=False, default=0)
+    material_resources = Column(Integer, nullable=False, default=0)
+    equipment_resources = Column(Integer, nullable=False, default=0)
+    labor_resources = Column(Integer, nullable=False, default=0)
+    material_cost = Column(Float, nullable=False, default=0.0)
+    equipment_cost = Column(Float, nullable=False, default=0.0)
+    labor_cost = Column(Float, nullable=False, default=0.0)
+    
+    budget_lines = Column(Integer, nullable=False, default=0)
+    budget_planned = Column(Float, nullable=False, default=0.0)
+    budget_actual = Column(Float, nullable=False, default=0.0)
+    
+    # Bumped by every write to the project's tasks, resources or budgets and
+    # carried over by rebuilds; together with projects.version it marks when
+    # anything under the project changed.
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    project = relationship("Project", back_populates="rollup")
+    
+    @property
+    def resource_cost(self):
+        return self.material_cost + self.equipment_cost + self.labor_cost
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -20,9 +20,12 @@ class ResourceStatus(str, enum.Enum):
 
 class Resource(Base):
     __tablename__ = "resources"
+    __table_args__ = (
+        Index("ix_resources_project_id_resource_type", "project_id", "resource_type"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     
     name = Column(String(255), nullable=False)
     resource_type = Column(Enum(ResourceType), nullable=False)
@@ -40,9 +43,16 @@ class Resource(Base):
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("version + 1"))
     
     project = relationship("Project", back_populates="resources")
     
     def calculate_total_cost(self):
         self.total_cost = self.quantity * self.unit_cost
-        return self.total_cost
\ No newline at end of file
+        return self.total_cost
+    
+    @classmethod
+    def total_cost_for(cls, values: dict):
+        # For INSERT/UPDATE values: a factor that is not being written is
+        # taken from the row, so an UPDATE computes the cost in SQL.
+        return values.get("quantity", cls.quantity) * values.get("unit_cost", cls.unit_cost)
\ No newline at end of file
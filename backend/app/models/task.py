@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -22,9 +22,23 @@ class TaskPriority(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Per-project lists and rollups, and worker-scoped dashboards.
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+        Index("ix_tasks_assigned_to_status_planned_end_date", "assigned_to", "status", "planned_end_date"),
+        # Overdue counts only ever look at open tasks. Enum columns store the
+        # member name, hence 'COMPLETED' rather than the value.
+        Index(
+            "ix_tasks_open_project_id_planned_end_date",
+            "project_id",
+            "planned_end_date",
+            postgresql_where=text("status <> 'COMPLETED'"),
+            sqlite_where=text("status <> 'COMPLETED'"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     
     name = Column(String(255), nullable=False)
     description = Column(Text)
@@ -39,16 +53,21 @@ class Task(Base):
     
     assigned_to = Column(String(255))
     
-    depends_on_task_id = Column(Integer, ForeignKey("tasks.id"), nullable=True)
+    depends_on_task_id = Column(Integer, ForeignKey("tasks.id", ondelete="SET NULL"), nullable=True)
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("version + 1"))
     
     project = relationship("Project", back_populates="tasks")
     dependencies = relationship("Task", remote_side=[id])
     
     @property
     def is_overdue(self):
-        if self.status != TaskStatus.COMPLETED and self.planned_end_date:
-            return datetime.utcnow() > self.planned_end_date
+        return self.is_overdue_for(self.status, self.planned_end_date)
+    
+    @staticmethod
+    def is_overdue_for(status, planned_end_date) -> bool:
+        if status != TaskStatus.COMPLETED and planned_end_date:
+            return datetime.utcnow() > planned_end_date
         return False
\ No newline at end of file
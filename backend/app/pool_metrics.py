@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import deque
+from typing import Dict
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolStats:
+    def __init__(self, window: int = 1000):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._recent.append(wait)
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            recent = sorted(self._recent)
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+                "wait_max_ms": round(self.max_wait * 1000, 3),
+                "wait_p50_ms": _percentile_ms(recent, 0.50),
+                "wait_p99_ms": _percentile_ms(recent, 0.99),
+            }
+
+
+def _percentile_ms(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    return round(values[min(len(values) - 1, int(len(values) * fraction))] * 1000, 3)
+
+
+POOL_STATS = {
+    "sync": PoolStats(),
+    "async": PoolStats(),
+    "replica": PoolStats(),
+    "async_replica": PoolStats(),
+}
+
+
+class _InstrumentedPool:
+    # Pools are recreated with only their standard arguments (e.g. after
+    # dispose), so the stats are looked up by key instead of passed in.
+    stats_key = "sync"
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            POOL_STATS[self.stats_key].record(time.perf_counter() - start, timed_out=True)
+            raise
+        POOL_STATS[self.stats_key].record(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    stats_key = "sync"
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    stats_key = "async"
+
+
+class InstrumentedReplicaQueuePool(_InstrumentedPool, QueuePool):
+    stats_key = "replica"
+
+
+class InstrumentedAsyncReplicaQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    stats_key = "async_replica"
+
+
+def pool_metrics(pool: Pool, stats_key: str) -> Dict:
+    metrics = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        metrics.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # QueuePool counts overflow from -pool_size until the pool is full.
+            "overflow": max(pool.overflow(), 0),
+        })
+    metrics.update(POOL_STATS[stats_key].stats())
+    return metrics
\ No newline at end of file
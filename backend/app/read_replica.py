@@ -0,0 +1,197 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.auth.dependencies import get_current_user
+from app.cache.backends import RedisBackend
+from app.config import settings
+from app.database import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    ReadSessionLocal,
+    SessionLocal,
+    read_engine,
+)
+
+logger = logging.getLogger(__name__)
+
+# Replay lag is only meaningful while WAL is still arriving; an idle primary
+# would otherwise make a fully caught-up standby look further and further behind.
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaMonitor:
+    def __init__(self, engine: Engine, max_lag: float, interval: float):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.interval = interval
+        self.available = False
+        self.lag_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.reads = {"replica": 0, "primary_after_write": 0, "primary_fallback": 0}
+        self._checked_at = float("-inf")
+        self._probe_lock = threading.Lock()
+        self._count_lock = threading.Lock()
+    
+    def is_stale(self) -> bool:
+        return time.monotonic() - self._checked_at >= self.interval
+    
+    def check(self) -> bool:
+        # One probe at a time; concurrent callers keep the last known state
+        # instead of queueing behind a replica that may be timing out.
+        if not self._probe_lock.acquire(blocking=False):
+            return self.available
+        try:
+            try:
+                with self.engine.connect() as connection:
+                    if self.engine.dialect.name == "postgresql":
+                        lag = float(connection.execute(REPLICA_LAG_SQL).scalar() or 0)
+                    else:
+                        connection.execute(text("SELECT 1"))
+                        lag = 0.0
+                self.lag_seconds = round(lag, 3)
+                self.available = lag <= self.max_lag
+                self.error = None if self.available else "Replica lag above threshold"
+            except Exception as e:
+                self.lag_seconds = None
+                self.error = str(e)
+                self.available = False
+            self._checked_at = time.monotonic()
+        finally:
+            self._probe_lock.release()
+        return self.available
+    
+    def count(self, route: str):
+        with self._count_lock:
+            self.reads[route] += 1
+    
+    def status(self) -> Dict:
+        return {
+            "configured": True,
+            "available": self.available,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag,
+            "error": self.error,
+            "reads": dict(self.reads),
+        }
+
+
+class WriteMarks:
+    # A write handled by one uvicorn worker has to pin the user's reads on
+    # every worker, so with Redis the marks are shared: one sorted set scored
+    # by expiry rather than cache entries, as that key is touched on every
+    # write and read (allkeys-lru never picks it) and expired members are
+    # trimmed explicitly. Without Redis each process keeps its own marks,
+    # outside the cache's LRU, which covers reads served by the same worker.
+    KEY = "rw:marks"
+    
+    def __init__(self, window: int):
+        self.window = window
+        self.redis: Optional[RedisBackend] = None
+        if window > 0 and settings.CACHE_BACKEND == "redis":
+            self.redis = RedisBackend(settings.CACHE_REDIS_URL)
+        # username -> expiry, in expiry order as every mark has the same window.
+        self._local: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def shared(self) -> bool:
+        return self.redis is not None
+    
+    def mark(self, username: str):
+        if self.window <= 0:
+            return
+        now = time.time()
+        if self.redis is None:
+            with self._lock:
+                self._local[username] = now + self.window
+                self._local.move_to_end(username)
+                # Expired marks sit at the front; dropping them keeps the
+                # dict to the users who wrote within the window.
+                while self._local and next(iter(self._local.values())) <= now:
+                    self._local.popitem(last=False)
+            return
+        key = self.redis.prefix + self.KEY
+        pipeline = self.redis.client.pipeline()
+        pipeline.zadd(key, {username: now + self.window})
+        pipeline.zremrangebyscore(key, "-inf", now)
+        pipeline.execute()
+    
+    def wrote_recently(self, username: Optional[str]) -> bool:
+        if self.window <= 0 or username is None:
+            return False
+        if self.redis is None:
+            with self._lock:
+                expires_at = self._local.get(username)
+        else:
+            expires_at = self.redis.client.zscore(self.redis.prefix + self.KEY, username)
+        return expires_at is not None and expires_at > time.time()
+
+
+write_marks = WriteMarks(settings.READ_YOUR_WRITES_SECONDS)
+
+replica_monitor: Optional[ReplicaMonitor] = None
+if read_engine is not None:
+    replica_monitor = ReplicaMonitor(
+        read_engine,
+        max_lag=settings.READ_REPLICA_MAX_LAG_SECONDS,
+        interval=settings.READ_REPLICA_CHECK_INTERVAL,
+    )
+    if write_marks.window > 0 and not write_marks.shared:
+        logger.warning(
+            "Read-your-writes marks are per process without CACHE_BACKEND=redis: "
+            "with several workers, a user's read served by another worker than "
+            "their write may reach the replica before the write does"
+        )
+
+
+def replica_status() -> Dict:
+    if replica_monitor is None:
+        return {"configured": False}
+    return {**replica_monitor.status(), "write_marks_shared": write_marks.shared}
+
+
+def _use_replica(current_user: dict) -> bool:
+    if write_marks.wrote_recently(current_user.get("username")):
+        replica_monitor.count("primary_after_write")
+        return False
+    available = replica_monitor.available
+    replica_monitor.count("replica" if available else "primary_fallback")
+    return available
+
+
+def get_read_db(current_user: dict = Depends(get_current_user)):
+    factory = SessionLocal
+    if replica_monitor is not None:
+        if replica_monitor.is_stale():
+            replica_monitor.check()
+        if _use_replica(current_user):
+            factory = ReadSessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(current_user: dict = Depends(get_current_user)):
+    factory = AsyncSessionLocal
+    if replica_monitor is not None:
+        # The probe uses the sync engine, so it runs off the event loop.
+        if replica_monitor.is_stale():
+            await run_in_threadpool(replica_monitor.check)
+        if _use_replica(current_user):
+            factory = AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
\ No newline at end of file
@@ -1,3 +1,3 @@
-from . import auth, projects, resources, tasks, budgets, analytics, import_data
+from . import auth, projects, resources, tasks, budgets, analytics, import_data, export, metrics
 
-__all__ = ["auth", "projects", "resources", "tasks", "budgets", "analytics", "import_data"]
\ No newline at end of file
+__all__ = ["auth", "projects", "resources", "tasks", "budgets", "analytics", "import_data", "export", "metrics"]
\ No newline at end of file
@@ -1,34 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.services.analytics_service import AnalyticsService
-from app.auth.dependencies import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.read_replica import get_async_read_db
+from app.services.analytics_service import AsyncAnalyticsService
+from app.auth.dependencies import get_current_user, require_role
+from app.cache import analytics_cache, not_modified, scope_etag
 
 router = APIRouter()
 
 @router.get("/dashboard")
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: dict = Depends(get_current_user),
 ):
-    service = AnalyticsService(db)
+    etag = await scope_etag(db, request, current_user, clock=True)
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
     
-    if current_user["role"] == "manager":
-        managed_projects = current_user.get("managed_projects", [])
-        stats = service.get_manager_dashboard_stats(managed_projects)
-    elif current_user["role"] == "worker":
-        worker_name = current_user.get("worker_name")
-        stats = service.get_worker_dashboard_stats(worker_name)
-    else:
-        stats = service.get_dashboard_stats()
+    service = AsyncAnalyticsService(db)
+    
+    async def compute():
+        if current_user["role"] == "manager":
+            managed_projects = current_user.get("managed_projects", [])
+            return await service.get_manager_dashboard_stats(managed_projects)
+        elif current_user["role"] == "worker":
+            worker_name = current_user.get("worker_name")
+            return await service.get_worker_dashboard_stats(worker_name)
+        return await service.get_dashboard_stats()
     
+    # Reports are cached per ETag, so a cached body always matches the ETag
+    # sent with it, even when another worker's write has not bumped this
+    # process's in-memory generation counters.
+    stats = await analytics_cache.get_or_compute_async(
+        "dashboard", current_user, compute, params={"etag": etag}
+    )
+    
+    response.headers["X-Query-Count"] = str(service.last_query_count)
     return stats
 
 
 @router.get("/team-performance")
 async def get_team_performance(
+    request: Request,
+    response: Response,
     project_id: int = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: dict = Depends(get_current_user),
 ):
     if current_user["role"] == "worker":
@@ -45,14 +64,79 @@ async def get_team_performance(
                 detail="You don't have access to this project"
             )
     
-    service = AnalyticsService(db)
-    return service.get_team_performance(project_id)
+    etag = await scope_etag(
+        db, request, current_user, project_ids=[project_id] if project_id else None
+    )
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    service = AsyncAnalyticsService(db)
+    return await analytics_cache.get_or_compute_async(
+        "team-performance",
+        current_user,
+        lambda: service.get_team_performance(project_id),
+        params={"project_id": project_id, "etag": etag},
+        project_ids=[project_id] if project_id else None,
+        global_scope=not project_id,
+    )
+
+
+@router.get("/projects/kpi")
+async def get_projects_kpi(
+    request: Request,
+    response: Response,
+    ids: Optional[str] = Query(
+        None, description="Comma-separated project ids; omit for every project in scope"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user),
+):
+    project_ids = None
+    if ids:
+        try:
+            project_ids = sorted({int(pid) for pid in ids.split(",") if pid.strip()})
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="ids must be a comma-separated list of integers",
+            )
+    
+    worker_name = None
+    if current_user["role"] == "manager":
+        managed_projects = current_user.get("managed_projects", [])
+        if project_ids is None:
+            project_ids = sorted(managed_projects)
+        elif not set(project_ids) <= set(managed_projects):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have access to this project",
+            )
+    elif current_user["role"] == "worker" and project_ids is None:
+        worker_name = current_user.get("worker_name")
+    
+    etag = await scope_etag(db, request, current_user, project_ids=project_ids, clock=True)
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    service = AsyncAnalyticsService(db)
+    return await analytics_cache.get_or_compute_async(
+        "projects-kpi",
+        current_user,
+        lambda: service.get_projects_kpi(project_ids, worker_name=worker_name),
+        params={"ids": ",".join(str(pid) for pid in project_ids or []), "etag": etag},
+        project_ids=project_ids,
+        global_scope=project_ids is None,
+    )
 
 
 @router.get("/project/{project_id}/kpi")
 async def get_project_kpi(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: dict = Depends(get_current_user),
 ):
     if current_user["role"] == "manager":
@@ -64,14 +148,27 @@ async def get_project_kpi(
                 detail="You don't have access to this project",
             )
     
-    service = AnalyticsService(db)
-    return service.get_project_kpi(project_id)
+    etag = await scope_etag(db, request, current_user, project_ids=[project_id], clock=True)
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    service = AsyncAnalyticsService(db)
+    return await analytics_cache.get_or_compute_async(
+        "kpi",
+        current_user,
+        lambda: service.get_project_kpi(project_id),
+        params={"project_id": project_id, "etag": etag},
+        project_ids=[project_id],
+    )
 
 
 @router.get("/project/{project_id}/budget-breakdown")
 async def get_budget_breakdown(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: dict = Depends(get_current_user),
 ):
     if current_user["role"] == "worker":
@@ -90,14 +187,27 @@ async def get_budget_breakdown(
                 detail="You don't have access to this project",
             )
     
-    service = AnalyticsService(db)
-    return service.get_budget_breakdown(project_id)
+    etag = await scope_etag(db, request, current_user, project_ids=[project_id])
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    service = AsyncAnalyticsService(db)
+    return await analytics_cache.get_or_compute_async(
+        "budget-breakdown",
+        current_user,
+        lambda: service.get_budget_breakdown(project_id),
+        params={"project_id": project_id, "etag": etag},
+        project_ids=[project_id],
+    )
 
 
 @router.get("/project/{project_id}/resource-distribution")
 async def get_resource_distribution(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: dict = Depends(get_current_user),
 ):
     if current_user["role"] == "worker":
@@ -116,14 +226,27 @@ async def get_resource_distribution(
                 detail="You don't have access to this project",
             )
     
-    service = AnalyticsService(db)
-    return service.get_resource_distribution(project_id)
+    etag = await scope_etag(db, request, current_user, project_ids=[project_id])
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    service = AsyncAnalyticsService(db)
+    return await analytics_cache.get_or_compute_async(
+        "resource-distribution",
+        current_user,
+        lambda: service.get_resource_distribution(project_id),
+        params={"project_id": project_id, "etag": etag},
+        project_ids=[project_id],
+    )
 
 
 @router.get("/project/{project_id}/timeline")
 async def get_project_timeline(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: dict = Depends(get_current_user),
 ):
     if current_user["role"] == "manager":
@@ -135,14 +258,27 @@ async def get_project_timeline(
                 detail="You don't have access to this project",
             )
     
-    service = AnalyticsService(db)
-    return service.get_project_timeline(project_id)
+    etag = await scope_etag(db, request, current_user, project_ids=[project_id])
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    service = AsyncAnalyticsService(db)
+    return await analytics_cache.get_or_compute_async(
+        "timeline",
+        current_user,
+        lambda: service.get_project_timeline(project_id),
+        params={"project_id": project_id, "etag": etag},
+        project_ids=[project_id],
+    )
 
 
 @router.get("/project/{project_id}/predict-completion")
 async def predict_completion(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: dict = Depends(get_current_user),
 ):
     if current_user["role"] == "manager":
@@ -154,5 +290,21 @@ async def predict_completion(
                 detail="You don't have access to this project",
             )
     
-    service = AnalyticsService(db)
-    return service.predict_completion(project_id)
\ No newline at end of file
+    etag = await scope_etag(db, request, current_user, project_ids=[project_id], clock=True)
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    service = AsyncAnalyticsService(db)
+    return await analytics_cache.get_or_compute_async(
+        "predict-completion",
+        current_user,
+        lambda: service.predict_completion(project_id),
+        params={"project_id": project_id, "etag": etag},
+        project_ids=[project_id],
+    )
+
+
+@router.get("/cache/stats", dependencies=[Depends(require_role("admin"))])
+async def get_cache_stats():
+    return analytics_cache.stats()
\ No newline at end of file
@@ -1,13 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from app.database import get_async_db
+from app.read_replica import get_async_read_db
 from app.models.budget import Budget
 from app.schemas.budget import BudgetCreate, BudgetUpdate, BudgetResponse
+from app.schemas.bulk import BulkCreateResponse
+from app.services.rollup_service import RollupService
+from app.services.bulk_create_service import BulkCreateService
+from app.services.scoped_writes import ScopedWriter, WriteOutcome
+from app.cache import analytics_cache, make_etag, not_modified, row_marker, scope_etag
+from app.config import settings
 from app.auth.dependencies import get_current_user, require_role
+from app.auth.scoping import scope_to_user
+from app.utils.pagination import Pagination, estimate_count
 
 router = APIRouter()
 
+BudgetSort = Literal["id", "category", "budget_date", "created_at", "updated_at"]
+
 
 @router.post(
     "/",
@@ -17,7 +29,7 @@ router = APIRouter()
 )
 async def create_budget(
     budget: BudgetCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     if current_user["role"] == "manager":
@@ -28,47 +40,98 @@ async def create_budget(
                 detail="You can only create budgets for your managed projects",
             )
     
-    db_budget = Budget(**budget.model_dump())
-    db.add(db_budget)
-    db.commit()
-    db.refresh(db_budget)
+    db_budget = await ScopedWriter(db, current_user).insert(Budget, budget.model_dump())
+    analytics_cache.invalidate_project(db_budget.project_id)
     return db_budget
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_role("admin", "manager"))],
+)
+async def bulk_create_budgets(
+    budgets: List[BudgetCreate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user),
+):
+    if len(budgets) > settings.BULK_CREATE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_CREATE_MAX_ITEMS} budgets can be created at once",
+        )
+    
+    project_ids = {budget.project_id for budget in budgets}
+    if current_user["role"] == "manager":
+        managed_projects = current_user.get("managed_projects", [])
+        if not project_ids.issubset(managed_projects):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only create budgets for your managed projects",
+            )
+    
+    service = BulkCreateService(db)
+    missing = await service.missing_projects(project_ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Projects not found: {', '.join(map(str, missing))}",
+        )
+    
+    ids = await service.create(Budget, budgets)
+    for project_id in project_ids:
+        analytics_cache.invalidate_project(project_id)
+    return {"ids": ids}
+
+
 @router.get("/", response_model=List[BudgetResponse])
 async def get_budgets(
+    request: Request,
+    response: Response,
     project_id: Optional[int] = Query(None),
     category: Optional[str] = Query(None),
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    sort: BudgetSort = Query("id"),
+    include_total: bool = Query(False, description="Adds X-Total-Count-Estimate"),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: dict = Depends(get_current_user),
 ):
-    query = db.query(Budget)
+    page = Pagination(Budget, sort=sort, limit=limit, skip=skip, cursor=cursor)
+    etag = await scope_etag(
+        db, request, current_user, project_ids=[project_id] if project_id else None
+    )
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
     
-    if current_user["role"] == "manager":
-        managed_projects = current_user.get("managed_projects", [])
-        query = query.filter(Budget.project_id.in_(managed_projects))
-    elif current_user["role"] == "worker":
-        return []
+    query = scope_to_user(select(Budget), Budget, current_user)
     
     if project_id:
-        query = query.filter(Budget.project_id == project_id)
+        query = query.where(Budget.project_id == project_id)
     if category:
-        query = query.filter(Budget.category.ilike(f"%{category}%"))
+        query = query.where(Budget.category.ilike(f"%{category}%"))
     
-    return query.offset(skip).limit(limit).all()
+    result = await db.execute(page.apply(query))
+    budgets = page.page(result.scalars().all())
+    total = await db.run_sync(lambda session: estimate_count(session, query)) if include_total else None
+    page.set_headers(response, total)
+    return budgets
 
 
 @router.get("/{budget_id}", response_model=BudgetResponse)
 async def get_budget(
     budget_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
-    budget = db.query(Budget).filter(Budget.id == budget_id).first()
+    marker = await row_marker(db, Budget, budget_id, Budget.project_id)
     
-    if not budget:
+    if not marker:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Budget with id {budget_id} not found",
@@ -76,7 +139,7 @@ async def get_budget(
     
     if current_user["role"] == "manager":
         managed_projects = current_user.get("managed_projects", [])
-        if budget.project_id not in managed_projects:
+        if marker.project_id not in managed_projects:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have access to this budget",
@@ -87,6 +150,16 @@ async def get_budget(
             detail="Workers cannot access budget details",
         )
     
+    unchanged = not_modified(request, response, make_etag(request.url.path, *marker))
+    if unchanged is not None:
+        return unchanged
+    
+    budget = await db.get(Budget, budget_id)
+    if not budget:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Budget with id {budget_id} not found",
+        )
     return budget
 
 
@@ -98,31 +171,33 @@ async def get_budget(
 async def update_budget(
     budget_id: int,
     budget_update: BudgetUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
-    db_budget = db.query(Budget).filter(Budget.id == budget_id).first()
+    outcome, db_budget = await ScopedWriter(db, current_user).update(
+        Budget,
+        budget_id,
+        budget_update.model_dump(exclude_unset=True, exclude={"version"}),
+        version=budget_update.version,
+    )
     
-    if not db_budget:
+    if outcome == WriteOutcome.NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Budget with id {budget_id} not found",
         )
+    if outcome == WriteOutcome.FORBIDDEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only update budgets in your managed projects",
+        )
+    if outcome == WriteOutcome.CONFLICT:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Budget was changed by someone else; reload it and try again",
+        )
     
-    if current_user["role"] == "manager":
-        managed_projects = current_user.get("managed_projects", [])
-        if db_budget.project_id not in managed_projects:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only update budgets in your managed projects",
-            )
-    
-    update_data = budget_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_budget, field, value)
-    
-    db.commit()
-    db.refresh(db_budget)
+    analytics_cache.invalidate_project(db_budget.project_id)
     return db_budget
 
 
@@ -133,10 +208,10 @@ async def update_budget(
 )
 async def delete_budget(
     budget_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
-    db_budget = db.query(Budget).filter(Budget.id == budget_id).first()
+    db_budget = await db.get(Budget, budget_id)
     
     if not db_budget:
         raise HTTPException(
@@ -152,6 +227,9 @@ async def delete_budget(
                 detail="You can only delete budgets from your managed projects",
             )
     
-    db.delete(db_budget)
-    db.commit()
+    project_id = db_budget.project_id
+    await db.delete(db_budget)
+    await db.run_sync(lambda session: RollupService(session).record_delete(db_budget))
+    await db.commit()
+    analytics_cache.invalidate_project(project_id)
     return None
\ No newline at end of file
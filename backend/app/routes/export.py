@@ -0,0 +1,62 @@
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+from app.read_replica import get_read_db
+from app.services.export_service import EXPORT_MODELS, ExportFormat, ExportService
+from app.auth.dependencies import get_current_user
+
+router = APIRouter()
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _check_entity(entity: str):
+    if entity not in EXPORT_MODELS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid entity. Allowed: {', '.join(EXPORT_MODELS)}",
+        )
+
+
+def _file_response(path: str, media_type: str, filename: str) -> FileResponse:
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        background=BackgroundTask(os.remove, path),
+    )
+
+
+@router.get("/parquet")
+async def export_parquet(
+    entity: str = Query(...),
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user),
+):
+    _check_entity(entity)
+    path = await run_in_threadpool(ExportService(db, current_user).export_parquet, entity)
+    return _file_response(path, "application/vnd.apache.parquet", f"{entity}.parquet")
+
+
+@router.get("/{entity}")
+async def export_entity(
+    entity: str,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user),
+):
+    _check_entity(entity)
+    service = ExportService(db, current_user)
+    
+    if export_format == ExportFormat.XLSX:
+        path = await run_in_threadpool(service.export_xlsx, entity)
+        return _file_response(path, XLSX_MEDIA_TYPE, f"{entity}.xlsx")
+    
+    return StreamingResponse(
+        service.iter_csv(entity),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{entity}.csv"'},
+    )
\ No newline at end of file
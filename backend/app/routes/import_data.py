@@ -1,23 +1,143 @@
+import hashlib
+import os
+import tempfile
+from typing import Tuple
 from fastapi import (
     APIRouter,
     Depends,
     UploadFile,
     File,
     HTTPException,
+    Query,
+    Response,
     status,
 )
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.services.import_jobs import ImportJobService, import_job_runner
 from app.services.import_service import ImportService
+from app.models.import_job import ImportJobKind, ImportMode
 from app.config import settings
 from app.auth.dependencies import require_role
 
 router = APIRouter()
 
 
-@router.post("/excel", dependencies=[Depends(require_role("admin"))])
+async def _spool_upload(file: UploadFile, max_size: int) -> Tuple[str, str]:
+    # Copy the upload to disk in fixed-size chunks so large files never have
+    # to fit in memory. The spool outlives the request: the import job reads
+    # it later and removes it when it finishes.
+    if settings.IMPORT_SPOOL_DIR:
+        os.makedirs(settings.IMPORT_SPOOL_DIR, exist_ok=True)
+    
+    size = 0
+    digest = hashlib.sha256()
+    suffix = os.path.splitext(file.filename)[1]
+    with tempfile.NamedTemporaryFile(
+        delete=False, suffix=suffix, dir=settings.IMPORT_SPOOL_DIR
+    ) as spool:
+        try:
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"File too large. Max size: {max_size / (1024*1024)}MB",
+                    )
+                spool.write(chunk)
+                digest.update(chunk)
+        except BaseException:
+            spool.close()
+            os.remove(spool.name)
+            raise
+    return spool.name, digest.hexdigest()
+
+
+def _validate_import(
+    db: Session, kind: ImportJobKind, path: str, filename: str, mode: ImportMode
+) -> dict:
+    service = ImportService(db, mode=mode, dry_run=True)
+    try:
+        service.import_path(kind, path, filename)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Validation failed: {str(e)}",
+        )
+    finally:
+        db.rollback()
+        os.remove(path)
+    return service.validation_report()
+
+
+async def _handle_upload(
+    db: Session,
+    kind: ImportJobKind,
+    file: UploadFile,
+    max_size: int,
+    mode: ImportMode,
+    force: bool,
+    dry_run: bool,
+    current_user: dict,
+    response: Response,
+) -> dict:
+    spooled = await _spool_upload(file, max_size)
+    if dry_run:
+        response.status_code = status.HTTP_200_OK
+        return await run_in_threadpool(
+            _validate_import, db, kind, spooled[0], file.filename, mode
+        )
+    return await run_in_threadpool(
+        _queue_import, db, kind, file, spooled, mode, force, current_user, response
+    )
+
+
+def _queue_import(
+    db: Session,
+    kind: ImportJobKind,
+    file: UploadFile,
+    spooled: Tuple[str, str],
+    mode: ImportMode,
+    force: bool,
+    current_user: dict,
+    response: Response,
+) -> dict:
+    path, content_hash = spooled
+    service = ImportJobService(db)
+    
+    # Identical bytes were already imported: skip without touching the data.
+    previous = None if force else service.find_imported_file(content_hash, mode)
+    if previous:
+        os.remove(path)
+        response.status_code = status.HTTP_200_OK
+        return {
+            "message": "File already imported; nothing to do",
+            "duplicate": True,
+            "job_id": previous.job_id,
+            "imported_at": previous.imported_at,
+            "mode": previous.mode,
+            "stats": ImportJobService.imported_counts(previous.stats or {}),
+            "progress": previous.stats,
+        }
+    
+    job = service.create_job(
+        kind, file.filename, path, current_user["username"],
+        mode=mode, content_hash=content_hash,
+    )
+    import_job_runner.submit(job.id)
+    return {"message": "Import queued", "job_id": job.id, "status": job.status.value}
+
+
+@router.post("/excel", status_code=status.HTTP_202_ACCEPTED)
 async def import_from_excel(
-    file: UploadFile = File(...), db: Session = Depends(get_db)
+    response: Response,
+    file: UploadFile = File(...),
+    mode: ImportMode = Query(ImportMode.INSERT),
+    force: bool = Query(False),
+    dry_run: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_role("admin")),
 ):
     if not any(
         file.filename.endswith(ext) for ext in settings.allowed_extensions_set
@@ -27,27 +147,21 @@ async def import_from_excel(
             detail=f"Invalid file type. Allowed: {', '.join(settings.allowed_extensions_set)}",
         )
     
-    contents = await file.read()
-    if len(contents) > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Max size: {settings.MAX_UPLOAD_SIZE / (1024*1024)}MB",
-        )
-    
-    service = ImportService(db)
-    try:
-        result = service.import_from_excel(contents, file.filename)
-        return {"message": "Import successful", "stats": result}
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Import failed: {str(e)}",
-        )
+    return await _handle_upload(
+        db, ImportJobKind.EXCEL, file, settings.MAX_UPLOAD_SIZE,
+        mode, force, dry_run, current_user, response,
+    )
 
 
-@router.post("/csv", dependencies=[Depends(require_role("admin"))])
+@router.post("/csv", status_code=status.HTTP_202_ACCEPTED)
 async def import_from_csv(
-    file: UploadFile = File(...), db: Session = Depends(get_db)
+    response: Response,
+    file: UploadFile = File(...),
+    mode: ImportMode = Query(ImportMode.INSERT),
+    force: bool = Query(False),
+    dry_run: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_role("admin")),
 ):
     if not file.filename.endswith(".csv"):
         raise HTTPException(
@@ -55,19 +169,52 @@ async def import_from_csv(
             detail="Invalid file type. Only CSV files allowed",
         )
     
-    contents = await file.read()
-    if len(contents) > settings.MAX_UPLOAD_SIZE:
+    return await _handle_upload(
+        db, ImportJobKind.CSV, file, settings.MAX_CSV_UPLOAD_SIZE,
+        mode, force, dry_run, current_user, response,
+    )
+
+
+@router.post("/parquet", status_code=status.HTTP_202_ACCEPTED)
+async def import_from_parquet(
+    response: Response,
+    file: UploadFile = File(...),
+    mode: ImportMode = Query(ImportMode.INSERT),
+    force: bool = Query(False),
+    dry_run: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_role("admin")),
+):
+    if not file.filename.endswith(".parquet"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Max size: {settings.MAX_UPLOAD_SIZE / (1024*1024)}MB",
+            detail="Invalid file type. Only Parquet files allowed",
         )
     
-    service = ImportService(db)
-    try:
-        result = service.import_from_csv(contents)
-        return {"message": "Import successful", "stats": result}
-    except Exception as e:
+    return await _handle_upload(
+        db, ImportJobKind.PARQUET, file, settings.MAX_PARQUET_UPLOAD_SIZE,
+        mode, force, dry_run, current_user, response,
+    )
+
+
+@router.get("/jobs/{job_id}", dependencies=[Depends(require_role("admin"))])
+def get_import_job(job_id: int, db: Session = Depends(get_db)):
+    job = ImportJobService(db).get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return ImportJobService.to_dict(job)
+
+
+@router.post("/jobs/{job_id}/cancel", dependencies=[Depends(require_role("admin"))])
+def cancel_import_job(job_id: int, db: Session = Depends(get_db)):
+    service = ImportJobService(db)
+    job = service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    if job.is_finished:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Import failed: {str(e)}",
-        )
\ No newline at end of file
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Import job already {job.status.value}",
+        )
+    
+    return ImportJobService.to_dict(service.request_cancel(job))
\ No newline at end of file
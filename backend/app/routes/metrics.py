@@ -0,0 +1,24 @@
+import os
+from fastapi import APIRouter, Depends
+from app.database import async_engine, async_read_engine, engine, read_engine
+from app.pool_metrics import pool_metrics
+from app.read_replica import replica_status
+from app.auth.dependencies import require_role
+
+router = APIRouter()
+
+
+@router.get("/db-pool", dependencies=[Depends(require_role("admin"))])
+async def get_db_pool_metrics():
+    # Pools are per process; with several uvicorn workers each one reports
+    # its own, tagged with its pid.
+    metrics = {
+        "pid": os.getpid(),
+        "sync": pool_metrics(engine.pool, "sync"),
+        "async": pool_metrics(async_engine.pool, "async"),
+        "replica": replica_status(),
+    }
+    if read_engine is not None:
+        metrics["replica"]["sync"] = pool_metrics(read_engine.pool, "replica")
+        metrics["replica"]["async"] = pool_metrics(async_read_engine.pool, "async_replica")
+    return metrics
\ No newline at end of file
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.models.project import Project
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from app.database import get_async_db
+from app.read_replica import get_async_read_db
+from app.models.project import Project, ProjectStatus
 from app.schemas.project import (
     ProjectCreate,
     ProjectUpdate,
@@ -10,10 +11,15 @@ from app.schemas.project import (
     ProjectSummary,
 )
 from app.services.project_service import ProjectService
+from app.services.scoped_writes import WriteOutcome
+from app.cache import analytics_cache, make_etag, not_modified, row_marker, scope_etag
 from app.auth.dependencies import get_current_user, require_role
+from app.utils.pagination import Pagination
 
 router = APIRouter()
 
+ProjectSort = Literal["id", "name", "start_date", "planned_end_date", "created_at", "updated_at"]
+
 
 @router.post(
     "/",
@@ -21,53 +27,69 @@ router = APIRouter()
     status_code=status.HTTP_201_CREATED,
     dependencies=[Depends(require_role("admin"))],
 )
-async def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
+async def create_project(
+    project: ProjectCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user),
+):
     service = ProjectService(db)
-    return service.create_project(project)
+    db_project = await service.create_project(project, current_user)
+    analytics_cache.invalidate_project(db_project.id)
+    return db_project
 
 
 @router.get("/", response_model=List[ProjectResponse])
 async def get_projects(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    sort: ProjectSort = Query("id"),
+    include_total: bool = Query(False, description="Adds X-Total-Count-Estimate"),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: dict = Depends(get_current_user),
 ):
     service = ProjectService(db)
+    page = Pagination(Project, sort=sort, limit=limit, skip=skip, cursor=cursor)
+    etag = await scope_etag(db, request, current_user)
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
     
-    if current_user["role"] == "manager":
-        managed_project_ids = current_user.get("managed_projects", [])
-        projects = service.get_projects(skip=skip, limit=limit)
-        return [p for p in projects if p.id in managed_project_ids]
-    
-    return service.get_projects(skip=skip, limit=limit)
+    projects = await service.get_projects(page, current_user)
+    total = await service.estimate_project_count(current_user) if include_total else None
+    page.set_headers(response, total)
+    return projects
 
 
 @router.get("/summary", response_model=List[ProjectSummary])
 async def get_projects_summary(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: dict = Depends(get_current_user),
 ):
-    service = ProjectService(db)
-    summaries = service.get_projects_summary()
+    etag = await scope_etag(db, request, current_user)
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
     
-    if current_user["role"] == "manager":
-        managed_project_ids = current_user.get("managed_projects", [])
-        return [s for s in summaries if s["id"] in managed_project_ids]
-    
-    return summaries
+    service = ProjectService(db)
+    return await service.get_projects_summary(current_user)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
-    service = ProjectService(db)
-    project = service.get_project_by_id(project_id)
+    marker = await row_marker(db, Project, project_id)
     
-    if not project:
+    if not marker:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with id {project_id} not found",
@@ -81,6 +103,17 @@ async def get_project(
                 detail="You don't have access to this project",
             )
     
+    unchanged = not_modified(request, response, make_etag(request.url.path, *marker))
+    if unchanged is not None:
+        return unchanged
+    
+    service = ProjectService(db)
+    project = await service.get_project_by_id(project_id)
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project with id {project_id} not found",
+        )
     return project
 
 
@@ -92,26 +125,29 @@ async def get_project(
 async def update_project(
     project_id: int,
     project_update: ProjectUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
-    if current_user["role"] == "manager":
-        managed_project_ids = current_user.get("managed_projects", [])
-        if project_id not in managed_project_ids:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this project",
-            )
-    
     service = ProjectService(db)
-    project = service.update_project(project_id, project_update)
+    outcome, project = await service.update_project(project_id, project_update, current_user)
     
-    if not project:
+    if outcome == WriteOutcome.NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with id {project_id} not found",
         )
+    if outcome == WriteOutcome.FORBIDDEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this project",
+        )
+    if outcome == WriteOutcome.CONFLICT:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Project was changed by someone else; reload it and try again",
+        )
     
+    analytics_cache.invalidate_project(project_id)
     return project
 
 
@@ -120,9 +156,9 @@ async def update_project(
     status_code=status.HTTP_204_NO_CONTENT,
     dependencies=[Depends(require_role("admin"))],  # Admin only
 )
-async def delete_project(project_id: int, db: Session = Depends(get_db)):
+async def delete_project(project_id: int, db: AsyncSession = Depends(get_async_db)):
     service = ProjectService(db)
-    success = service.delete_project(project_id)
+    success = await service.delete_project(project_id)
     
     if not success:
         raise HTTPException(
@@ -130,4 +166,35 @@ async def delete_project(project_id: int, db: Session = Depends(get_db)):
             detail=f"Project with id {project_id} not found",
         )
     
-    return None
\ No newline at end of file
+    analytics_cache.invalidate_project(project_id)
+    return None
+
+
+@router.post(
+    "/{project_id}/archive",
+    dependencies=[Depends(require_role("admin"))],
+)
+async def archive_project(project_id: int, db: AsyncSession = Depends(get_async_db)):
+    service = ProjectService(db)
+    project = await service.get_project_by_id(project_id)
+    
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project with id {project_id} not found",
+        )
+    if project.status != ProjectStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only completed projects can be archived",
+        )
+    
+    archived = await service.archive_project(project_id)
+    if archived is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Project changed while it was being archived",
+        )
+    
+    analytics_cache.invalidate_project(project_id)
+    return {"project_id": project_id, "archived": archived}
\ No newline at end of file
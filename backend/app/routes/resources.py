@@ -1,17 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from app.database import get_async_db
+from app.read_replica import get_async_read_db
 from app.models.resource import Resource, ResourceType
 from app.schemas.resource import (
     ResourceCreate,
     ResourceUpdate,
     ResourceResponse,
 )
+from app.schemas.bulk import BulkCreateResponse
+from app.services.rollup_service import RollupService
+from app.services.bulk_create_service import BulkCreateService
+from app.services.scoped_writes import ScopedWriter, WriteOutcome
+from app.cache import analytics_cache, make_etag, not_modified, row_marker, scope_etag
+from app.config import settings
 from app.auth.dependencies import get_current_user, require_role
+from app.auth.scoping import scope_to_user
+from app.utils.pagination import Pagination, estimate_count
 
 router = APIRouter()
 
+ResourceSort = Literal["id", "name", "allocated_date", "created_at", "updated_at"]
+
 
 @router.post(
     "/",
@@ -21,7 +33,7 @@ router = APIRouter()
 )
 async def create_resource(
     resource: ResourceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     if current_user["role"] == "manager":
@@ -32,48 +44,100 @@ async def create_resource(
                 detail="You can only create resources for your managed projects",
             )
     
-    db_resource = Resource(**resource.model_dump())
-    db_resource.calculate_total_cost()
-    db.add(db_resource)
-    db.commit()
-    db.refresh(db_resource)
+    values = resource.model_dump()
+    values["total_cost"] = Resource.total_cost_for(values)
+    db_resource = await ScopedWriter(db, current_user).insert(Resource, values)
+    analytics_cache.invalidate_project(db_resource.project_id)
     return db_resource
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_role("admin", "manager"))],
+)
+async def bulk_create_resources(
+    resources: List[ResourceCreate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user),
+):
+    if len(resources) > settings.BULK_CREATE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_CREATE_MAX_ITEMS} resources can be created at once",
+        )
+    
+    project_ids = {resource.project_id for resource in resources}
+    if current_user["role"] == "manager":
+        managed_projects = current_user.get("managed_projects", [])
+        if not project_ids.issubset(managed_projects):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only create resources for your managed projects",
+            )
+    
+    service = BulkCreateService(db)
+    missing = await service.missing_projects(project_ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Projects not found: {', '.join(map(str, missing))}",
+        )
+    
+    ids = await service.create(Resource, resources)
+    for project_id in project_ids:
+        analytics_cache.invalidate_project(project_id)
+    return {"ids": ids}
+
+
 @router.get("/", response_model=List[ResourceResponse])
 async def get_resources(
+    request: Request,
+    response: Response,
     project_id: Optional[int] = Query(None),
     resource_type: Optional[ResourceType] = Query(None),
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    sort: ResourceSort = Query("id"),
+    include_total: bool = Query(False, description="Adds X-Total-Count-Estimate"),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: dict = Depends(get_current_user),
 ):
-    query = db.query(Resource)
+    page = Pagination(Resource, sort=sort, limit=limit, skip=skip, cursor=cursor)
+    etag = await scope_etag(
+        db, request, current_user, project_ids=[project_id] if project_id else None
+    )
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
     
-    if current_user["role"] == "manager":
-        managed_projects = current_user.get("managed_projects", [])
-        query = query.filter(Resource.project_id.in_(managed_projects))
-    elif current_user["role"] == "worker":
-        return []
+    query = scope_to_user(select(Resource), Resource, current_user)
     
     if project_id:
-        query = query.filter(Resource.project_id == project_id)
+        query = query.where(Resource.project_id == project_id)
     if resource_type:
-        query = query.filter(Resource.resource_type == resource_type)
+        query = query.where(Resource.resource_type == resource_type)
     
-    return query.offset(skip).limit(limit).all()
+    result = await db.execute(page.apply(query))
+    resources = page.page(result.scalars().all())
+    total = await db.run_sync(lambda session: estimate_count(session, query)) if include_total else None
+    page.set_headers(response, total)
+    return resources
 
 
 @router.get("/{resource_id}", response_model=ResourceResponse)
 async def get_resource(
     resource_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
-    resource = db.query(Resource).filter(Resource.id == resource_id).first()
+    marker = await row_marker(db, Resource, resource_id, Resource.project_id)
     
-    if not resource:
+    if not marker:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Resource with id {resource_id} not found",
@@ -81,7 +145,7 @@ async def get_resource(
     
     if current_user["role"] == "manager":
         managed_projects = current_user.get("managed_projects", [])
-        if resource.project_id not in managed_projects:
+        if marker.project_id not in managed_projects:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have access to this resource",
@@ -92,6 +156,16 @@ async def get_resource(
             detail="Workers cannot access resource details",
         )
     
+    unchanged = not_modified(request, response, make_etag(request.url.path, *marker))
+    if unchanged is not None:
+        return unchanged
+    
+    resource = await db.get(Resource, resource_id)
+    if not resource:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Resource with id {resource_id} not found",
+        )
     return resource
 
 
@@ -103,34 +177,32 @@ async def get_resource(
 async def update_resource(
     resource_id: int,
     resource_update: ResourceUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
-    db_resource = (
-        db.query(Resource).filter(Resource.id == resource_id).first()
+    values = resource_update.model_dump(exclude_unset=True, exclude={"version"})
+    values["total_cost"] = Resource.total_cost_for(values)
+    outcome, db_resource = await ScopedWriter(db, current_user).update(
+        Resource, resource_id, values, version=resource_update.version
     )
     
-    if not db_resource:
+    if outcome == WriteOutcome.NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Resource with id {resource_id} not found",
         )
+    if outcome == WriteOutcome.FORBIDDEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only update resources in your managed projects",
+        )
+    if outcome == WriteOutcome.CONFLICT:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Resource was changed by someone else; reload it and try again",
+        )
     
-    if current_user["role"] == "manager":
-        managed_projects = current_user.get("managed_projects", [])
-        if db_resource.project_id not in managed_projects:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only update resources in your managed projects",
-            )
-    
-    update_data = resource_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_resource, field, value)
-    
-    db_resource.calculate_total_cost()
-    db.commit()
-    db.refresh(db_resource)
+    analytics_cache.invalidate_project(db_resource.project_id)
     return db_resource
 
 
@@ -141,12 +213,10 @@ async def update_resource(
 )
 async def delete_resource(
     resource_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
-    db_resource = (
-        db.query(Resource).filter(Resource.id == resource_id).first()
-    )
+    db_resource = await db.get(Resource, resource_id)
     
     if not db_resource:
         raise HTTPException(
@@ -162,6 +232,9 @@ async def delete_resource(
                 detail="You can only delete resources from your managed projects",
             )
     
-    db.delete(db_resource)
-    db.commit()
+    project_id = db_resource.project_id
+    await db.delete(db_resource)
+    await db.run_sync(lambda session: RollupService(session).record_delete(db_resource))
+    await db.commit()
+    analytics_cache.invalidate_project(project_id)
     return None
\ No newline at end of file
@@ -1,20 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
+from typing import List, Literal, Optional
+from app.database import get_async_db
+from app.read_replica import get_async_read_db
 from app.models.task import Task, TaskStatus
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskBulkUpdate,
+    TaskBulkUpdateResult,
+)
+from app.schemas.bulk import BulkCreateResponse
+from app.services.rollup_service import RollupService
+from app.services.bulk_create_service import BulkCreateService
+from app.services.scoped_writes import ScopedWriter, WriteOutcome
+from app.cache import analytics_cache, make_etag, not_modified, row_marker, scope_etag
+from app.config import settings
 from app.auth.dependencies import get_current_user, require_role
+from app.auth.scoping import scope_to_user, user_scope
+from app.utils.pagination import Pagination, estimate_count
 
 router = APIRouter()
 
+TaskSort = Literal["id", "name", "start_date", "planned_end_date", "created_at", "updated_at"]
+
+WORKER_TASK_FIELDS = {"status", "progress_percentage", "actual_end_date"}
+
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    marker = await row_marker(db, Task, task_id, Task.status, Task.planned_end_date)
+    if not marker:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with id {task_id} not found"
+        )
+    
+    etag = make_etag(
+        request.url.path, *marker, Task.is_overdue_for(marker.status, marker.planned_end_date)
+    )
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+    
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -26,15 +63,15 @@ async def get_task(
 @router.get("/project/{project_id}/overdue", response_model=List[TaskResponse])
 async def get_overdue_tasks(
     project_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     from datetime import datetime
-    tasks = db.query(Task).filter(
+    result = await db.execute(select(Task).where(
         Task.project_id == project_id,
         Task.status != TaskStatus.COMPLETED,
         Task.planned_end_date < datetime.utcnow()
-    ).all()
-    return tasks
+    ))
+    return result.scalars().all()
 
 def check_task_access(current_user: dict, task: Task) -> bool:
     if current_user["role"] == "admin":
@@ -47,30 +84,46 @@ def check_task_access(current_user: dict, task: Task) -> bool:
     return False
 
 
+def task_update_data(current_user: dict, task_update: TaskUpdate) -> dict:
+    # Workers may only report progress on their tasks.
+    include = WORKER_TASK_FIELDS if current_user["role"] == "worker" else None
+    return task_update.model_dump(exclude_unset=True, include=include, exclude={"id", "version"})
+
+
 @router.get("/", response_model=List[TaskResponse])
 async def get_tasks(
+    request: Request,
+    response: Response,
     project_id: Optional[int] = Query(None),
     status: Optional[TaskStatus] = Query(None),
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    sort: TaskSort = Query("id"),
+    include_total: bool = Query(False, description="Adds X-Total-Count-Estimate"),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: dict = Depends(get_current_user),
 ):
-    query = db.query(Task)
+    page = Pagination(Task, sort=sort, limit=limit, skip=skip, cursor=cursor)
+    etag = await scope_etag(
+        db, request, current_user, project_ids=[project_id] if project_id else None, clock=True
+    )
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
     
-    if current_user["role"] == "worker":
-        worker_name = current_user.get("worker_name")
-        query = query.filter(Task.assigned_to == worker_name)
-    elif current_user["role"] == "manager":
-        managed_projects = current_user.get("managed_projects", [])
-        query = query.filter(Task.project_id.in_(managed_projects))
+    query = scope_to_user(select(Task), Task, current_user)
     
     if project_id:
-        query = query.filter(Task.project_id == project_id)
+        query = query.where(Task.project_id == project_id)
     if status:
-        query = query.filter(Task.status == status)
+        query = query.where(Task.status == status)
     
-    return query.offset(skip).limit(limit).all()
+    result = await db.execute(page.apply(query))
+    tasks = page.page(result.scalars().all())
+    total = await db.run_sync(lambda session: estimate_count(session, query)) if include_total else None
+    page.set_headers(response, total)
+    return tasks
 
 
 @router.post(
@@ -81,7 +134,7 @@ async def get_tasks(
 )
 async def create_task(
     task: TaskCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     if current_user["role"] == "manager":
@@ -92,48 +145,188 @@ async def create_task(
                 detail="You can only create tasks for your managed projects",
             )
     
-    db_task = Task(**task.model_dump())
-    db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    db_task = await ScopedWriter(db, current_user).insert(Task, task.model_dump())
+    analytics_cache.invalidate_project(db_task.project_id)
     return db_task
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_role("admin", "manager"))],
+)
+async def bulk_create_tasks(
+    tasks: List[TaskCreate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user),
+):
+    if len(tasks) > settings.BULK_CREATE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_CREATE_MAX_ITEMS} tasks can be created at once",
+        )
+    
+    project_ids = {task.project_id for task in tasks}
+    if current_user["role"] == "manager":
+        managed_projects = current_user.get("managed_projects", [])
+        if not project_ids.issubset(managed_projects):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only create tasks for your managed projects",
+            )
+    
+    service = BulkCreateService(db)
+    missing = await service.missing_projects(project_ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Projects not found: {', '.join(map(str, missing))}",
+        )
+    
+    ids = await service.create(Task, tasks)
+    for project_id in project_ids:
+        analytics_cache.invalidate_project(project_id)
+    return {"ids": ids}
+
+
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: int,
     task_update: TaskUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+    outcome, db_task = await ScopedWriter(db, current_user).update(
+        Task, task_id, task_update_data(current_user, task_update), version=task_update.version
+    )
     
-    if not db_task:
+    if outcome == WriteOutcome.NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with id {task_id} not found",
         )
-    
-    if not check_task_access(current_user, db_task):
+    if outcome == WriteOutcome.FORBIDDEN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this task",
         )
+    if outcome == WriteOutcome.CONFLICT:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Task was changed by someone else; reload it and try again",
+        )
     
-    if current_user["role"] == "worker":
-        allowed_fields = {"status", "progress_percentage", "actual_end_date"}
-        update_data = task_update.model_dump(
-            exclude_unset=True, include=allowed_fields
+    analytics_cache.invalidate_project(db_task.project_id)
+    return db_task
+
+
+@router.patch("/bulk", response_model=List[TaskBulkUpdateResult])
+async def bulk_update_tasks(
+    updates: List[TaskBulkUpdate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user),
+):
+    if len(updates) > settings.TASK_BULK_UPDATE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.TASK_BULK_UPDATE_MAX_ITEMS} tasks can be updated at once",
+        )
+    task_ids = [item.id for item in updates]
+    if len(set(task_ids)) != len(task_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each task can only appear once in a bulk update",
         )
-    else:
-        update_data = task_update.model_dump(exclude_unset=True)
     
-    for field, value in update_data.items():
-        setattr(db_task, field, value)
+    # One SELECT serves the access checks and the rollup snapshots.
+    result = await db.execute(select(Task).where(Task.id.in_(task_ids)))
+    tasks = {task.id: task for task in result.scalars().all()}
     
-    db.commit()
-    db.refresh(db_task)
-    return db_task
+    conflict_detail = "Task was changed by someone else; reload it and try again"
+    results = {}
+    pending = []
+    for item in updates:
+        db_task = tasks.get(item.id)
+        if db_task is None:
+            results[item.id] = TaskBulkUpdateResult(
+                id=item.id, status="not_found", detail=f"Task with id {item.id} not found"
+            )
+            continue
+        if not check_task_access(current_user, db_task):
+            results[item.id] = TaskBulkUpdateResult(
+                id=item.id, status="forbidden", detail="You don't have access to this task"
+            )
+            continue
+        if item.version is not None and item.version != db_task.version:
+            results[item.id] = TaskBulkUpdateResult(
+                id=item.id, status="conflict", detail=conflict_detail
+            )
+            continue
+        
+        update_data = task_update_data(current_user, item)
+        if update_data:
+            before = RollupService.task_contribution(db_task.status, db_task.planned_end_date)
+            after = RollupService.task_contribution(
+                update_data.get("status", db_task.status),
+                update_data.get("planned_end_date", db_task.planned_end_date),
+            )
+            pending.append((
+                db_task.id,
+                db_task.version,
+                update_data,
+                ((db_task.project_id, before), (db_task.project_id, after)),
+            ))
+    
+    def apply_updates(session: Session):
+        # Each UPDATE is pinned to the version and scope checked above, so a
+        # task changed in between is reported instead of overwritten, and
+        # only tasks whose snapshot was still current add a rollup delta.
+        scope = user_scope(Task, current_user)
+        changes = []
+        for task_id, loaded_version, update_data, change in pending:
+            stmt = update(Task).where(Task.id == task_id, Task.version == loaded_version)
+            if scope is not None:
+                stmt = stmt.where(scope)
+            matched = session.execute(
+                stmt.values(**update_data)
+                .returning(Task.id)
+                .execution_options(synchronize_session=False)
+            ).first()
+            if matched is None:
+                results[task_id] = TaskBulkUpdateResult(
+                    id=task_id, status="conflict", detail=conflict_detail
+                )
+            else:
+                changes.append(change)
+        RollupService(session).record_changes(changes)
+    
+    await db.run_sync(apply_updates)
+    await db.commit()
+    
+    allowed_ids = [task_id for task_id in task_ids if task_id not in results]
+    if allowed_ids:
+        result = await db.execute(
+            select(Task)
+            .where(Task.id.in_(allowed_ids))
+            .execution_options(populate_existing=True)
+        )
+        for db_task in result.scalars().all():
+            results[db_task.id] = TaskBulkUpdateResult(
+                id=db_task.id,
+                status="updated",
+                task=TaskResponse.model_validate(db_task),
+            )
+    
+    for project_id in {tasks[task_id].project_id for task_id in allowed_ids}:
+        analytics_cache.invalidate_project(project_id)
+    # A task deleted after the commit is gone from the re-select.
+    return [
+        results.get(task_id) or TaskBulkUpdateResult(
+            id=task_id, status="not_found", detail=f"Task with id {task_id} not found"
+        )
+        for task_id in task_ids
+    ]
 
 
 @router.delete(
@@ -143,10 +336,10 @@ async def update_task(
 )
 async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+    db_task = await db.get(Task, task_id)
     
     if not db_task:
         raise HTTPException(
@@ -162,6 +355,9 @@ async def delete_task(
                 detail="You can only delete tasks from your managed projects",
             )
     
-    db.delete(db_task)
-    db.commit()
+    project_id = db_task.project_id
+    await db.delete(db_task)
+    await db.run_sync(lambda session: RollupService(session).record_delete(db_task))
+    await db.commit()
+    analytics_cache.invalidate_project(project_id)
     return None
\ No newline at end of file
@@ -1,11 +1,19 @@
 from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectSummary
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskBulkUpdate,
+    TaskBulkUpdateResult,
+)
 from app.schemas.resource import ResourceCreate, ResourceUpdate, ResourceResponse
 from app.schemas.budget import BudgetCreate, BudgetUpdate, BudgetResponse
+from app.schemas.bulk import BulkCreateResponse
 
 __all__ = [
     "ProjectCreate", "ProjectUpdate", "ProjectResponse", "ProjectSummary",
-    "TaskCreate", "TaskUpdate", "TaskResponse",
+    "TaskCreate", "TaskUpdate", "TaskResponse", "TaskBulkUpdate", "TaskBulkUpdateResult",
     "ResourceCreate", "ResourceUpdate", "ResourceResponse",
-    "BudgetCreate", "BudgetUpdate", "BudgetResponse"
+    "BudgetCreate", "BudgetUpdate", "BudgetResponse",
+    "BulkCreateResponse",
 ]
\ No newline at end of file
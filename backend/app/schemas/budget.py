@@ -20,6 +20,7 @@ class BudgetUpdate(BaseModel):
     description: Optional[str] = None
     planned_amount: Optional[float] = Field(None, ge=0)
     actual_amount: Optional[float] = Field(None, ge=0)
+    version: Optional[int] = None
 
 
 class BudgetResponse(BudgetBase):
@@ -29,6 +30,7 @@ class BudgetResponse(BudgetBase):
     budget_date: datetime
     created_at: datetime
     updated_at: datetime
+    version: int
     
     class Config:
         from_attributes = True
\ No newline at end of file
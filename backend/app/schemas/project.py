@@ -28,6 +28,7 @@ class ProjectUpdate(BaseModel):
     total_budget: Optional[float] = Field(None, ge=0)
     spent_amount: Optional[float] = Field(None, ge=0)
     location: Optional[str] = None
+    version: Optional[int] = None
 
 
 class ProjectResponse(ProjectBase):
@@ -38,6 +39,7 @@ class ProjectResponse(ProjectBase):
     remaining_budget: float
     created_at: datetime
     updated_at: datetime
+    version: int
     
     class Config:
         from_attributes = True
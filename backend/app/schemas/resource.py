@@ -27,6 +27,7 @@ class ResourceUpdate(BaseModel):
     unit: Optional[str] = Field(None, max_length=50)
     unit_cost: Optional[float] = Field(None, ge=0)
     supplier: Optional[str] = None
+    version: Optional[int] = None
 
 
 class ResourceResponse(ResourceBase):
@@ -35,6 +36,7 @@ class ResourceResponse(ResourceBase):
     allocated_date: datetime
     created_at: datetime
     updated_at: datetime
+    version: int
     
     class Config:
         from_attributes = True
\ No newline at end of file
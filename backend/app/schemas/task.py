@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
 from app.models.task import TaskStatus, TaskPriority
 
@@ -32,6 +32,8 @@ class TaskUpdate(BaseModel):
     progress_percentage: Optional[float] = Field(None, ge=0, le=100)
     assigned_to: Optional[str] = None
     depends_on_task_id: Optional[int] = None
+    # The version last read; a stale one makes the update fail with 409.
+    version: Optional[int] = None
 
 
 class TaskResponse(TaskBase):
@@ -40,6 +42,18 @@ class TaskResponse(TaskBase):
     is_overdue: bool
     created_at: datetime
     updated_at: datetime
+    version: int
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class TaskBulkUpdate(TaskUpdate):
+    id: int
+
+
+class TaskBulkUpdateResult(BaseModel):
+    id: int
+    status: Literal["updated", "not_found", "forbidden", "conflict"]
+    detail: Optional[str] = None
+    task: Optional[TaskResponse] = None
\ No newline at end of file
@@ -1,5 +1,6 @@
 from app.services.project_service import ProjectService
-from app.services.analytics_service import AnalyticsService  
+from app.services.analytics_service import AnalyticsService, AsyncAnalyticsService
 from app.services.import_service import ImportService
+from app.services.bulk_create_service import BulkCreateService
 
-__all__ = ["ProjectService", "AnalyticsService", "ImportService"]
\ No newline at end of file
+__all__ = ["ProjectService", "AnalyticsService", "AsyncAnalyticsService", "ImportService", "BulkCreateService"]
\ No newline at end of file
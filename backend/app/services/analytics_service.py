@@ -1,62 +1,74 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, true
 from app.models.project import Project, ProjectStatus
 from app.models.task import Task, TaskStatus
-from app.models.resource import Resource, ResourceType
+from app.models.resource import ResourceType
 from app.models.budget import Budget
+from app.services.rollup_service import RollupService, RESOURCE_TYPE_COLUMNS
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
+from app.utils.query_counter import QueryCounter
 
 
 class AnalyticsService:
     def __init__(self, db: Session):
         self.db = db
+        self.last_query_count = 0
     
     def get_dashboard_stats(self) -> Dict:
-        total_projects = self.db.query(Project).count()
-        active_projects = self.db.query(Project).filter(
-            Project.status == ProjectStatus.IN_PROGRESS
-        ).count()
-        
-        total_budget = self.db.query(func.sum(Project.total_budget)).scalar() or 0
-        total_spent = self.db.query(func.sum(Project.spent_amount)).scalar() or 0
-        
-        total_tasks = self.db.query(Task).count()
-        completed_tasks = self.db.query(Task).filter(
-            Task.status == TaskStatus.COMPLETED
-        ).count()
-        overdue_tasks = self.db.query(Task).filter(
-            Task.status != TaskStatus.COMPLETED,
-            Task.planned_end_date < datetime.utcnow()
-        ).count()
-        
-        return {
-            "total_projects": total_projects,
-            "active_projects": active_projects,
-            "completed_projects": self.db.query(Project).filter(
-                Project.status == ProjectStatus.COMPLETED
-            ).count(),
-            "total_budget": round(total_budget, 2),
-            "total_spent": round(total_spent, 2),
-            "budget_utilization": round((total_spent / total_budget * 100) if total_budget > 0 else 0, 2),
-            "total_tasks": total_tasks,
-            "completed_tasks": completed_tasks,
-            "overdue_tasks": overdue_tasks,
-            "task_completion_rate": round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 2)
-        }
+        stats = self._aggregate_dashboard()
+        return self._format_dashboard_stats(stats)
     
     def get_project_kpi(self, project_id: int) -> Dict:
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-        if not project:
+        return self.get_projects_kpi([project_id]).get(project_id, {})
+    
+    def get_projects_kpi(
+        self,
+        project_ids: Optional[List[int]] = None,
+        worker_name: Optional[str] = None,
+    ) -> Dict[int, Dict]:
+        # A fixed number of statements regardless of how many projects are
+        # requested: projects, their rollup rows and one grouped overdue count.
+        query = self.db.query(Project)
+        if project_ids is not None:
+            query = query.filter(Project.id.in_(project_ids))
+        if worker_name is not None:
+            query = query.filter(Project.id.in_(
+                select(Task.project_id).where(Task.assigned_to == worker_name)
+            ))
+        projects = query.order_by(Project.id).all()
+        if not projects:
             return {}
         
-        tasks = self.db.query(Task).filter(Task.project_id == project_id).all()
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
-        overdue_tasks = len([t for t in tasks if t.is_overdue])
+        ids = [project.id for project in projects]
+        rollups = RollupService(self.db).get_rollups(ids)
+        
+        overdue_ids = [pid for pid in ids if rollups[pid]["overdue_candidate_tasks"] > 0]
+        overdue_counts = {}
+        if overdue_ids:
+            overdue_counts = dict(
+                self.db.query(Task.project_id, func.count(Task.id)).filter(
+                    Task.project_id.in_(overdue_ids),
+                    Task.status != TaskStatus.COMPLETED,
+                    Task.planned_end_date < datetime.utcnow()
+                ).group_by(Task.project_id).all()
+            )
         
-        resources = self.db.query(Resource).filter(Resource.project_id == project_id).all()
-        total_resource_cost = sum(r.total_cost for r in resources)
+        return {
+            project.id: self._build_project_kpi(
+                project, rollups[project.id], overdue_counts.get(project.id, 0)
+            )
+            for project in projects
+        }
+    
+    @staticmethod
+    def _build_project_kpi(project: Project, rollup: Dict, overdue_tasks: int) -> Dict:
+        total_tasks = rollup["total_tasks"]
+        completed_tasks = rollup["completed_tasks"]
+        total_resource_cost = (
+            rollup["material_cost"] + rollup["equipment_cost"] + rollup["labor_cost"]
+        )
         
         return {
             "project_name": project.name,
@@ -68,9 +80,9 @@ class AnalyticsService:
             "budget_utilization": round(project.budget_utilization, 2),
             "total_tasks": total_tasks,
             "completed_tasks": completed_tasks,
-            "in_progress_tasks": len([t for t in tasks if t.status == TaskStatus.IN_PROGRESS]),
+            "in_progress_tasks": rollup["in_progress_tasks"],
             "overdue_tasks": overdue_tasks,
-            "total_resources": len(resources),
+            "total_resources": rollup["total_resources"],
             "resource_cost": round(total_resource_cost, 2),
             "start_date": project.start_date.isoformat() if project.start_date else None,
             "planned_end": project.planned_end_date.isoformat() if project.planned_end_date else None,
@@ -93,18 +105,19 @@ class AnalyticsService:
         return breakdown
     
     def get_resource_distribution(self, project_id: int) -> Dict:
-        resources = self.db.query(Resource).filter(Resource.project_id == project_id).all()
+        rollup = RollupService(self.db).get_rollups([project_id]).get(project_id)
         
         distribution = {
             ResourceType.MATERIAL.value: {"count": 0, "total_cost": 0},
             ResourceType.EQUIPMENT.value: {"count": 0, "total_cost": 0},
             ResourceType.LABOR.value: {"count": 0, "total_cost": 0}
         }
+        if not rollup:
+            return distribution
         
-        for resource in resources:
-            dist_key = resource.resource_type.value
-            distribution[dist_key]["count"] += 1
-            distribution[dist_key]["total_cost"] += resource.total_cost
+        for resource_type, (count_column, cost_column) in RESOURCE_TYPE_COLUMNS.items():
+            distribution[resource_type.value]["count"] = rollup[count_column]
+            distribution[resource_type.value]["total_cost"] = rollup[cost_column]
         
         return distribution
     
@@ -140,9 +153,9 @@ class AnalyticsService:
         if not project:
             return {}
         
-        tasks = self.db.query(Task).filter(Task.project_id == project_id).all()
-        completed = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
-        total = len(tasks)
+        rollup = RollupService(self.db).get_rollups([project_id])[project_id]
+        completed = rollup["completed_tasks"]
+        total = rollup["total_tasks"]
         
         if total == 0 or completed == 0:
             return {
@@ -177,6 +190,7 @@ class AnalyticsService:
     
     def get_manager_dashboard_stats(self, managed_project_ids: List[int]) -> Dict:
         if not managed_project_ids:
+            self.last_query_count = 0
             return {
                 "total_projects": 0,
                 "active_projects": 0,
@@ -190,97 +204,106 @@ class AnalyticsService:
                 "task_completion_rate": 0
             }
         
-        total_projects = self.db.query(Project).filter(
-            Project.id.in_(managed_project_ids)
-        ).count()
-        
-        active_projects = self.db.query(Project).filter(
-            Project.id.in_(managed_project_ids),
-            Project.status == ProjectStatus.IN_PROGRESS
-        ).count()
-        
-        total_budget = self.db.query(func.sum(Project.total_budget)).filter(
-            Project.id.in_(managed_project_ids)
-        ).scalar() or 0
-        
-        total_spent = self.db.query(func.sum(Project.spent_amount)).filter(
-            Project.id.in_(managed_project_ids)
-        ).scalar() or 0
-        
-        total_tasks = self.db.query(Task).filter(
-            Task.project_id.in_(managed_project_ids)
-        ).count()
-        
-        completed_tasks = self.db.query(Task).filter(
-            Task.project_id.in_(managed_project_ids),
-            Task.status == TaskStatus.COMPLETED
-        ).count()
-        
-        overdue_tasks = self.db.query(Task).filter(
-            Task.project_id.in_(managed_project_ids),
-            Task.status != TaskStatus.COMPLETED,
-            Task.planned_end_date < datetime.utcnow()
-        ).count()
+        stats = self._aggregate_dashboard(project_ids=managed_project_ids)
+        return self._format_dashboard_stats(stats)
+
+    def get_worker_dashboard_stats(self, worker_name: str) -> Dict:
+        stats = self._aggregate_dashboard(worker_name=worker_name)
+        total_tasks = stats["total_tasks"]
+        completed_tasks = stats["completed_tasks"]
         
         return {
-            "total_projects": total_projects,
-            "active_projects": active_projects,
-            "completed_projects": self.db.query(Project).filter(
-                Project.id.in_(managed_project_ids),
-                Project.status == ProjectStatus.COMPLETED
-            ).count(),
-            "total_budget": round(total_budget, 2),
-            "total_spent": round(total_spent, 2),
-            "budget_utilization": round(
-                (total_spent / total_budget * 100) if total_budget > 0 else 0, 2
-            ),
             "total_tasks": total_tasks,
             "completed_tasks": completed_tasks,
-            "overdue_tasks": overdue_tasks,
+            "in_progress_tasks": stats["in_progress_tasks"],
+            "not_started_tasks": stats["not_started_tasks"],
+            "overdue_tasks": stats["overdue_tasks"],
+            "upcoming_tasks": stats["upcoming_tasks"],
             "task_completion_rate": round(
                 (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 2
             )
         }
-
-
-    def get_worker_dashboard_stats(self, worker_name: str) -> Dict:
-        total_tasks = self.db.query(Task).filter(
-            Task.assigned_to == worker_name
-        ).count()
-        
-        completed_tasks = self.db.query(Task).filter(
-            Task.assigned_to == worker_name,
-            Task.status == TaskStatus.COMPLETED
-        ).count()
-        
-        in_progress_tasks = self.db.query(Task).filter(
-            Task.assigned_to == worker_name,
-            Task.status == TaskStatus.IN_PROGRESS
-        ).count()
+    
+    def _aggregate_dashboard(
+        self,
+        project_ids: Optional[List[int]] = None,
+        worker_name: Optional[str] = None,
+    ) -> Dict:
+        # Every counter and sum for one role scope is computed by a single
+        # conditional-aggregation statement, i.e. one round trip per request.
+        now = datetime.utcnow()
+        upcoming_deadline = now + timedelta(days=7)
+        not_completed = Task.status != TaskStatus.COMPLETED
+        
+        task_stats = select(
+            func.count(Task.id).label("total_tasks"),
+            func.count(Task.id).filter(
+                Task.status == TaskStatus.COMPLETED
+            ).label("completed_tasks"),
+            func.count(Task.id).filter(
+                Task.status == TaskStatus.IN_PROGRESS
+            ).label("in_progress_tasks"),
+            func.count(Task.id).filter(
+                Task.status == TaskStatus.NOT_STARTED
+            ).label("not_started_tasks"),
+            func.count(Task.id).filter(
+                not_completed, Task.planned_end_date < now
+            ).label("overdue_tasks"),
+            func.count(Task.id).filter(
+                not_completed,
+                Task.planned_end_date.between(now, upcoming_deadline)
+            ).label("upcoming_tasks"),
+        )
+        
+        if worker_name is not None:
+            stmt = task_stats.where(Task.assigned_to == worker_name)
+        else:
+            project_stats = select(
+                func.count(Project.id).label("total_projects"),
+                func.count(Project.id).filter(
+                    Project.status == ProjectStatus.IN_PROGRESS
+                ).label("active_projects"),
+                func.count(Project.id).filter(
+                    Project.status == ProjectStatus.COMPLETED
+                ).label("completed_projects"),
+                func.coalesce(func.sum(Project.total_budget), 0).label("total_budget"),
+                func.coalesce(func.sum(Project.spent_amount), 0).label("total_spent"),
+            )
+            if project_ids is not None:
+                project_stats = project_stats.where(Project.id.in_(project_ids))
+                task_stats = task_stats.where(Task.project_id.in_(project_ids))
+            
+            project_sub = project_stats.subquery()
+            task_sub = task_stats.subquery()
+            stmt = select(project_sub, task_sub).select_from(
+                project_sub.join(task_sub, true())
+            )
         
-        overdue_tasks = self.db.query(Task).filter(
-            Task.assigned_to == worker_name,
-            Task.status != TaskStatus.COMPLETED,
-            Task.planned_end_date < datetime.utcnow()
-        ).count()
+        with QueryCounter(self.db) as counter:
+            row = self.db.execute(stmt).one()
+        self.last_query_count = counter.count
         
-        upcoming_deadline = datetime.utcnow() + timedelta(days=7)
-        upcoming_tasks = self.db.query(Task).filter(
-            Task.assigned_to == worker_name,
-            Task.status != TaskStatus.COMPLETED,
-            Task.planned_end_date.between(datetime.utcnow(), upcoming_deadline)
-        ).count()
+        return dict(row._mapping)
+    
+    @staticmethod
+    def _format_dashboard_stats(stats: Dict) -> Dict:
+        total_budget = stats["total_budget"] or 0
+        total_spent = stats["total_spent"] or 0
+        total_tasks = stats["total_tasks"]
+        completed_tasks = stats["completed_tasks"]
         
         return {
+            "total_projects": stats["total_projects"],
+            "active_projects": stats["active_projects"],
+            "completed_projects": stats["completed_projects"],
+            "total_budget": round(total_budget, 2),
+            "total_spent": round(total_spent, 2),
+            "budget_utilization": round(
+                (total_spent / total_budget * 100) if total_budget > 0 else 0, 2
+            ),
             "total_tasks": total_tasks,
             "completed_tasks": completed_tasks,
-            "in_progress_tasks": in_progress_tasks,
-            "not_started_tasks": self.db.query(Task).filter(
-                Task.assigned_to == worker_name,
-                Task.status == TaskStatus.NOT_STARTED
-            ).count(),
-            "overdue_tasks": overdue_tasks,
-            "upcoming_tasks": upcoming_tasks,
+            "overdue_tasks": stats["overdue_tasks"],
             "task_completion_rate": round(
                 (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 2
             )
@@ -323,4 +346,57 @@ class AnalyticsService:
         return {
             "team_members": len(team_stats),
             "performance": team_stats
-        }
\ No newline at end of file
+        }
+
+
+class AsyncAnalyticsService:
+    # The reports stay written against a sync Session; run_sync drives them
+    # over the AsyncSession's asyncpg connection, so a slow report yields to
+    # the event loop instead of blocking it.
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.last_query_count = 0
+    
+    async def _run(self, method: str, *args, **kwargs):
+        def call(session: Session):
+            service = AnalyticsService(session)
+            try:
+                return getattr(service, method)(*args, **kwargs)
+            finally:
+                self.last_query_count = service.last_query_count
+        
+        return await self.db.run_sync(call)
+    
+    async def get_dashboard_stats(self) -> Dict:
+        return await self._run("get_dashboard_stats")
+    
+    async def get_manager_dashboard_stats(self, managed_project_ids: List[int]) -> Dict:
+        return await self._run("get_manager_dashboard_stats", managed_project_ids)
+    
+    async def get_worker_dashboard_stats(self, worker_name: str) -> Dict:
+        return await self._run("get_worker_dashboard_stats", worker_name)
+    
+    async def get_project_kpi(self, project_id: int) -> Dict:
+        return await self._run("get_project_kpi", project_id)
+    
+    async def get_projects_kpi(
+        self,
+        project_ids: Optional[List[int]] = None,
+        worker_name: Optional[str] = None,
+    ) -> Dict[int, Dict]:
+        return await self._run("get_projects_kpi", project_ids, worker_name=worker_name)
+    
+    async def get_budget_breakdown(self, project_id: int) -> List[Dict]:
+        return await self._run("get_budget_breakdown", project_id)
+    
+    async def get_resource_distribution(self, project_id: int) -> Dict:
+        return await self._run("get_resource_distribution", project_id)
+    
+    async def get_project_timeline(self, project_id: int) -> Dict:
+        return await self._run("get_project_timeline", project_id)
+    
+    async def predict_completion(self, project_id: int) -> Dict:
+        return await self._run("predict_completion", project_id)
+    
+    async def get_team_performance(self, project_id: int = None) -> Dict:
+        return await self._run("get_team_performance", project_id)
\ No newline at end of file
@@ -0,0 +1,52 @@
+import pandas as pd
+from typing import Dict, Iterable, List, Sequence
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.project import Project
+from app.models.resource import Resource
+from app.services.bulk_loader import insert_records
+from app.services.import_pipeline import frame_to_records
+from app.services.rollup_service import RollupService
+
+
+class BulkCreateService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def missing_projects(self, project_ids: Iterable[int]) -> List[int]:
+        project_ids = set(project_ids)
+        result = await self.db.execute(
+            select(Project.id).where(Project.id.in_(project_ids))
+        )
+        return sorted(project_ids - set(result.scalars().all()))
+    
+    async def create(self, model, items: Sequence[BaseModel]) -> List[int]:
+        records = self._records(model, items)
+        
+        def insert_rows(session: Session) -> List[int]:
+            ids = insert_records(
+                session,
+                model.__table__,
+                records,
+                settings.BULK_CREATE_BATCH_SIZE,
+                returning=True,
+            )
+            RollupService(session).record_inserts(model, records)
+            return ids
+        
+        ids = await self.db.run_sync(insert_rows)
+        await self.db.commit()
+        return ids
+    
+    @staticmethod
+    def _records(model, items: Sequence[BaseModel]) -> List[Dict]:
+        records = [item.model_dump() for item in items]
+        if model is Resource and records:
+            # Same derivation as Resource.calculate_total_cost, column-wise.
+            frame = pd.DataFrame.from_records(records)
+            frame["total_cost"] = frame["quantity"] * frame["unit_cost"]
+            records = frame_to_records(frame)
+        return records
\ No newline at end of file
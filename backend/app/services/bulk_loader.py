@@ -0,0 +1,211 @@
+from io import StringIO
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Enum,
+    MetaData,
+    Table,
+    Text,
+    case,
+    cast,
+    func,
+    insert,
+    literal,
+    select,
+)
+from sqlalchemy.orm import Session
+from app.models.project import Project
+from app.services.import_pipeline import (
+    NO_PROJECT_REF,
+    PROJECT_REF_COLUMNS,
+    UNRESOLVED_PROJECT,
+    RejectionLog,
+    frame_to_records,
+)
+
+
+def insert_records(
+    db: Session,
+    table: Table,
+    records: List[Dict],
+    batch_size: int,
+    returning: bool = False,
+) -> List[int]:
+    ids: List[int] = []
+    
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        if returning:
+            # sort_by_parameter_order keeps the ids in input order however the
+            # dialect splits the batch into multi-row INSERT ... RETURNING.
+            result = db.execute(
+                insert(table).returning(table.c.id, sort_by_parameter_order=True), batch
+            )
+            ids.extend(result.scalars().all())
+        else:
+            db.execute(insert(table), batch)
+    
+    return ids
+
+
+def insert_frame(
+    db: Session,
+    table: Table,
+    frame: pd.DataFrame,
+    batch_size: int,
+    returning: bool = False,
+) -> List[int]:
+    return insert_records(db, table, frame_to_records(frame), batch_size, returning)
+
+
+class PostgresCopyLoader:
+    def __init__(self, db: Session, table: Table, batch_size: int = 50000):
+        self.db = db
+        self.table = table
+        self.batch_size = batch_size
+    
+    def load(
+        self, frame: pd.DataFrame, rejections: RejectionLog, returning: Sequence[str] = ()
+    ) -> Tuple[int, List[Dict]]:
+        data_columns = [c for c in frame.columns if c not in PROJECT_REF_COLUMNS]
+        staging = self._create_staging(data_columns)
+        
+        self._copy_into(staging, frame, data_columns)
+        
+        resolved = self._resolved(staging)
+        found = resolved.c.resolved_project_id.isnot(None)
+        
+        unresolved = select(resolved.c.row_no).where(~found)
+        missing = self.db.execute(
+            select(func.count()).select_from(unresolved.subquery())
+        ).scalar()
+        if missing:
+            samples = self.db.execute(
+                unresolved.order_by(resolved.c.row_no).limit(rejections.sample_size)
+            ).scalars().all()
+            rejections.add(UNRESOLVED_PROJECT, missing, samples)
+            
+            label = self._ref_label(resolved)
+            by_value = self.db.execute(
+                select(label, func.count())
+                .where(~found)
+                .group_by(label)
+                .order_by(func.count().desc())
+                .limit(rejections.max_values)
+            ).all()
+            rejections.add_values(UNRESOLVED_PROJECT, dict(by_value))
+        
+        target_columns = ["project_id", *data_columns]
+        select_columns = [resolved.c.resolved_project_id]
+        for name in data_columns:
+            column_type = self.table.c[name].type
+            if isinstance(column_type, Enum):
+                select_columns.append(cast(resolved.c[name], column_type))
+            else:
+                select_columns.append(resolved.c[name])
+        
+        # INSERT ... SELECT bypasses Python-side column defaults (timestamps).
+        for column in self.table.columns:
+            if column.name in target_columns or column.primary_key:
+                continue
+            if column.default is not None and column.default.is_callable:
+                target_columns.append(column.name)
+                select_columns.append(literal(column.default.arg(None), column.type))
+        
+        # Each inserted row comes back with its project and the requested
+        # columns (e.g. what the rollups are computed from).
+        rows = self.db.execute(
+            insert(self.table)
+            .from_select(target_columns, select(*select_columns).where(found))
+            .returning(self.table.c.project_id, *[self.table.c[name] for name in returning])
+        ).mappings().all()
+        
+        return len(rows), [dict(row) for row in rows]
+    
+    def _create_staging(self, data_columns: List[str]) -> Table:
+        columns = [
+            Column("row_no", BigInteger),
+            Column("project_id_ref", BigInteger),
+            Column("project_name_ref", Text),
+        ]
+        for name in data_columns:
+            column_type = self.table.c[name].type
+            columns.append(
+                Column(name, Text if isinstance(column_type, Enum) else column_type)
+            )
+        
+        staging = Table(
+            f"import_staging_{self.table.name}",
+            MetaData(),
+            *columns,
+            prefixes=["TEMPORARY"],
+            postgresql_on_commit="DROP",
+        )
+        staging.create(bind=self.db.connection())
+        return staging
+    
+    def _copy_into(self, staging: Table, frame: pd.DataFrame, data_columns: List[str]):
+        out = pd.DataFrame({"row_no": frame.index.astype("int64")}, index=frame.index)
+        out["project_id_ref"] = np.trunc(frame["project_id_ref"]).astype("Int64")
+        out["project_name_ref"] = frame["project_name_ref"]
+        for name in data_columns:
+            values = frame[name]
+            if isinstance(self.table.c[name].type, Enum):
+                values = values.map(lambda member: member.name)
+            out[name] = values
+        
+        copy_sql = (
+            f"COPY {staging.name} ({', '.join(out.columns)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        )
+        cursor = self.db.connection().connection.dbapi_connection.cursor()
+        try:
+            for start in range(0, len(out), self.batch_size):
+                buffer = StringIO()
+                out.iloc[start:start + self.batch_size].to_csv(
+                    buffer, header=False, index=False, na_rep="\\N"
+                )
+                buffer.seek(0)
+                cursor.copy_expert(copy_sql, buffer)
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def _ref_label(resolved):
+        # Mirrors import_pipeline.project_ref_labels.
+        return case(
+            (
+                resolved.c.project_id_ref.isnot(None),
+                literal("id ") + cast(resolved.c.project_id_ref, Text),
+            ),
+            (
+                resolved.c.project_name_ref.isnot(None),
+                literal("name '") + resolved.c.project_name_ref + literal("'"),
+            ),
+            else_=literal(NO_PROJECT_REF),
+        )
+    
+    def _resolved(self, staging: Table):
+        by_id = Project.__table__.alias("project_by_id")
+        name_key = func.lower(func.trim(Project.name))
+        by_name = (
+            select(name_key.label("name_key"), func.max(Project.id).label("id"))
+            .group_by(name_key)
+            .subquery("project_by_name")
+        )
+        
+        return (
+            select(
+                staging,
+                func.coalesce(by_id.c.id, by_name.c.id).label("resolved_project_id"),
+            )
+            .select_from(
+                staging
+                .outerjoin(by_id, by_id.c.id == staging.c.project_id_ref)
+                .outerjoin(by_name, by_name.c.name_key == staging.c.project_name_ref)
+            )
+            .subquery("resolved")
+        )
\ No newline at end of file
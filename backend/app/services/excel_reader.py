@@ -0,0 +1,119 @@
+import os
+import pickle
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from openpyxl import load_workbook
+from app.services.import_pipeline import (
+    RejectionLog,
+    prepare_tasks,
+    prepare_resources,
+    prepare_budgets,
+)
+
+SHEET_ENTITIES = ["projects", "tasks", "resources", "budgets"]
+
+CHILD_PREPARERS = {
+    "tasks": prepare_tasks,
+    "resources": prepare_resources,
+    "budgets": prepare_budgets,
+}
+
+
+def find_sheets(path: str) -> Dict[str, str]:
+    workbook = load_workbook(path, read_only=True)
+    try:
+        names = workbook.sheetnames
+    finally:
+        workbook.close()
+    
+    sheets = {}
+    for entity in SHEET_ENTITIES:
+        for name in (entity.capitalize(), entity):
+            if name in names:
+                sheets[entity] = name
+                break
+    return sheets
+
+
+def _header(row: Tuple) -> List[str]:
+    return [
+        str(value) if value is not None else f"Unnamed: {i}"
+        for i, value in enumerate(row)
+    ]
+
+
+def _to_frame(rows: List[Tuple], header: List[str], start: int) -> pd.DataFrame:
+    width = len(header)
+    rows = [row[:width] + (None,) * (width - len(row)) for row in rows]
+    return pd.DataFrame.from_records(
+        rows, columns=header, index=pd.RangeIndex(start, start + len(rows))
+    )
+
+
+def iter_sheet_batches(path: str, sheet_name: str, batch_rows: int) -> Iterator[pd.DataFrame]:
+    # read_only mode streams rows from the XML instead of building the whole
+    # sheet's cell tree. Blank rows are skipped and the index keeps counting
+    # data rows, matching pd.read_excel.
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = None
+        for row in rows:
+            if any(value is not None for value in row):
+                header = _header(row)
+                break
+        if header is None:
+            return
+        
+        batch: List[Tuple] = []
+        start = 0
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            batch.append(row)
+            if len(batch) >= batch_rows:
+                yield _to_frame(batch, header, start)
+                start += len(batch)
+                batch = []
+        if batch or start == 0:
+            yield _to_frame(batch, header, start)
+    finally:
+        workbook.close()
+
+
+def prepare_sheet(
+    path: str, sheet_name: str, entity: str, batch_rows: int, spool_dir: Optional[str] = None
+) -> Tuple[str, RejectionLog]:
+    # Runs in a worker process: parsing and validation need no database, so
+    # child sheets can be prepared side by side. Each prepared batch is
+    # pickled to a spool file as soon as it is ready and only the file's
+    # path goes back, so neither process holds more than one batch.
+    rejections = RejectionLog(entity[:-1])
+    prepare = CHILD_PREPARERS[entity]
+    fd, spool = tempfile.mkstemp(suffix=".batches", dir=spool_dir)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            for batch in iter_sheet_batches(path, sheet_name, batch_rows):
+                pickle.dump(prepare(batch, rejections), handle, pickle.HIGHEST_PROTOCOL)
+    except BaseException:
+        os.remove(spool)
+        raise
+    return spool, rejections
+
+
+def iter_spooled_batches(spool: str) -> Iterator[pd.DataFrame]:
+    with open(spool, "rb") as handle:
+        while True:
+            try:
+                yield pickle.load(handle)
+            except EOFError:
+                return
+
+
+def discard_spool(future):
+    # Done-callback for prepare_sheet futures whose batches were never read.
+    if not future.cancelled() and future.exception() is None:
+        spool, _ = future.result()
+        if os.path.exists(spool):
+            os.remove(spool)
\ No newline at end of file
@@ -0,0 +1,107 @@
+import csv
+import enum
+import os
+import tempfile
+from io import StringIO
+from typing import Iterator, List, Sequence
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+from sqlalchemy import Column, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.auth.scoping import scope_to_user
+from app.models.project import Project
+from app.models.task import Task
+from app.models.resource import Resource
+from app.models.budget import Budget
+from app.services.parquet_io import arrow_schema, record_batch
+
+EXPORT_MODELS = {
+    "projects": Project,
+    "tasks": Task,
+    "resources": Resource,
+    "budgets": Budget,
+}
+
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+
+
+def _plain(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _temp_path(suffix: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    return path
+
+
+class ExportService:
+    def __init__(self, db: Session, current_user: dict):
+        self.db = db
+        self.current_user = current_user
+    
+    def columns(self, entity: str) -> List[Column]:
+        return list(EXPORT_MODELS[entity].__table__.columns)
+    
+    def _partitions(self, entity: str) -> Iterator[Sequence]:
+        # yield_per streams from a server-side cursor, so memory is bounded by
+        # EXPORT_BATCH_ROWS however large the table is.
+        model = EXPORT_MODELS[entity]
+        stmt = select(*self.columns(entity)).order_by(model.id)
+        stmt = scope_to_user(stmt, model, self.current_user)
+        result = self.db.execute(
+            stmt.execution_options(yield_per=settings.EXPORT_BATCH_ROWS)
+        )
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+    
+    def iter_csv(self, entity: str) -> Iterator[bytes]:
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([column.name for column in self.columns(entity)])
+        for rows in self._partitions(entity):
+            writer.writerows([_plain(value) for value in row] for row in rows)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+    
+    def export_xlsx(self, entity: str) -> str:
+        # Write-only worksheets spill rows to disk as they are appended; the
+        # zip container is assembled on save, hence the temporary file.
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(entity.capitalize())
+        sheet.append([column.name for column in self.columns(entity)])
+        for rows in self._partitions(entity):
+            for row in rows:
+                sheet.append([_plain(value) for value in row])
+        
+        path = _temp_path(".xlsx")
+        try:
+            workbook.save(path)
+        except BaseException:
+            os.remove(path)
+            raise
+        return path
+    
+    def export_parquet(self, entity: str) -> str:
+        # Each partition becomes one Arrow record batch. Parquet writes its
+        # footer last, hence the temporary file.
+        columns = self.columns(entity)
+        schema = arrow_schema(columns)
+        path = _temp_path(".parquet")
+        try:
+            with pq.ParquetWriter(path, schema) as writer:
+                for rows in self._partitions(entity):
+                    writer.write_batch(record_batch(rows, columns, schema))
+        except BaseException:
+            os.remove(path)
+            raise
+        return path
\ No newline at end of file
@@ -0,0 +1,346 @@
+import os
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+from typing import Dict, Optional
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.import_job import ImportJob, ImportJobKind, ImportJobStatus, ImportMode
+from app.models.import_file import ImportFile
+from app.services.import_service import ImportCancelled, ImportProgress, ImportService
+from app.cache import analytics_cache
+
+
+def _remove_spool(path: Optional[str]):
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+class ImportJobService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def create_job(
+        self,
+        kind: ImportJobKind,
+        filename: str,
+        file_path: str,
+        created_by: str,
+        mode: ImportMode = ImportMode.INSERT,
+        content_hash: Optional[str] = None,
+    ) -> ImportJob:
+        job = ImportJob(
+            kind=kind,
+            mode=mode,
+            filename=filename,
+            file_path=file_path,
+            content_hash=content_hash,
+            created_by=created_by,
+            progress={},
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+    
+    def get_job(self, job_id: int) -> Optional[ImportJob]:
+        return self.db.query(ImportJob).filter(ImportJob.id == job_id).first()
+    
+    def find_imported_file(self, content_hash: str, mode: ImportMode) -> Optional[ImportFile]:
+        return self.db.query(ImportFile).filter(
+            ImportFile.content_hash == content_hash,
+            ImportFile.mode == ImportMode(mode).value,
+        ).first()
+    
+    def register_file(self, job: ImportJob):
+        if not job.content_hash or self.find_imported_file(job.content_hash, job.mode):
+            return
+        self.db.add(ImportFile(
+            content_hash=job.content_hash,
+            filename=job.filename,
+            kind=job.kind,
+            mode=job.mode.value,
+            job_id=job.id,
+            stats=job.progress,
+        ))
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Another job finished the same file first.
+            self.db.rollback()
+    
+    def request_cancel(self, job: ImportJob) -> ImportJob:
+        # Queued jobs are cancelled outright; running ones stop at the next
+        # committed batch, keeping whatever was already committed.
+        cancelled = self.db.execute(
+            update(ImportJob)
+            .where(
+                ImportJob.id == job.id,
+                ImportJob.status == ImportJobStatus.QUEUED,
+            )
+            .values(
+                status=ImportJobStatus.CANCELLED,
+                cancel_requested=True,
+                finished_at=datetime.utcnow(),
+                file_path=None,
+            )
+        ).rowcount
+        if cancelled:
+            self.db.commit()
+            _remove_spool(job.file_path)
+        else:
+            job.cancel_requested = True
+            self.db.commit()
+        
+        self.db.refresh(job)
+        return job
+    
+    @staticmethod
+    def imported_counts(progress: ImportProgress) -> Dict[str, int]:
+        return {
+            entity: progress.get(entity, {}).get("imported", 0)
+            for entity in ("projects", "tasks", "resources", "budgets")
+        }
+    
+    @staticmethod
+    def to_dict(job: ImportJob) -> Dict:
+        progress: ImportProgress = job.progress or {}
+        processed = sum(entry["processed"] for entry in progress.values())
+        rejected = sum(entry["rejected"] for entry in progress.values())
+        
+        elapsed = 0.0
+        if job.started_at:
+            elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+        
+        return {
+            "id": job.id,
+            "kind": job.kind.value,
+            "mode": job.mode.value,
+            "filename": job.filename,
+            "status": job.status.value,
+            "cancel_requested": job.cancel_requested,
+            "progress": progress,
+            "stats": ImportJobService.imported_counts(progress),
+            "rows_processed": processed,
+            "rows_rejected": rejected,
+            "elapsed_seconds": round(elapsed, 2),
+            "rows_per_second": round(processed / elapsed, 1) if elapsed else 0.0,
+            "error": job.error,
+            "created_by": job.created_by,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
+
+
+class ImportJobRunner:
+    def __init__(self, max_workers: int, heartbeat_seconds: int, stale_after_seconds: int):
+        self.max_workers = max_workers
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_after_seconds = stale_after_seconds
+        # Unique per process start, so a restarted worker with the same host
+        # and pid never passes for the one that claimed a job.
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._monitor: Optional[Thread] = None
+        self._stop = Event()
+        self._lock = Lock()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="import-job"
+                )
+            return self._executor
+    
+    def submit(self, job_id: int):
+        self._get_executor().submit(self._run, job_id)
+    
+    def recover(self):
+        # Every worker runs this on startup, so only jobs whose process has
+        # stopped heartbeating are interrupted; jobs other live workers are
+        # running are left alone. Interrupted jobs may have committed part of
+        # their batches, so they are not restarted automatically.
+        db = SessionLocal()
+        try:
+            self._interrupt_stale(db)
+            queued = db.query(ImportJob.id).filter(
+                ImportJob.status == ImportJobStatus.QUEUED
+            ).order_by(ImportJob.id).all()
+        finally:
+            db.close()
+        
+        for (job_id,) in queued:
+            self.submit(job_id)
+        
+        with self._lock:
+            if self._monitor is None:
+                self._stop.clear()
+                self._monitor = Thread(
+                    target=self._monitor_loop, name="import-job-heartbeat", daemon=True
+                )
+                self._monitor.start()
+    
+    def _monitor_loop(self):
+        # Beats for this process's running jobs, and picks up jobs left
+        # behind by a worker that died after startup.
+        while not self._stop.wait(self.heartbeat_seconds):
+            db = SessionLocal()
+            try:
+                db.execute(
+                    update(ImportJob)
+                    .where(
+                        ImportJob.owner == self.owner,
+                        ImportJob.status == ImportJobStatus.RUNNING,
+                    )
+                    .values(heartbeat_at=datetime.utcnow())
+                )
+                db.commit()
+                self._interrupt_stale(db)
+            except Exception as e:
+                print(f"Import job heartbeat failed: {e}")
+                db.rollback()
+            finally:
+                db.close()
+    
+    def _interrupt_stale(self, db: Session):
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=self.stale_after_seconds)
+        stale = db.execute(
+            update(ImportJob)
+            .where(
+                ImportJob.status == ImportJobStatus.RUNNING,
+                or_(ImportJob.heartbeat_at.is_(None), ImportJob.heartbeat_at < cutoff),
+            )
+            .values(
+                status=ImportJobStatus.INTERRUPTED,
+                error="The server running this import stopped",
+                finished_at=now,
+            )
+            .returning(ImportJob.id, ImportJob.file_path)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+        if not stale:
+            return
+        
+        for _, file_path in stale:
+            _remove_spool(file_path)
+        db.execute(
+            update(ImportJob)
+            .where(ImportJob.id.in_([job_id for job_id, _ in stale]))
+            .values(file_path=None)
+        )
+        db.commit()
+    
+    def shutdown(self):
+        self._stop.set()
+        with self._lock:
+            self._monitor = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+    
+    def _run(self, job_id: int):
+        db = SessionLocal()
+        try:
+            # Claiming is a conditional UPDATE so a job is only ever run once,
+            # even if it was submitted twice.
+            claimed = db.execute(
+                update(ImportJob)
+                .where(
+                    ImportJob.id == job_id,
+                    ImportJob.status == ImportJobStatus.QUEUED,
+                )
+                .values(
+                    status=ImportJobStatus.RUNNING,
+                    started_at=datetime.utcnow(),
+                    owner=self.owner,
+                    heartbeat_at=datetime.utcnow(),
+                )
+            ).rowcount
+            db.commit()
+            if not claimed:
+                return
+            
+            job = db.get(ImportJob, job_id)
+            service = ImportService(db, mode=job.mode)
+            service.on_progress = lambda progress: self._report(job_id, progress)
+            
+            error = None
+            try:
+                service.import_path(job.kind, job.file_path, job.filename)
+                final_status = ImportJobStatus.COMPLETED
+            except ImportCancelled:
+                final_status = ImportJobStatus.CANCELLED
+            except Exception as e:
+                final_status = ImportJobStatus.FAILED
+                error = str(e)
+            finally:
+                analytics_cache.invalidate_projects(service.touched_project_ids)
+            
+            _remove_spool(job.file_path)
+            # Conditional, so a job another worker already declared
+            # interrupted keeps that state.
+            finished = db.execute(
+                update(ImportJob)
+                .where(
+                    ImportJob.id == job_id,
+                    ImportJob.owner == self.owner,
+                    ImportJob.status == ImportJobStatus.RUNNING,
+                )
+                .values(
+                    status=final_status,
+                    error=error,
+                    progress=service.progress(),
+                    finished_at=datetime.utcnow(),
+                    file_path=None,
+                )
+            ).rowcount
+            db.commit()
+            
+            # Only a clean import that wrote something is skipped next time;
+            # rows naming missing projects would load once those exist.
+            if (
+                finished
+                and final_status == ImportJobStatus.COMPLETED
+                and sum(service.imported.values())
+                and not service.unresolved_project_rows()
+            ):
+                ImportJobService(db).register_file(job)
+        except Exception as e:
+            print(f"Import job {job_id} crashed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _report(job_id: int, progress: ImportProgress):
+        # Progress goes through its own session so it never shares a
+        # transaction with the rows being imported.
+        db = SessionLocal()
+        try:
+            job = db.get(ImportJob, job_id)
+            job.progress = progress
+            job.heartbeat_at = datetime.utcnow()
+            db.commit()
+            # A job declared interrupted stops like a cancelled one.
+            cancel_requested = job.cancel_requested or job.status != ImportJobStatus.RUNNING
+        finally:
+            db.close()
+        
+        if cancel_requested:
+            raise ImportCancelled()
+
+
+import_job_runner = ImportJobRunner(
+    settings.IMPORT_WORKERS,
+    heartbeat_seconds=settings.IMPORT_HEARTBEAT_SECONDS,
+    stale_after_seconds=settings.IMPORT_STALE_AFTER_SECONDS,
+)
\ No newline at end of file
@@ -0,0 +1,307 @@
+import warnings
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.models.project import ProjectStatus
+from app.models.task import TaskStatus, TaskPriority
+from app.models.resource import ResourceType, ResourceStatus
+
+PROJECT_STATUS_MAP = {
+    'planning': ProjectStatus.PLANNING,
+    'in_progress': ProjectStatus.IN_PROGRESS,
+    'active': ProjectStatus.IN_PROGRESS,
+    'on_hold': ProjectStatus.ON_HOLD,
+    'completed': ProjectStatus.COMPLETED,
+    'cancelled': ProjectStatus.CANCELLED
+}
+
+TASK_STATUS_MAP = {
+    'not_started': TaskStatus.NOT_STARTED,
+    'in_progress': TaskStatus.IN_PROGRESS,
+    'active': TaskStatus.IN_PROGRESS,
+    'completed': TaskStatus.COMPLETED,
+    'delayed': TaskStatus.DELAYED,
+    'blocked': TaskStatus.BLOCKED
+}
+
+TASK_PRIORITY_MAP = {
+    'low': TaskPriority.LOW,
+    'medium': TaskPriority.MEDIUM,
+    'high': TaskPriority.HIGH,
+    'critical': TaskPriority.CRITICAL
+}
+
+RESOURCE_TYPE_MAP = {
+    'material': ResourceType.MATERIAL,
+    'equipment': ResourceType.EQUIPMENT,
+    'labor': ResourceType.LABOR,
+    'human': ResourceType.LABOR
+}
+
+RESOURCE_STATUS_MAP = {
+    'available': ResourceStatus.AVAILABLE,
+    'in_use': ResourceStatus.IN_USE,
+    'active': ResourceStatus.IN_USE,
+    'depleted': ResourceStatus.DEPLETED,
+    'maintenance': ResourceStatus.MAINTENANCE,
+    'ordered': ResourceStatus.AVAILABLE,
+    'retired': ResourceStatus.DEPLETED
+}
+
+PROJECT_REF_COLUMNS = ["project_id_ref", "project_name_ref"]
+
+UNRESOLVED_PROJECT = "could not resolve project (use 'project_id' or 'project_name')"
+NO_PROJECT_REF = "(no project reference)"
+
+
+class RejectionLog:
+    def __init__(self, entity: str, sample_size: int = 10, max_values: int = 1000):
+        self.entity = entity
+        self.sample_size = sample_size
+        self.max_values = max_values
+        self.rows_seen = 0
+        self.counts: Dict[str, int] = {}
+        self.samples: Dict[str, List[int]] = {}
+        # Offending values per reason with their row counts, capped at
+        # max_values distinct values; anything beyond is only counted.
+        self.values: Dict[str, Dict[str, int]] = {}
+        self.overflow: Dict[str, int] = {}
+    
+    def reject(self, keep: pd.Series, mask: pd.Series, reason: str) -> pd.Series:
+        # Rows are only charged to the first reason that rejects them.
+        rejected = mask & keep
+        count = int(rejected.sum())
+        if count:
+            self.add(reason, count, rejected[rejected].index[:self.sample_size])
+        return keep & ~mask
+    
+    def add(self, reason: str, count: int, rows: Iterable[int]):
+        self.counts[reason] = self.counts.get(reason, 0) + count
+        samples = self.samples.setdefault(reason, [])
+        for row in rows:
+            if len(samples) >= self.sample_size:
+                break
+            samples.append(int(row))
+    
+    def add_values(self, reason: str, value_counts: Dict[str, int]):
+        values = self.values.setdefault(reason, {})
+        for value, count in value_counts.items():
+            if value in values or len(values) < self.max_values:
+                values[value] = values.get(value, 0) + int(count)
+            else:
+                self.overflow[reason] = self.overflow.get(reason, 0) + int(count)
+    
+    def top_values(self, reason: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        values = self.values.get(reason, {})
+        ranked = sorted(values.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit is not None else ranked
+    
+    def to_dict(self) -> List[Dict]:
+        reasons = []
+        for reason, count in self.counts.items():
+            entry = {"reason": reason, "count": count, "sample_rows": self.samples[reason]}
+            if reason in self.values:
+                entry["values"] = [
+                    {"value": value, "rows": rows} for value, rows in self.top_values(reason)
+                ]
+                entry["values_not_itemised"] = self.overflow.get(reason, 0)
+            reasons.append(entry)
+        return reasons
+    
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+    
+    def report(self):
+        for reason, count in self.counts.items():
+            rows = ", ".join(str(i) for i in self.samples[reason])
+            more = "..." if count > len(self.samples[reason]) else ""
+            print(f"Skipped {count} {self.entity} rows: {reason} (rows {rows}{more})")
+            if reason in self.values:
+                top = self.top_values(reason, self.sample_size)
+                listed = ", ".join(f"{value} x{n}" for value, n in top)
+                hidden = len(self.values[reason]) - len(top)
+                extra = f", and {hidden} more values" if hidden else ""
+                if self.overflow.get(reason):
+                    extra += f" (+{self.overflow[reason]} rows not itemised)"
+                print(f"  by value: {listed}{extra}")
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = df.columns.astype(str).str.strip().str.lower()
+    return df
+
+
+def _coalesce(df: pd.DataFrame, *columns: str) -> pd.Series:
+    # The first column keeps its dtype, so typed input (Parquet) is not boxed
+    # into Python objects before conversion.
+    result = None
+    for column in columns:
+        if column not in df.columns:
+            continue
+        if result is None:
+            result = df[column]
+            continue
+        missing = result.isna()
+        if result.dtype == object:
+            missing |= result == ''
+        result = result.where(~missing, df[column])
+    if result is None:
+        return pd.Series(None, index=df.index, dtype=object)
+    return result
+
+
+def _text(df: pd.DataFrame, *columns: str, default: Optional[str] = '') -> pd.Series:
+    values = _coalesce(df, *columns)
+    present = values.notna()
+    values = values.where(~present, values.astype(str).str.strip())
+    if default is not None:
+        values = values.where(present, default)
+    return values
+
+
+def _to_datetime(df: pd.DataFrame, *columns: str) -> pd.Series:
+    values = _coalesce(df, *columns)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        parsed = pd.to_datetime(values, errors='coerce')
+    # Fall back to per-element format inference for mixed-format columns.
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(values[retry], errors='coerce', format='mixed')
+    # The columns are naive UTC timestamps.
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        parsed = parsed.dt.tz_convert(None)
+    return parsed
+
+
+def _to_number(
+    df: pd.DataFrame,
+    *columns: str,
+    lower: Optional[float] = None,
+    upper: Optional[float] = None,
+) -> pd.Series:
+    values = pd.to_numeric(_coalesce(df, *columns), errors='coerce').fillna(0.0)
+    return values.clip(lower=lower, upper=upper).astype(float)
+
+
+def _to_enum(df: pd.DataFrame, column: str, mapping: Dict, default) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    keys = df[column].where(df[column].isna(), df[column].astype(str).str.lower().str.strip())
+    # Map each distinct key once; factorize codes missing values as -1, which
+    # indexes the trailing default.
+    codes, uniques = pd.factorize(keys)
+    lookup = np.empty(len(uniques) + 1, dtype=object)
+    lookup[:] = [mapping.get(key, default) for key in uniques] + [default]
+    return pd.Series(lookup[codes], index=df.index, dtype=object)
+
+
+def _project_refs(df: pd.DataFrame) -> Dict[str, pd.Series]:
+    if 'project_id' in df.columns:
+        project_id_ref = pd.to_numeric(df['project_id'], errors='coerce')
+    else:
+        project_id_ref = pd.Series(float('nan'), index=df.index)
+    return {
+        "project_id_ref": project_id_ref,
+        "project_name_ref": _text(df, 'project_name', default=None).str.lower(),
+    }
+
+
+def project_ref_labels(frame: pd.DataFrame) -> pd.Series:
+    # Human-readable reference per row, used to group unresolved projects.
+    ids = np.trunc(frame['project_id_ref']).astype("Int64")
+    names = frame['project_name_ref']
+    labels = pd.Series(NO_PROJECT_REF, index=frame.index, dtype=object)
+    labels = labels.where(names.isna(), "name '" + names.astype(str) + "'")
+    labels = labels.where(ids.isna(), "id " + ids.astype(str))
+    return labels
+
+
+def _required_text(
+    df: pd.DataFrame, rejections: RejectionLog, label: str, *columns: str
+):
+    values = _text(df, *columns, default=None)
+    keep = pd.Series(True, index=df.index)
+    keep = rejections.reject(keep, values.isna(), f"missing {label}")
+    keep = rejections.reject(keep, values == '', f"empty {label}")
+    return values, keep
+
+
+def prepare_projects(df: pd.DataFrame, rejections: RejectionLog) -> pd.DataFrame:
+    df = normalize_columns(df)
+    rejections.rows_seen += len(df)
+    name, keep = _required_text(df, rejections, "project name", 'name', 'project_name')
+    
+    frame = pd.DataFrame({
+        "name": name,
+        "description": _text(df, 'description'),
+        "status": _to_enum(df, 'status', PROJECT_STATUS_MAP, ProjectStatus.PLANNING),
+        "start_date": _to_datetime(df, 'start_date'),
+        "planned_end_date": _to_datetime(df, 'end_date', 'planned_end_date'),
+        "total_budget": _to_number(df, 'total_budget'),
+        "spent_amount": _to_number(df, 'spent_amount'),
+        "location": _text(df, 'location'),
+    }, index=df.index)
+    return frame[keep]
+
+
+def prepare_tasks(df: pd.DataFrame, rejections: RejectionLog) -> pd.DataFrame:
+    df = normalize_columns(df)
+    rejections.rows_seen += len(df)
+    name, keep = _required_text(df, rejections, "task name", 'name', 'task_name')
+    
+    frame = pd.DataFrame({
+        **_project_refs(df),
+        "name": name,
+        "description": _text(df, 'description'),
+        "status": _to_enum(df, 'status', TASK_STATUS_MAP, TaskStatus.NOT_STARTED),
+        "priority": _to_enum(df, 'priority', TASK_PRIORITY_MAP, TaskPriority.MEDIUM),
+        "start_date": _to_datetime(df, 'start_date'),
+        "planned_end_date": _to_datetime(df, 'end_date', 'planned_end_date'),
+        "progress_percentage": _to_number(
+            df, 'progress', 'progress_percentage', lower=0.0, upper=100.0
+        ),
+        "assigned_to": _text(df, 'assigned_to'),
+    }, index=df.index)
+    return frame[keep]
+
+
+def prepare_resources(df: pd.DataFrame, rejections: RejectionLog) -> pd.DataFrame:
+    df = normalize_columns(df)
+    rejections.rows_seen += len(df)
+    name, keep = _required_text(df, rejections, "resource name", 'name', 'resource_name')
+    
+    quantity = _to_number(df, 'quantity', lower=0.0)
+    unit_cost = _to_number(df, 'unit_cost', lower=0.0)
+    frame = pd.DataFrame({
+        **_project_refs(df),
+        "name": name,
+        "resource_type": _to_enum(df, 'resource_type', RESOURCE_TYPE_MAP, ResourceType.MATERIAL),
+        "status": _to_enum(df, 'status', RESOURCE_STATUS_MAP, ResourceStatus.AVAILABLE),
+        "quantity": quantity,
+        "unit": _text(df, 'unit', default='units'),
+        "unit_cost": unit_cost,
+        "total_cost": quantity * unit_cost,
+        "supplier": _text(df, 'supplier'),
+    }, index=df.index)
+    return frame[keep]
+
+
+def prepare_budgets(df: pd.DataFrame, rejections: RejectionLog) -> pd.DataFrame:
+    df = normalize_columns(df)
+    rejections.rows_seen += len(df)
+    category, keep = _required_text(df, rejections, "category", 'category')
+    
+    frame = pd.DataFrame({
+        **_project_refs(df),
+        "category": category,
+        "description": _text(df, 'description'),
+        "planned_amount": _to_number(df, 'planned_amount', lower=0.0),
+        "actual_amount": _to_number(df, 'actual_amount', lower=0.0),
+    }, index=df.index)
+    return frame[keep]
+
+
+def frame_to_records(frame: pd.DataFrame) -> List[Dict]:
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
\ No newline at end of file
@@ -1,556 +1,522 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import Table, func, insert, select
+import csv
+import multiprocessing
+import os
+import tempfile
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from io import BytesIO
-from app.models.project import Project, ProjectStatus
-from app.models.task import Task, TaskStatus, TaskPriority
-from app.models.resource import Resource, ResourceType, ResourceStatus
+from app.config import settings
+from app.models.project import Project
+from app.models.import_job import ImportJobKind, ImportMode
+from app.models.task import Task
+from app.models.resource import Resource
 from app.models.budget import Budget
-from datetime import datetime
-from typing import Dict, Optional
+from app.services.rollup_service import CONTRIBUTION_COLUMNS, RollupService
+from app.services.bulk_loader import PostgresCopyLoader, insert_frame
+from app.services.parquet_io import iter_parquet_batches
+from app.services.upsert import NaturalKeyUpserter, UpsertCounts, natural_key_lock
+from app.services.excel_reader import (
+    CHILD_PREPARERS,
+    discard_spool,
+    find_sheets,
+    iter_sheet_batches,
+    iter_spooled_batches,
+    prepare_sheet,
+)
+from app.services.import_pipeline import (
+    PROJECT_REF_COLUMNS,
+    UNRESOLVED_PROJECT,
+    RejectionLog,
+    frame_to_records,
+    normalize_columns,
+    project_ref_labels,
+    prepare_projects,
+    prepare_tasks,
+    prepare_resources,
+    prepare_budgets,
+)
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Set
+
+CSV_DELIMITERS = ",;\t"
+
+ImportProgress = Dict[str, Dict[str, int]]
+
+# Stand-in id for projects that only exist in a dry run's Projects sheet.
+DRY_RUN_PROJECT_ID = 0
+
+CHILD_MODELS = {
+    "tasks": Task,
+    "resources": Resource,
+    "budgets": Budget,
+}
+
+CHILD_TABLES = {entity: model.__table__ for entity, model in CHILD_MODELS.items()}
+
+
+class ImportCancelled(Exception):
+    pass
 
 
 class ImportService:
-    def __init__(self, db: Session):
+    def __init__(
+        self, db: Session, mode: ImportMode = ImportMode.INSERT, dry_run: bool = False
+    ):
         self.db = db
-        self._project_name_to_id: Dict[str, int] = {}
+        self.mode = ImportMode(mode)
+        # Dry runs parse, coerce and resolve exactly like a real import but
+        # never write; validation_report() describes what would happen.
+        self.dry_run = dry_run
+        self.detected: Dict[str, Optional[str]] = {}
+        self._pending_project_names: Set[str] = set()
+        self._project_ids_by_id: Dict[int, Optional[int]] = {}
+        self._project_ids_by_name: Dict[str, Optional[int]] = {}
+        self.touched_project_ids: Set[int] = set()
+        self.rejections: Dict[str, RejectionLog] = {}
+        self.use_copy = False
+        self.imported: Dict[str, int] = {}
+        self.outcomes: Dict[str, UpsertCounts] = {}
+        # Called with the running totals after every committed batch; may
+        # raise ImportCancelled to stop the import at that boundary.
+        self.on_progress: Optional[Callable[[ImportProgress], None]] = None
     
-    def _build_project_mapping(self):
-        projects = self.db.query(Project).all()
-        self._project_name_to_id = {
-            project.name.lower().strip(): project.id 
-            for project in projects
-        }
+    def _lookup_project_ids(self, project_ids: List[int]) -> Dict[int, Optional[int]]:
+        missing = [pid for pid in project_ids if pid not in self._project_ids_by_id]
+        for start in range(0, len(missing), settings.IMPORT_BATCH_SIZE):
+            batch = missing[start:start + settings.IMPORT_BATCH_SIZE]
+            found = set(self.db.execute(
+                select(Project.id).where(Project.id.in_(batch))
+            ).scalars())
+            for pid in batch:
+                self._project_ids_by_id[pid] = pid if pid in found else None
+        return self._project_ids_by_id
     
-    def _get_project_id(
-        self, 
-        row: pd.Series, 
-        row_index: int
-    ) -> Optional[int]:
-        if pd.notna(row.get('project_id')):
-            try:
-                project_id = int(row.get('project_id'))
-                exists = self.db.query(Project).filter(
-                    Project.id == project_id
-                ).first()
-                if exists:
-                    return project_id
-                else:
-                    print(
-                        f"Row {row_index}: project_id {project_id} "
-                        f"not found in database"
-                    )
-            except:
-                print(f"Row {row_index}: Invalid project_id format")
+    def _lookup_project_names(self, names: List[str]) -> Dict[str, Optional[int]]:
+        missing = [name for name in names if name not in self._project_ids_by_name]
+        name_key = func.lower(func.trim(Project.name))
+        for start in range(0, len(missing), settings.IMPORT_BATCH_SIZE):
+            batch = missing[start:start + settings.IMPORT_BATCH_SIZE]
+            # Duplicate names resolve to the newest project, as in the COPY path.
+            found = dict(self.db.execute(
+                select(name_key, func.max(Project.id))
+                .where(name_key.in_(batch))
+                .group_by(name_key)
+            ).all())
+            for name in batch:
+                self._project_ids_by_name[name] = found.get(name)
+        return self._project_ids_by_name
+    
+    def _resolve_projects(
+        self, frame: pd.DataFrame, rejections: RejectionLog
+    ) -> pd.DataFrame:
+        # One IN query per batch of distinct references (not per row), with
+        # results cached for the remaining chunks of the same import.
+        id_refs = np.trunc(frame['project_id_ref']).astype("Int64")
+        name_refs = frame['project_name_ref']
         
-        if pd.notna(row.get('project_name')):
-            project_name = str(row.get('project_name')).lower().strip()
-            if project_name in self._project_name_to_id:
-                return self._project_name_to_id[project_name]
-            else:
-                print(
-                    f"Row {row_index}: project_name '{project_name}' "
-                    f"not found in database"
-                )
+        by_id = self._lookup_project_ids(id_refs.dropna().unique().tolist())
+        by_name = self._lookup_project_names(name_refs.dropna().unique().tolist())
+        project_id = id_refs.map(by_id).astype(float).fillna(
+            name_refs.map(by_name).astype(float)
+        )
+        if self._pending_project_names:
+            # Projects a dry run would have created earlier in this import.
+            pending = name_refs.isin(self._pending_project_names)
+            project_id = project_id.fillna(pending.map({True: DRY_RUN_PROJECT_ID}))
         
-        return None
+        unresolved = project_id.isna()
+        keep = pd.Series(True, index=frame.index)
+        keep = rejections.reject(keep, unresolved, UNRESOLVED_PROJECT)
+        if unresolved.any():
+            rejections.add_values(
+                UNRESOLVED_PROJECT,
+                project_ref_labels(frame[unresolved]).value_counts().to_dict(),
+            )
+        
+        frame = frame[keep].drop(columns=PROJECT_REF_COLUMNS)
+        frame.insert(0, "project_id", project_id[keep].astype("int64"))
+        return frame
+    
+    def _insert_frame(
+        self, table: Table, frame: pd.DataFrame, returning: bool = False
+    ) -> List[int]:
+        return insert_frame(
+            self.db, table, frame, settings.IMPORT_BATCH_SIZE, returning=returning
+        )
+    
+    def progress(self) -> ImportProgress:
+        return {
+            entity: {
+                "processed": rejections.rows_seen,
+                "imported": self.imported.get(entity, 0),
+                "rejected": rejections.total,
+                **self.outcomes.get(entity, {}),
+            }
+            for entity, rejections in self.rejections.items()
+        }
+    
+    def unresolved_project_rows(self) -> int:
+        return sum(
+            rejections.counts.get(UNRESOLVED_PROJECT, 0)
+            for rejections in self.rejections.values()
+        )
+    
+    def validation_report(self) -> Dict:
+        entities = {}
+        for entity, rejections in self.rejections.items():
+            entities[entity] = {
+                **self.progress()[entity],
+                "reasons": rejections.to_dict(),
+                "unresolved_projects": [
+                    {"reference": value, "rows": rows}
+                    for value, rows in rejections.top_values(UNRESOLVED_PROJECT)
+                ],
+            }
+        return {
+            "dry_run": self.dry_run,
+            "mode": self.mode.value,
+            "detected": self.detected,
+            "entities": entities,
+        }
+    
+    def _record_progress(self, entity: str, count: int, outcome: UpsertCounts):
+        self.imported[entity] = self.imported.get(entity, 0) + count
+        totals = self.outcomes.setdefault(
+            entity, {"inserted": 0, "updated": 0, "unchanged": 0}
+        )
+        for key, value in outcome.items():
+            totals[key] += value
+        if self.on_progress is not None:
+            self.on_progress(self.progress())
+    
+    def _entity_importers(self) -> Dict[str, Callable[[pd.DataFrame], int]]:
+        return {
+            "projects": self._import_projects,
+            "tasks": self._import_tasks,
+            "resources": self._import_resources,
+            "budgets": self._import_budgets,
+        }
     
     def import_from_excel(self, file_content: bytes, filename: str) -> Dict:
+        suffix = os.path.splitext(filename)[1] or ".xlsx"
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as spool:
+            spool.write(file_content)
+        try:
+            return self.import_excel_file(spool.name, filename)
+        finally:
+            os.remove(spool.name)
+    
+    def import_excel_file(self, path: str, filename: str) -> Dict:
+        executor = None
+        futures = {}
         try:
-            excel_file = BytesIO(file_content)
-            
-            sheets = pd.read_excel(
-                excel_file, sheet_name=None, engine='openpyxl'
-            )
-            
             stats = {
                 "projects": 0,
                 "tasks": 0,
                 "resources": 0,
                 "budgets": 0
             }
+            importers = self._entity_importers()
+            batch_rows = settings.IMPORT_EXCEL_BATCH_ROWS
             
-            if 'Projects' in sheets or 'projects' in sheets:
-                sheet_name = 'Projects' if 'Projects' in sheets else 'projects'
-                stats["projects"] = self._import_projects(sheets[sheet_name])
-            
-            self._build_project_mapping()
+            sheets = find_sheets(path)
+            self.detected = dict(sheets)
+            children = [entity for entity in CHILD_PREPARERS if entity in sheets]
             
-            if 'Tasks' in sheets or 'tasks' in sheets:
-                sheet_name = 'Tasks' if 'Tasks' in sheets else 'tasks'
-                stats["tasks"] = self._import_tasks(sheets[sheet_name])
-            
-            if 'Resources' in sheets or 'resources' in sheets:
-                sheet_name = (
-                    'Resources' if 'Resources' in sheets else 'resources'
-                )
-                stats["resources"] = self._import_resources(
-                    sheets[sheet_name]
+            # Child sheets only need the database once their rows are
+            # resolved, so large workbooks parse and validate them in worker
+            # processes while Projects is being imported here. Small ones are
+            # not worth the cost of starting the workers.
+            processes = min(
+                len(children), settings.IMPORT_EXCEL_PROCESSES, os.cpu_count() or 1
+            )
+            if (
+                processes > 1
+                and os.path.getsize(path) >= settings.IMPORT_EXCEL_PARALLEL_MIN_BYTES
+            ):
+                executor = ProcessPoolExecutor(
+                    max_workers=processes,
+                    mp_context=multiprocessing.get_context("spawn"),
                 )
+                futures = {
+                    entity: executor.submit(
+                        prepare_sheet,
+                        path,
+                        sheets[entity],
+                        entity,
+                        batch_rows,
+                        settings.IMPORT_SPOOL_DIR,
+                    )
+                    for entity in children
+                }
             
-            if 'Budgets' in sheets or 'budgets' in sheets:
-                sheet_name = 'Budgets' if 'Budgets' in sheets else 'budgets'
-                stats["budgets"] = self._import_budgets(sheets[sheet_name])
+            if "projects" in sheets:
+                for batch in iter_sheet_batches(path, sheets["projects"], batch_rows):
+                    stats["projects"] += self._import_projects(batch)
+            
+            for entity in children:
+                if entity not in futures:
+                    for batch in iter_sheet_batches(path, sheets[entity], batch_rows):
+                        stats[entity] += importers[entity](batch)
+                    continue
+                
+                spool, rejections = futures.pop(entity).result()
+                self.rejections[entity] = rejections
+                try:
+                    for frame in iter_spooled_batches(spool):
+                        stats[entity] += self._load_children(
+                            entity, CHILD_TABLES[entity], frame, rejections
+                        )
+                finally:
+                    os.remove(spool)
             
+            self._report_rejections()
             return stats
         
+        except ImportCancelled:
+            self.db.rollback()
+            raise
         except Exception as e:
             self.db.rollback()
             raise Exception(f"Error importing Excel: {str(e)}")
+        finally:
+            # Sheets left unread after an error or a cancel drop their spool
+            # files once their worker is done with them.
+            for future in futures.values():
+                future.add_done_callback(discard_spool)
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _copy_supported(self) -> bool:
+        return (
+            settings.IMPORT_USE_COPY
+            and self.mode == ImportMode.INSERT
+            and not self.dry_run
+            and self.db.get_bind().dialect.name == "postgresql"
+        )
+    
+    def _natural_key_lock(self, table: Table):
+        if self.mode == ImportMode.UPSERT and not self.dry_run:
+            return natural_key_lock(self.db, table)
+        return nullcontext()
+    
+    def _upserter(self, entity: str, table: Table) -> NaturalKeyUpserter:
+        return NaturalKeyUpserter(
+            self.db,
+            table,
+            settings.IMPORT_NATURAL_KEYS[entity],
+            project_column=None if entity == "projects" else "project_id",
+            batch_size=settings.IMPORT_BATCH_SIZE,
+            tracked=CONTRIBUTION_COLUMNS.get(CHILD_MODELS.get(entity), ()),
+        )
     
     def import_from_csv(self, file_content: bytes) -> Dict:
+        return self.import_csv_stream(BytesIO(file_content))
+    
+    def import_csv_file(self, path: str) -> Dict:
+        with open(path, "rb") as handle:
+            return self.import_csv_stream(handle)
+    
+    def import_csv_stream(self, source: BinaryIO) -> Dict:
+        # CSV uploads stream child rows through COPY on PostgreSQL and fall
+        # back to batched INSERTs elsewhere.
+        self.use_copy = self._copy_supported()
         try:
-            df = None
-            for delimiter in [',', ';', '\t']:
-                try:
-                    df = pd.read_csv(BytesIO(file_content), delimiter=delimiter)
-                    if len(df.columns) > 1:
-                        break
-                except:
-                    continue
-            
-            if df is None or len(df.columns) <= 1:
-                raise Exception("Unable to parse CSV file")
-            
-            df.columns = df.columns.str.strip().str.lower()
-            columns = set(df.columns)
-            
-            if 'category' in columns and 'planned_amount' in columns:
-                self._build_project_mapping()
-                count = self._import_budgets(df)
-                return {
-                    "projects": 0,
-                    "tasks": 0,
-                    "resources": 0,
-                    "budgets": count
-                }
-            elif 'resource_name' in columns or 'resource_type' in columns:
-                self._build_project_mapping()
-                count = self._import_resources(df)
-                return {
-                    "projects": 0,
-                    "tasks": 0,
-                    "resources": count,
-                    "budgets": 0
-                }
-            
-            elif 'task_name' in columns or (
-                'name' in columns and (
-                    'assigned_to' in columns or 
-                    'priority' in columns or
-                    'progress' in columns or
-                    'progress_percentage' in columns
-                )
-            ):
-                self._build_project_mapping()
-                count = self._import_tasks(df)
-                return {
-                    "projects": 0,
-                    "tasks": count,
-                    "resources": 0,
-                    "budgets": 0
-                }
-            
-            elif 'project_name' in columns or (
-                'name' in columns and 'total_budget' in columns
-            ):
-                count = self._import_projects(df)
-                return {
-                    "projects": count,
-                    "tasks": 0,
-                    "resources": 0,
-                    "budgets": 0
-                }
-            
-            else:
-                raise Exception(
-                    f"Unable to determine CSV data type. "
-                    f"Columns found: {', '.join(columns)}"
-                )
+            delimiter = self._sniff_delimiter(source)
+            reader = pd.read_csv(
+                source,
+                delimiter=delimiter,
+                chunksize=settings.IMPORT_CSV_CHUNK_ROWS,
+            )
+            return self._import_chunks(reader, "CSV")
         
+        except ImportCancelled:
+            self.db.rollback()
+            raise
         except Exception as e:
             self.db.rollback()
             raise Exception(f"Error importing CSV: {str(e)}")
     
-    def _import_projects(self, df: pd.DataFrame) -> int:
-        count = 0
-        df.columns = df.columns.str.strip().str.lower()
-        
-        for index, row in df.iterrows():
-            try:
-                name = row.get('name') or row.get('project_name')
-                if pd.isna(name):
-                    print(f"Skipping row {index}: missing project name")
-                    continue
-                
-                name = str(name).strip()
-                if not name:
-                    print(f"Skipping row {index}: empty project name")
-                    continue
-                
-                description = ''
-                if pd.notna(row.get('description')):
-                    description = str(row.get('description')).strip()
-                
-                start_date = None
-                if pd.notna(row.get('start_date')):
-                    try:
-                        start_date = pd.to_datetime(row.get('start_date'))
-                    except:
-                        print(
-                            f"Row {index}: Invalid start_date, skipping"
-                        )
-                
-                planned_end_date = None
-                end_date_field = row.get('end_date') or row.get(
-                    'planned_end_date'
-                )
-                if pd.notna(end_date_field):
-                    try:
-                        planned_end_date = pd.to_datetime(end_date_field)
-                    except:
-                        print(
-                            f"Row {index}: Invalid end_date, skipping"
-                        )
-                
-                total_budget = 0.0
-                if pd.notna(row.get('total_budget')):
-                    try:
-                        total_budget = float(row.get('total_budget'))
-                    except:
-                        print(
-                            f"Row {index}: Invalid total_budget, using 0.0"
-                        )
-                
-                spent_amount = 0.0
-                if pd.notna(row.get('spent_amount')):
-                    try:
-                        spent_amount = float(row.get('spent_amount'))
-                    except:
-                        print(
-                            f"Row {index}: Invalid spent_amount, using 0.0"
-                        )
-                
-                location = ''
-                if pd.notna(row.get('location')):
-                    location = str(row.get('location')).strip()
-                
-                project = Project(
-                    name=name,
-                    description=description,
-                    status=self._parse_project_status(
-                        row.get('status', 'planning')
-                    ),
-                    start_date=start_date,
-                    planned_end_date=planned_end_date,
-                    total_budget=total_budget,
-                    spent_amount=spent_amount,
-                    location=location
-                )
-                self.db.add(project)
-                self.db.flush()
-                count += 1
-            except Exception as e:
-                print(f"Error importing project row {index}: {e}")
-                continue
+    def import_parquet_file(self, path: str) -> Dict:
+        # Parquet columns arrive typed, so batches skip delimiter sniffing and
+        # string parsing and go straight into the same pipeline as CSV.
+        self.use_copy = self._copy_supported()
+        try:
+            batches = iter_parquet_batches(path, settings.IMPORT_CSV_CHUNK_ROWS)
+            return self._import_chunks(batches, "Parquet")
         
-        self.db.commit()
-        return count
+        except ImportCancelled:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise Exception(f"Error importing Parquet: {str(e)}")
     
-    def _import_tasks(self, df: pd.DataFrame) -> int:
-        count = 0
-        df.columns = df.columns.str.strip().str.lower()
+    def import_path(self, kind: ImportJobKind, path: str, filename: str) -> Dict:
+        if kind == ImportJobKind.CSV:
+            return self.import_csv_file(path)
+        elif kind == ImportJobKind.PARQUET:
+            return self.import_parquet_file(path)
+        return self.import_excel_file(path, filename)
+    
+    def _import_chunks(self, chunks: Iterable[pd.DataFrame], label: str) -> Dict:
+        stats = {
+            "projects": 0,
+            "tasks": 0,
+            "resources": 0,
+            "budgets": 0
+        }
+        importers = self._entity_importers()
         
-        for index, row in df.iterrows():
-            try:
-                name = row.get('name') or row.get('task_name')
-                if pd.isna(name):
-                    print(f"Skipping row {index}: missing task name")
-                    continue
-                
-                name = str(name).strip()
-                if not name:
-                    print(f"Skipping row {index}: empty task name")
-                    continue
-                
-                project_id = self._get_project_id(row, index)
-                if project_id is None:
-                    print(
-                        f"Skipping row {index}: could not resolve project. "
-                        f"Use 'project_id' or 'project_name' column."
-                    )
-                    continue
-                
-                description = ''
-                if pd.notna(row.get('description')):
-                    description = str(row.get('description')).strip()
-                
-                start_date = None
-                if pd.notna(row.get('start_date')):
-                    try:
-                        start_date = pd.to_datetime(row.get('start_date'))
-                    except:
-                        print(f"Row {index}: Invalid start_date")
-                
-                planned_end_date = None
-                end_date_field = row.get('end_date') or row.get(
-                    'planned_end_date'
-                )
-                if pd.notna(end_date_field):
-                    try:
-                        planned_end_date = pd.to_datetime(end_date_field)
-                    except:
-                        print(f"Row {index}: Invalid end_date")
-                
-                progress = 0.0
-                progress_field = row.get('progress') or row.get(
-                    'progress_percentage'
-                )
-                if pd.notna(progress_field):
-                    try:
-                        progress = float(progress_field)
-                        progress = max(0.0, min(100.0, progress))
-                    except:
-                        print(
-                            f"Row {index}: Invalid progress, using 0.0"
-                        )
-                
-                assigned_to = ''
-                if pd.notna(row.get('assigned_to')):
-                    assigned_to = str(row.get('assigned_to')).strip()
-                
-                task = Task(
-                    project_id=project_id,
-                    name=name,
-                    description=description,
-                    status=self._parse_task_status(
-                        row.get('status', 'not_started')
-                    ),
-                    priority=self._parse_task_priority(
-                        row.get('priority', 'medium')
-                    ),
-                    start_date=start_date,
-                    planned_end_date=planned_end_date,
-                    progress_percentage=progress,
-                    assigned_to=assigned_to
-                )
-                self.db.add(task)
-                count += 1
-            except Exception as e:
-                print(f"Error importing task row {index}: {e}")
-                continue
+        # Each chunk is committed on its own, so memory stays bounded by
+        # the chunk size rather than the size of the upload.
+        entity = None
+        for chunk in chunks:
+            normalize_columns(chunk)
+            if entity is None:
+                entity = self._detect_entity(set(chunk.columns))
+                self.detected = {entity: None}
+            stats[entity] += importers[entity](chunk)
         
-        self.db.commit()
-        return count
+        if entity is None:
+            raise Exception(f"Unable to parse {label} file")
+        
+        self._report_rejections()
+        return stats
     
-    def _import_resources(self, df: pd.DataFrame) -> int:
-        count = 0
-        df.columns = df.columns.str.strip().str.lower()
+    @staticmethod
+    def _sniff_delimiter(source: BinaryIO) -> str:
+        sample = source.read(settings.IMPORT_SNIFF_BYTES).decode("utf-8", errors="ignore")
+        source.seek(0)
+        # Only sniff complete lines; a truncated last row skews the guess.
+        if "\n" in sample:
+            sample = sample[:sample.rindex("\n")]
         
-        for index, row in df.iterrows():
-            try:
-                name = row.get('name') or row.get('resource_name')
-                if pd.isna(name):
-                    print(f"Skipping row {index}: missing resource name")
-                    continue
-                
-                name = str(name).strip()
-                if not name:
-                    print(f"Skipping row {index}: empty resource name")
-                    continue
-                
-                project_id = self._get_project_id(row, index)
-                if project_id is None:
-                    print(
-                        f"Skipping row {index}: could not resolve project. "
-                        f"Use 'project_id' or 'project_name' column."
-                    )
-                    continue
-                
-                quantity = 0.0
-                if pd.notna(row.get('quantity')):
-                    try:
-                        quantity = float(row.get('quantity'))
-                        quantity = max(0.0, quantity)
-                    except:
-                        print(f"Row {index}: Invalid quantity, using 0.0")
-                
-                unit = 'units'
-                if pd.notna(row.get('unit')):
-                    unit = str(row.get('unit')).strip()
-                
-                unit_cost = 0.0
-                if pd.notna(row.get('unit_cost')):
-                    try:
-                        unit_cost = float(row.get('unit_cost'))
-                        unit_cost = max(0.0, unit_cost)
-                    except:
-                        print(f"Row {index}: Invalid unit_cost, using 0.0")
-                
-                supplier = ''
-                if pd.notna(row.get('supplier')):
-                    supplier = str(row.get('supplier')).strip()
-                
-                resource = Resource(
-                    project_id=project_id,
-                    name=name,
-                    resource_type=self._parse_resource_type(
-                        row.get('resource_type', 'material')
-                    ),
-                    status=self._parse_resource_status(
-                        row.get('status', 'available')
-                    ),
-                    quantity=quantity,
-                    unit=unit,
-                    unit_cost=unit_cost,
-                    supplier=supplier
-                )
-                resource.calculate_total_cost()
-                self.db.add(resource)
-                count += 1
-            except Exception as e:
-                print(f"Error importing resource row {index}: {e}")
-                continue
+        try:
+            return csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITERS).delimiter
+        except csv.Error:
+            header = sample.splitlines()[0] if sample else ""
+            for delimiter in CSV_DELIMITERS:
+                if delimiter in header:
+                    return delimiter
+            raise Exception("Unable to parse CSV file")
+    
+    @staticmethod
+    def _detect_entity(columns: Set[str]) -> str:
+        if 'category' in columns and 'planned_amount' in columns:
+            return "budgets"
+        elif 'resource_name' in columns or 'resource_type' in columns:
+            return "resources"
         
-        self.db.commit()
-        return count
+        elif 'task_name' in columns or (
+            'name' in columns and (
+                'assigned_to' in columns or 
+                'priority' in columns or
+                'progress' in columns or
+                'progress_percentage' in columns
+            )
+        ):
+            return "tasks"
+        
+        elif 'project_name' in columns or (
+            'name' in columns and 'total_budget' in columns
+        ):
+            return "projects"
+        
+        else:
+            raise Exception(
+                f"Unable to determine data type. "
+                f"Columns found: {', '.join(columns)}"
+            )
     
-    def _import_budgets(self, df: pd.DataFrame) -> int:
-        count = 0
-        df.columns = df.columns.str.strip().str.lower()
+    def _rejection_log(self, entity: str) -> RejectionLog:
+        if entity not in self.rejections:
+            self.rejections[entity] = RejectionLog(entity[:-1])
+        return self.rejections[entity]
+    
+    def _report_rejections(self):
+        for rejections in self.rejections.values():
+            rejections.report()
+    
+    def _import_projects(self, df: pd.DataFrame) -> int:
+        rejections = self._rejection_log("projects")
+        frame = prepare_projects(df, rejections)
+        table = Project.__table__
         
-        for index, row in df.iterrows():
-            try:
-                category = row.get('category')
-                if pd.isna(category):
-                    print(f"Skipping row {index}: missing category")
-                    continue
-                
-                category = str(category).strip()
-                if not category:
-                    print(f"Skipping row {index}: empty category")
-                    continue
-                
-                project_id = self._get_project_id(row, index)
-                if project_id is None:
-                    print(
-                        f"Skipping row {index}: could not resolve project. "
-                        f"Use 'project_id' or 'project_name' column."
-                    )
-                    continue
-                
-                description = ''
-                if pd.notna(row.get('description')):
-                    description = str(row.get('description')).strip()
-                
-                planned_amount = 0.0
-                if pd.notna(row.get('planned_amount')):
-                    try:
-                        planned_amount = float(row.get('planned_amount'))
-                        planned_amount = max(0.0, planned_amount)
-                    except:
-                        print(
-                            f"Row {index}: Invalid planned_amount, using 0.0"
-                        )
-                
-                actual_amount = 0.0
-                if pd.notna(row.get('actual_amount')):
-                    try:
-                        actual_amount = float(row.get('actual_amount'))
-                        actual_amount = max(0.0, actual_amount)
-                    except:
-                        print(
-                            f"Row {index}: Invalid actual_amount, using 0.0"
-                        )
-                
-                budget = Budget(
-                    project_id=project_id,
-                    category=category,
-                    description=description,
-                    planned_amount=planned_amount,
-                    actual_amount=actual_amount
-                )
-                self.db.add(budget)
-                count += 1
-            except Exception as e:
-                print(f"Error importing budget row {index}: {e}")
-                continue
+        with self._natural_key_lock(table):
+            if self.mode == ImportMode.UPSERT:
+                upserter = self._upserter("projects", table)
+                outcome, project_ids = upserter.upsert(frame, rejections, self.dry_run)
+            elif self.dry_run:
+                outcome, project_ids = {"inserted": len(frame)}, []
+            else:
+                project_ids = self._insert_frame(table, frame, returning=True)
+                outcome = {"inserted": len(project_ids)}
+            count = sum(outcome.values())
+            
+            if self.dry_run:
+                self._pending_project_names.update(frame["name"].str.lower())
+            else:
+                RollupService(self.db).ensure_rollups(project_ids)
+                self.touched_project_ids.update(project_ids)
+                self.db.commit()
         
-        self.db.commit()
+        self._record_progress("projects", count, outcome)
         return count
     
-    def _parse_project_status(self, status: str) -> ProjectStatus:
-        if pd.isna(status):
-            return ProjectStatus.PLANNING
-        
-        status_map = {
-            'planning': ProjectStatus.PLANNING,
-            'in_progress': ProjectStatus.IN_PROGRESS,
-            'active': ProjectStatus.IN_PROGRESS,
-            'on_hold': ProjectStatus.ON_HOLD,
-            'completed': ProjectStatus.COMPLETED,
-            'cancelled': ProjectStatus.CANCELLED
-        }
-        return status_map.get(
-            str(status).lower().strip(), ProjectStatus.PLANNING
-        )
+    def _import_tasks(self, df: pd.DataFrame) -> int:
+        return self._import_children("tasks", Task.__table__, prepare_tasks, df)
     
-    def _parse_task_status(self, status: str) -> TaskStatus:
-        if pd.isna(status):
-            return TaskStatus.NOT_STARTED
-        
-        status_map = {
-            'not_started': TaskStatus.NOT_STARTED,
-            'in_progress': TaskStatus.IN_PROGRESS,
-            'active': TaskStatus.IN_PROGRESS,
-            'completed': TaskStatus.COMPLETED,
-            'delayed': TaskStatus.DELAYED,
-            'blocked': TaskStatus.BLOCKED
-        }
-        return status_map.get(
-            str(status).lower().strip(), TaskStatus.NOT_STARTED
+    def _import_resources(self, df: pd.DataFrame) -> int:
+        return self._import_children(
+            "resources", Resource.__table__, prepare_resources, df
         )
     
-    def _parse_task_priority(self, priority: str) -> TaskPriority:
-        if pd.isna(priority):
-            return TaskPriority.MEDIUM
-        
-        priority_map = {
-            'low': TaskPriority.LOW,
-            'medium': TaskPriority.MEDIUM,
-            'high': TaskPriority.HIGH,
-            'critical': TaskPriority.CRITICAL
-        }
-        return priority_map.get(
-            str(priority).lower().strip(), TaskPriority.MEDIUM
-        )
+    def _import_budgets(self, df: pd.DataFrame) -> int:
+        return self._import_children("budgets", Budget.__table__, prepare_budgets, df)
     
-    def _parse_resource_type(self, resource_type: str) -> ResourceType:
-        if pd.isna(resource_type):
-            return ResourceType.MATERIAL
-        
-        type_map = {
-            'material': ResourceType.MATERIAL,
-            'equipment': ResourceType.EQUIPMENT,
-            'labor': ResourceType.LABOR,
-            'human': ResourceType.LABOR
-        }
-        return type_map.get(
-            str(resource_type).lower().strip(), ResourceType.MATERIAL
-        )
+    def _import_children(
+        self, entity: str, table: Table, prepare, df: pd.DataFrame
+    ) -> int:
+        rejections = self._rejection_log(entity)
+        return self._load_children(entity, table, prepare(df, rejections), rejections)
     
-    def _parse_resource_status(self, status: str) -> ResourceStatus:
-        if pd.isna(status):
-            return ResourceStatus.AVAILABLE
+    def _load_children(
+        self, entity: str, table: Table, frame: pd.DataFrame, rejections: RejectionLog
+    ) -> int:
+        model = CHILD_MODELS[entity]
+        tracked = ["project_id", *CONTRIBUTION_COLUMNS[model]]
+        with self._natural_key_lock(table):
+            if self.use_copy:
+                loader = PostgresCopyLoader(self.db, table, settings.IMPORT_COPY_BATCH_SIZE)
+                count, rows = loader.load(frame, rejections, returning=tracked[1:])
+                outcome = {"inserted": count}
+                changes = [(None, row) for row in rows]
+                project_ids = {row["project_id"] for row in rows}
+            else:
+                frame = self._resolve_projects(frame, rejections)
+                if self.mode == ImportMode.UPSERT:
+                    upserter = self._upserter(entity, table)
+                    outcome, project_ids = upserter.upsert(frame, rejections, self.dry_run)
+                    changes = upserter.changes
+                elif self.dry_run:
+                    outcome, project_ids, changes = {"inserted": len(frame)}, [], []
+                else:
+                    self._insert_frame(table, frame)
+                    outcome = {"inserted": len(frame)}
+                    project_ids = frame["project_id"].unique().tolist()
+                    changes = [(None, record) for record in frame_to_records(frame[tracked])]
+                count = sum(outcome.values())
+            
+            if not self.dry_run:
+                # The chunk's rows move the rollups by their deltas in the same
+                # transaction; the touched projects are never re-aggregated.
+                RollupService(self.db).record_row_changes(model, changes)
+                self.touched_project_ids.update(project_ids)
+                self.db.commit()
         
-        status_map = {
-            'available': ResourceStatus.AVAILABLE,
-            'in_use': ResourceStatus.IN_USE,
-            'active': ResourceStatus.IN_USE,
-            'depleted': ResourceStatus.DEPLETED,
-            'maintenance': ResourceStatus.MAINTENANCE,
-            'ordered': ResourceStatus.AVAILABLE,
-            'retired': ResourceStatus.DEPLETED
-        }
-        return status_map.get(
-            str(status).lower().strip(), ResourceStatus.AVAILABLE
-        )
\ No newline at end of file
+        self._record_progress(entity, count, outcome)
+        return count
\ No newline at end of file
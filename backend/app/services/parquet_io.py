@@ -0,0 +1,59 @@
+import json
+from typing import Iterator, List, Sequence
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean, Column, DateTime, Enum, Float, Integer, JSON
+
+ARROW_TYPES = [
+    (Boolean, pa.bool_()),
+    (Integer, pa.int64()),
+    (Float, pa.float64()),
+    (DateTime, pa.timestamp("us")),
+]
+
+
+def iter_parquet_batches(path: str, batch_rows: int) -> Iterator[pd.DataFrame]:
+    # Row groups are decoded a batch at a time; the index keeps counting
+    # across batches so rejected rows report their position in the file.
+    parquet_file = pq.ParquetFile(path)
+    start = 0
+    for batch in parquet_file.iter_batches(batch_size=batch_rows):
+        frame = batch.to_pandas()
+        for name in frame.columns:
+            if isinstance(frame[name].dtype, pd.CategoricalDtype):
+                frame[name] = frame[name].astype(object)
+        frame.index = pd.RangeIndex(start, start + len(frame))
+        start += len(frame)
+        yield frame
+    
+    if start == 0:
+        yield parquet_file.schema_arrow.empty_table().to_pandas()
+
+
+def _arrow_type(column: Column) -> pa.DataType:
+    for column_type, arrow_type in ARROW_TYPES:
+        if isinstance(column.type, column_type):
+            return arrow_type
+    return pa.string()
+
+
+def arrow_schema(columns: Sequence[Column]) -> pa.Schema:
+    return pa.schema([
+        pa.field(column.name, _arrow_type(column))
+        for column in columns
+    ])
+
+
+def record_batch(rows: List[Sequence], columns: Sequence[Column], schema: pa.Schema) -> pa.RecordBatch:
+    # Rows come straight off the cursor; enums are written by value and JSON
+    # as text, everything else keeps its database type.
+    arrays = []
+    for i, (column, field) in enumerate(zip(columns, schema)):
+        values = [row[i] for row in rows]
+        if isinstance(column.type, Enum):
+            values = [value.value if value is not None else None for value in values]
+        elif isinstance(column.type, JSON):
+            values = [json.dumps(value) if value is not None else None for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
\ No newline at end of file
@@ -1,61 +1,100 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.models.project import Project
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Tuple
+from app.models.project import Project, ProjectStatus
+from app.models.project_rollup import ProjectRollup
 from app.models.task import Task, TaskStatus
+from app.models.archive import ARCHIVE_TABLES
+from app.auth.scoping import scope_to_user
+from app.services.scoped_writes import ScopedWriter, WriteOutcome
 from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.utils.pagination import Pagination, estimate_count
 from datetime import datetime
 
 
 class ProjectService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def create_project(self, project: ProjectCreate) -> Project:
-        db_project = Project(**project.model_dump())
-        self.db.add(db_project)
-        self.db.commit()
-        self.db.refresh(db_project)
-        return db_project
+    async def create_project(self, project: ProjectCreate, current_user: dict) -> Project:
+        return await ScopedWriter(self.db, current_user).insert(Project, project.model_dump())
     
-    def get_projects(self, skip: int = 0, limit: int = 10) -> List[Project]:
-        return self.db.query(Project).offset(skip).limit(limit).all()
+    async def get_projects(self, page: Pagination, current_user: dict) -> List[Project]:
+        stmt = scope_to_user(select(Project), Project, current_user)
+        result = await self.db.execute(page.apply(stmt))
+        return page.page(result.scalars().all())
     
-    def get_project_by_id(self, project_id: int) -> Optional[Project]:
-        return self.db.query(Project).filter(Project.id == project_id).first()
+    async def estimate_project_count(self, current_user: dict) -> Optional[int]:
+        stmt = scope_to_user(select(Project), Project, current_user)
+        return await self.db.run_sync(lambda session: estimate_count(session, stmt))
     
-    def update_project(self, project_id: int, project_update: ProjectUpdate) -> Optional[Project]:
-        db_project = self.get_project_by_id(project_id)
-        if not db_project:
-            return None
-        
-        update_data = project_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_project, field, value)
-        
-        db_project.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(db_project)
-        return db_project
+    async def get_project_by_id(self, project_id: int) -> Optional[Project]:
+        return await self.db.get(Project, project_id)
     
-    def delete_project(self, project_id: int) -> bool:
-        db_project = self.get_project_by_id(project_id)
+    async def update_project(
+        self, project_id: int, project_update: ProjectUpdate, current_user: dict
+    ) -> Tuple[WriteOutcome, Optional[Project]]:
+        return await ScopedWriter(self.db, current_user).update(
+            Project,
+            project_id,
+            project_update.model_dump(exclude_unset=True, exclude={"version"}),
+            version=project_update.version,
+        )
+    
+    async def delete_project(self, project_id: int) -> bool:
+        db_project = await self.get_project_by_id(project_id)
         if not db_project:
             return False
         
-        self.db.delete(db_project)
-        self.db.commit()
+        await self.db.delete(db_project)
+        await self.db.commit()
         return True
     
-    def get_projects_summary(self) -> List[dict]:
-        projects = self.db.query(Project).all()
-        summaries = []
+    async def archive_project(self, project_id: int) -> Optional[Dict[str, int]]:
+        # The row lock keeps children from being added mid-archive (their
+        # foreign key check waits on it) and re-checks the status under it.
+        locked = await self.db.execute(
+            select(Project.id)
+            .where(Project.id == project_id, Project.status == ProjectStatus.COMPLETED)
+            .with_for_update()
+        )
+        if locked.scalar_one_or_none() is None:
+            return None
         
-        for project in projects:
-            total_tasks = self.db.query(Task).filter(Task.project_id == project.id).count()
-            completed_tasks = self.db.query(Task).filter(
-                Task.project_id == project.id,
-                Task.status == TaskStatus.COMPLETED
-            ).count()
+        archived_at = datetime.utcnow()
+        counts = {}
+        for source, archive in ARCHIVE_TABLES.items():
+            key = source.c.id if source is Project.__table__ else source.c.project_id
+            result = await self.db.execute(
+                insert(archive).from_select(
+                    [*source.c.keys(), "archived_at"],
+                    select(*source.c, literal(archived_at)).where(key == project_id),
+                )
+            )
+            counts[source.name] = result.rowcount
+        
+        # ON DELETE CASCADE removes the live tasks, resources, budgets and rollup.
+        await self.db.execute(delete(Project).where(Project.id == project_id))
+        await self.db.commit()
+        return counts
+    
+    async def get_projects_summary(self, current_user: dict) -> List[dict]:
+        stmt = select(
+            Project,
+            ProjectRollup.total_tasks,
+            ProjectRollup.completed_tasks,
+        ).outerjoin(ProjectRollup, ProjectRollup.project_id == Project.id)
+        rows = (await self.db.execute(
+            scope_to_user(stmt, Project, current_user).order_by(Project.id)
+        )).all()
+        
+        missing = [project.id for project, total, _ in rows if total is None]
+        task_counts = await self._task_counts(missing)
+        
+        summaries = []
+        for project, total_tasks, completed_tasks in rows:
+            if total_tasks is None:
+                total_tasks, completed_tasks = task_counts.get(project.id, (0, 0))
             
             progress = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
             
@@ -67,4 +106,20 @@ class ProjectService:
                 "progress": round(progress, 2)
             })
         
-        return summaries
\ No newline at end of file
+        return summaries
+    
+    async def _task_counts(self, project_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+        # Only projects without a rollup row (e.g. rows loaded outside the
+        # API) get here: one grouped query over just those projects.
+        if not project_ids:
+            return {}
+        rows = await self.db.execute(
+            select(
+                Task.project_id,
+                func.count(Task.id),
+                func.count(Task.id).filter(Task.status == TaskStatus.COMPLETED),
+            )
+            .where(Task.project_id.in_(project_ids))
+            .group_by(Task.project_id)
+        )
+        return {project_id: (total, completed) for project_id, total, completed in rows}
\ No newline at end of file
@@ -0,0 +1,299 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, true, update, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.resource import Resource, ResourceType
+from app.models.budget import Budget
+from app.models.project_rollup import ProjectRollup
+
+TASK_STATUS_COLUMNS = {
+    TaskStatus.NOT_STARTED: "not_started_tasks",
+    TaskStatus.IN_PROGRESS: "in_progress_tasks",
+    TaskStatus.COMPLETED: "completed_tasks",
+    TaskStatus.DELAYED: "delayed_tasks",
+    TaskStatus.BLOCKED: "blocked_tasks",
+}
+
+RESOURCE_TYPE_COLUMNS = {
+    ResourceType.MATERIAL: ("material_resources", "material_cost"),
+    ResourceType.EQUIPMENT: ("equipment_resources", "equipment_cost"),
+    ResourceType.LABOR: ("labor_resources", "labor_cost"),
+}
+
+# Columns each row type's rollup contribution is computed from, in the
+# order the *_contribution methods take them.
+CONTRIBUTION_COLUMNS = {
+    Task: ("status", "planned_end_date"),
+    Resource: ("resource_type", "total_cost"),
+    Budget: ("planned_amount", "actual_amount"),
+}
+
+ROLLUP_COLUMNS = [
+    column.name for column in ProjectRollup.__table__.columns
+    if column.name not in ("project_id", "data_version", "updated_at")
+]
+
+RollupSnapshot = Tuple[int, Dict[str, float]]
+
+
+def _coerce_enum(enum_cls, value):
+    try:
+        return enum_cls(value)
+    except ValueError:
+        return None
+
+
+class RollupService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    @staticmethod
+    def task_contribution(status, planned_end_date) -> Dict[str, float]:
+        contribution = {"total_tasks": 1}
+        status = _coerce_enum(TaskStatus, status)
+        if status is not None:
+            contribution[TASK_STATUS_COLUMNS[status]] = 1
+        if status != TaskStatus.COMPLETED and planned_end_date is not None:
+            contribution["overdue_candidate_tasks"] = 1
+        return contribution
+    
+    @staticmethod
+    def resource_contribution(resource_type, total_cost) -> Dict[str, float]:
+        contribution = {"total_resources": 1}
+        resource_type = _coerce_enum(ResourceType, resource_type)
+        if resource_type is not None:
+            count_column, cost_column = RESOURCE_TYPE_COLUMNS[resource_type]
+            contribution[count_column] = 1
+            contribution[cost_column] = total_cost or 0.0
+        return contribution
+    
+    @staticmethod
+    def budget_contribution(planned_amount, actual_amount) -> Dict[str, float]:
+        return {
+            "budget_lines": 1,
+            "budget_planned": planned_amount or 0.0,
+            "budget_actual": actual_amount or 0.0,
+        }
+    
+    def contribution(self, model, value: Callable[[str], Any]) -> Dict[str, float]:
+        if model not in CONTRIBUTION_COLUMNS:
+            raise TypeError(f"No rollup contribution defined for {model.__name__}")
+        args = [value(column) for column in CONTRIBUTION_COLUMNS[model]]
+        if model is Task:
+            return self.task_contribution(*args)
+        elif model is Resource:
+            return self.resource_contribution(*args)
+        return self.budget_contribution(*args)
+    
+    def snapshot(self, obj) -> Optional[RollupSnapshot]:
+        if obj is None:
+            return None
+        return obj.project_id, self.contribution(type(obj), lambda name: getattr(obj, name))
+    
+    def record_change(
+        self,
+        before: Optional[RollupSnapshot],
+        after: Optional[RollupSnapshot],
+    ):
+        self.record_changes([(before, after)])
+    
+    def record_changes(
+        self,
+        changes: Iterable[Tuple[Optional[RollupSnapshot], Optional[RollupSnapshot]]],
+    ):
+        # Deltas are summed per project first, so a batch of changes costs
+        # one rollup UPDATE per project rather than one per row.
+        deltas: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for before, after in changes:
+            if before is not None:
+                project_id, contribution = before
+                for column, value in contribution.items():
+                    deltas[project_id][column] -= value
+            if after is not None:
+                project_id, contribution = after
+                for column, value in contribution.items():
+                    deltas[project_id][column] += value
+        
+        for project_id, delta in deltas.items():
+            self.apply_delta(project_id, delta)
+    
+    def record_insert(self, obj):
+        if isinstance(obj, Project):
+            # A new project starts with an all-zero rollup row.
+            self.rebuild([obj.id])
+            return
+        self.record_change(None, self.snapshot(obj))
+    
+    def record_delete(self, obj):
+        self.record_change(self.snapshot(obj), None)
+    
+    def record_inserts(self, model, records: Iterable[Dict]):
+        # For rows inserted with Core, which never become ORM objects.
+        self.record_row_changes(model, ((None, record) for record in records))
+    
+    def record_row_changes(
+        self,
+        model,
+        changes: Iterable[Tuple[Optional[Dict], Optional[Dict]]],
+    ):
+        # Before/after values (project_id plus the model's contribution
+        # columns) of rows written with Core; None where there was no row.
+        def snapshot(record: Optional[Dict]) -> Optional[RollupSnapshot]:
+            if record is None:
+                return None
+            return record["project_id"], self.contribution(model, record.get)
+        
+        self.record_changes((snapshot(before), snapshot(after)) for before, after in changes)
+    
+    def ensure_rollups(self, project_ids: Iterable[int]):
+        # Imported projects: new ones (and any predating the table) get a
+        # rollup row; existing rows are left alone, as project fields do
+        # not feed the rollup.
+        project_ids = set(project_ids)
+        if not project_ids:
+            return
+        existing = self.db.execute(
+            select(ProjectRollup.project_id).where(ProjectRollup.project_id.in_(project_ids))
+        ).scalars().all()
+        self.rebuild(project_ids - set(existing))
+    
+    def apply_delta(self, project_id: int, delta: Dict[str, float]):
+        # Runs even when the sums are unchanged (e.g. a renamed task): the
+        # data_version bump is what conditional GETs see.
+        values = {
+            column: getattr(ProjectRollup, column) + value
+            for column, value in delta.items() if value
+        }
+        values["data_version"] = ProjectRollup.data_version + 1
+        values["updated_at"] = datetime.utcnow()
+        
+        result = self.db.execute(
+            update(ProjectRollup)
+            .where(ProjectRollup.project_id == project_id)
+            .values(**values)
+        )
+        if result.rowcount == 0:
+            # No rollup row yet (e.g. data that predates the table): build it
+            # from the base tables, which already include this change.
+            self.rebuild([project_id])
+    
+    def get_rollups(self, project_ids: List[int]) -> Dict[int, Dict[str, float]]:
+        if not project_ids:
+            return {}
+        
+        rows = self.db.execute(
+            select(ProjectRollup.project_id, *[
+                getattr(ProjectRollup, column) for column in ROLLUP_COLUMNS
+            ]).where(ProjectRollup.project_id.in_(project_ids))
+        ).all()
+        rollups = {row.project_id: self._row_to_dict(row) for row in rows}
+        
+        missing = [pid for pid in project_ids if pid not in rollups]
+        if missing:
+            rows = self.db.execute(self._aggregate_select(missing)).all()
+            rollups.update({row.project_id: self._row_to_dict(row) for row in rows})
+        
+        return rollups
+    
+    def rebuild(self, project_ids: Optional[Iterable[int]] = None) -> int:
+        self.db.flush()
+        project_ids = list(project_ids) if project_ids is not None else None
+        if project_ids is not None and not project_ids:
+            return 0
+        
+        # An upsert rather than delete-then-insert: two transactions may
+        # rebuild the same project (overlapping imports, a rebuild-on-miss),
+        # and the second would otherwise insert a row the first already has.
+        # A rebuilt row continues its data_version instead of restarting at
+        # zero, so the counter never returns to a value it had before.
+        dialect_insert = (
+            sqlite.insert if self.db.get_bind().dialect.name == "sqlite" else postgresql.insert
+        )
+        # SQLite needs a WHERE in INSERT ... SELECT ... ON CONFLICT to parse it.
+        aggregate = self._aggregate_select(project_ids, with_timestamp=True).where(true())
+        columns = [*ROLLUP_COLUMNS, "updated_at"]
+        stmt = dialect_insert(ProjectRollup).from_select(["project_id", *columns], aggregate)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProjectRollup.project_id],
+            set_={
+                **{column: stmt.excluded[column] for column in columns},
+                "data_version": ProjectRollup.data_version + 1,
+            },
+        )
+        return self.db.execute(stmt).rowcount
+    
+    def _aggregate_select(
+        self, project_ids: Optional[List[int]] = None, with_timestamp: bool = False
+    ):
+        task_agg = select(
+            Task.project_id.label("project_id"),
+            func.count(Task.id).label("total_tasks"),
+            *[
+                func.count(Task.id).filter(Task.status == status).label(column)
+                for status, column in TASK_STATUS_COLUMNS.items()
+            ],
+            func.count(Task.id).filter(
+                Task.status != TaskStatus.COMPLETED,
+                Task.planned_end_date.isnot(None),
+            ).label("overdue_candidate_tasks"),
+        ).group_by(Task.project_id)
+        
+        resource_agg = select(
+            Resource.project_id.label("project_id"),
+            func.count(Resource.id).label("total_resources"),
+            *[
+                func.count(Resource.id).filter(
+                    Resource.resource_type == resource_type
+                ).label(count_column)
+                for resource_type, (count_column, _) in RESOURCE_TYPE_COLUMNS.items()
+            ],
+            *[
+                func.coalesce(func.sum(Resource.total_cost).filter(
+                    Resource.resource_type == resource_type
+                ), 0.0).label(cost_column)
+                for resource_type, (_, cost_column) in RESOURCE_TYPE_COLUMNS.items()
+            ],
+        ).group_by(Resource.project_id)
+        
+        budget_agg = select(
+            Budget.project_id.label("project_id"),
+            func.count(Budget.id).label("budget_lines"),
+            func.coalesce(func.sum(Budget.planned_amount), 0.0).label("budget_planned"),
+            func.coalesce(func.sum(Budget.actual_amount), 0.0).label("budget_actual"),
+        ).group_by(Budget.project_id)
+        
+        if project_ids is not None:
+            task_agg = task_agg.where(Task.project_id.in_(project_ids))
+            resource_agg = resource_agg.where(Resource.project_id.in_(project_ids))
+            budget_agg = budget_agg.where(Budget.project_id.in_(project_ids))
+        
+        task_agg = task_agg.subquery()
+        resource_agg = resource_agg.subquery()
+        budget_agg = budget_agg.subquery()
+        
+        columns = [Project.id.label("project_id")]
+        for column in ROLLUP_COLUMNS:
+            for agg in (task_agg, resource_agg, budget_agg):
+                if column in agg.c:
+                    columns.append(func.coalesce(agg.c[column], 0).label(column))
+                    break
+        if with_timestamp:
+            columns.append(literal(datetime.utcnow()).label("updated_at"))
+        
+        stmt = (
+            select(*columns)
+            .outerjoin(task_agg, task_agg.c.project_id == Project.id)
+            .outerjoin(resource_agg, resource_agg.c.project_id == Project.id)
+            .outerjoin(budget_agg, budget_agg.c.project_id == Project.id)
+        )
+        if project_ids is not None:
+            stmt = stmt.where(Project.id.in_(project_ids))
+        return stmt
+    
+    @staticmethod
+    def _row_to_dict(row) -> Dict[str, float]:
+        return {column: getattr(row, column) or 0 for column in ROLLUP_COLUMNS}
\ No newline at end of file
@@ -0,0 +1,136 @@
+import enum
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import insert, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.auth.scoping import user_scope
+from app.services.rollup_service import CONTRIBUTION_COLUMNS, RollupService
+
+# An update without an expected version retries when a concurrent write
+# replaced the row between its snapshot and the UPDATE.
+UPDATE_ATTEMPTS = 3
+
+
+class WriteOutcome(str, enum.Enum):
+    UPDATED = "updated"
+    NOT_FOUND = "not_found"
+    FORBIDDEN = "forbidden"
+    CONFLICT = "conflict"
+
+
+class ScopedWriter:
+    # Writes return the stored row from the statement itself (INSERT ...
+    # RETURNING, UPDATE ... WHERE id AND <user scope> AND version RETURNING),
+    # so a successful write costs one statement and the COMMIT. Only an
+    # UPDATE that matched nothing runs a SELECT, to tell a missing row, an
+    # out-of-scope row and a stale version apart. Every UPDATE bumps the
+    # row's version (the column's onupdate), which is what makes the
+    # version check safe without row locks.
+    def __init__(self, db: AsyncSession, current_user: dict):
+        self.db = db
+        self.current_user = current_user
+    
+    async def insert(self, model, values: Dict[str, Any]):
+        def write(session: Session):
+            obj = session.execute(insert(model).values(**values).returning(model)).scalar_one()
+            RollupService(session).record_insert(obj)
+            return obj
+        
+        obj = await self.db.run_sync(write)
+        await self.db.commit()
+        return obj
+    
+    async def update(
+        self,
+        model,
+        row_id: int,
+        values: Dict[str, Any],
+        version: Optional[int] = None,
+    ) -> Tuple[WriteOutcome, Optional[Any]]:
+        for _ in range(UPDATE_ATTEMPTS):
+            outcome, obj = await self.db.run_sync(
+                lambda session: self._update(session, model, row_id, values, version)
+            )
+            if outcome != WriteOutcome.CONFLICT or version is not None:
+                break
+        
+        if outcome == WriteOutcome.UPDATED:
+            await self.db.commit()
+        else:
+            await self.db.rollback()
+        return outcome, obj
+    
+    def _update(
+        self,
+        session: Session,
+        model,
+        row_id: int,
+        values: Dict[str, Any],
+        version: Optional[int],
+    ) -> Tuple[WriteOutcome, Optional[Any]]:
+        scope = user_scope(model, self.current_user)
+        criteria = [model.id == row_id]
+        if scope is not None:
+            criteria.append(scope)
+        if version is not None:
+            criteria.append(model.version == version)
+        
+        if not values:
+            # Nothing to write: no version bump, but the same checks.
+            obj = session.execute(select(model).where(*criteria)).scalar_one_or_none()
+            if obj is None:
+                return self._diagnose(session, model, row_id, scope), None
+            return WriteOutcome.UPDATED, obj
+        
+        stmt = update(model).where(*criteria).values(**values)
+        columns = ("project_id", *CONTRIBUTION_COLUMNS.get(model, ()))
+        before = None
+        if model not in CONTRIBUTION_COLUMNS:
+            stmt = stmt.returning(model)
+        elif session.get_bind().dialect.name == "postgresql":
+            # The rollup delta needs the replaced values. A FROM subquery
+            # reads them from the statement's snapshot, and the version match
+            # ensures that snapshot is the row version being replaced.
+            old = select(
+                model.id.label("old_id"),
+                model.version.label("old_version"),
+                *[getattr(model, column).label(f"old_{column}") for column in columns],
+            ).where(model.id == row_id).subquery("old")
+            stmt = stmt.where(
+                model.id == old.c.old_id, model.version == old.c.old_version
+            ).returning(model, *[old.c[f"old_{column}"] for column in columns])
+        else:
+            # SQLite's RETURNING cannot read other FROM items, so the replaced
+            # values are read first and pinned by their version.
+            before = session.execute(
+                select(model.version, *[getattr(model, column) for column in columns])
+                .where(model.id == row_id)
+            ).first()
+            if before is None:
+                return WriteOutcome.NOT_FOUND, None
+            stmt = stmt.where(model.version == before.version).returning(model)
+        
+        row = session.execute(stmt.execution_options(synchronize_session=False)).first()
+        if row is None:
+            return self._diagnose(session, model, row_id, scope), None
+        
+        obj = row[0]
+        if model in CONTRIBUTION_COLUMNS:
+            old_values = dict(zip(columns, row[1:] if before is None else before[1:]))
+            rollups = RollupService(session)
+            rollups.record_change(
+                (old_values["project_id"], rollups.contribution(model, old_values.get)),
+                rollups.snapshot(obj),
+            )
+        return WriteOutcome.UPDATED, obj
+    
+    def _diagnose(self, session: Session, model, row_id: int, scope) -> WriteOutcome:
+        row = session.execute(
+            select(model.id, (true() if scope is None else scope).label("allowed"))
+            .where(model.id == row_id)
+        ).first()
+        if row is None:
+            return WriteOutcome.NOT_FOUND
+        if not row.allowed:
+            return WriteOutcome.FORBIDDEN
+        return WriteOutcome.CONFLICT
\ No newline at end of file
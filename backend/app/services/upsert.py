@@ -0,0 +1,204 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+import pandas as pd
+from sqlalchemy import String, Table, Text, bindparam, func, select, tuple_, update
+from sqlalchemy.orm import Session
+from app.services.bulk_loader import insert_frame
+from app.services.import_pipeline import RejectionLog, frame_to_records
+
+DUPLICATE_KEY = "duplicate natural key in file (last row wins)"
+
+UpsertCounts = Dict[str, int]
+
+_process_locks: Dict[str, threading.Lock] = {}
+_process_locks_guard = threading.Lock()
+
+
+@contextmanager
+def natural_key_lock(db: Session, table: Table) -> Iterator[None]:
+    # Natural keys have no unique index (existing data may already repeat
+    # them), so two upserts sharing a key would both find it missing and
+    # both insert it. Writers of a table take turns from the lookup until
+    # their transaction commits. On PostgreSQL the lock is transaction
+    # scoped and works across processes; elsewhere it covers this process.
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"upsert:{table.name}"))))
+        yield
+        return
+    with _process_locks_guard:
+        lock = _process_locks.setdefault(table.name, threading.Lock())
+    with lock:
+        yield
+
+
+class NaturalKeyUpserter:
+    def __init__(
+        self,
+        db: Session,
+        table: Table,
+        keys: List[str],
+        project_column: Optional[str] = "project_id",
+        batch_size: int = 5000,
+        tracked: Sequence[str] = (),
+    ):
+        self.db = db
+        self.table = table
+        self.keys = keys
+        # Column holding the owning project; None when the rows are projects.
+        self.project_column = project_column
+        self.batch_size = batch_size
+        # Columns whose before/after values the last upsert leaves in
+        # `changes`, together with the project column; None for no row.
+        self.tracked = list(tracked)
+        self.changes: List[Tuple[Optional[Dict], Optional[Dict]]] = []
+    
+    def upsert(
+        self, frame: pd.DataFrame, rejections: RejectionLog, dry_run: bool = False
+    ) -> Tuple[UpsertCounts, Set[int]]:
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        missing = [key for key in self.keys if key not in frame.columns]
+        if missing:
+            raise Exception(
+                f"Natural key column(s) {', '.join(missing)} are not imported "
+                f"for {self.table.name}"
+            )
+        if frame.empty:
+            return counts, set()
+        
+        key_names = [f"_key_{i}" for i in range(len(self.keys))]
+        key_frame = pd.DataFrame({
+            name: self._normalize(frame[key], key)
+            for name, key in zip(key_names, self.keys)
+        }, index=frame.index)
+        
+        keep = pd.Series(True, index=frame.index)
+        keep = rejections.reject(keep, key_frame.duplicated(keep="last"), DUPLICATE_KEY)
+        frame, key_frame = frame[keep], key_frame[keep]
+        
+        existing = self._fetch_existing(key_frame, list(frame.columns), key_names)
+        merged = key_frame.join(frame).reset_index().merge(
+            existing, on=key_names, how="left", suffixes=("", "_db")
+        ).set_index("index")
+        
+        matched = merged["_id"].notna()
+        changed = pd.Series(False, index=merged.index)
+        for column in frame.columns:
+            changed |= ~self._same(merged[column], merged[f"{column}_db"])
+        
+        new_rows = frame[~matched]
+        updates = merged[matched & changed]
+        counts["unchanged"] = int((matched & ~changed).sum())
+        if dry_run:
+            counts["inserted"] = len(new_rows)
+            counts["updated"] = len(updates)
+            return counts, set()
+        
+        touched: Set[int] = set()
+        inserted_ids = insert_frame(
+            self.db,
+            self.table,
+            new_rows,
+            self.batch_size,
+            returning=self.project_column is None,
+        )
+        counts["inserted"] = len(new_rows)
+        counts["updated"] = self._update_rows(updates, list(frame.columns))
+        if self.tracked:
+            self.changes = self._changes(new_rows, updates)
+        
+        if self.project_column is None:
+            touched.update(inserted_ids)
+            touched.update(updates["_id"].astype("int64").tolist())
+        else:
+            touched.update(new_rows[self.project_column].tolist())
+            touched.update(updates[self.project_column].tolist())
+            touched.update(updates[f"{self.project_column}_db"].dropna().astype("int64").tolist())
+        return counts, {int(pid) for pid in touched}
+    
+    def _changes(
+        self, new_rows: pd.DataFrame, updates: pd.DataFrame
+    ) -> List[Tuple[Optional[Dict], Optional[Dict]]]:
+        columns = [self.project_column, *self.tracked]
+        stored = updates[[f"{column}_db" for column in columns]].set_axis(columns, axis=1)
+        stored = stored.astype({self.project_column: "int64"})
+        changes = [(None, record) for record in frame_to_records(new_rows[columns])]
+        changes.extend(zip(frame_to_records(stored), frame_to_records(updates[columns])))
+        return changes
+    
+    def _key_expression(self, key: str):
+        column = self.table.c[key]
+        if isinstance(column.type, (String, Text)):
+            return func.lower(func.trim(column))
+        return column
+    
+    def _normalize(self, values: pd.Series, key: str) -> pd.Series:
+        # Text keys match case-insensitively, like project name resolution.
+        if isinstance(self.table.c[key].type, (String, Text)):
+            return values.where(values.isna(), values.astype(str).str.strip().str.lower())
+        return values
+    
+    def _fetch_existing(
+        self, key_frame: pd.DataFrame, columns: List[str], key_names: List[str]
+    ) -> pd.DataFrame:
+        expressions = [self._key_expression(key) for key in self.keys]
+        target = expressions[0] if len(expressions) == 1 else tuple_(*expressions)
+        distinct_keys = key_frame.drop_duplicates()
+        if len(expressions) == 1:
+            values = distinct_keys[key_names[0]].tolist()
+        else:
+            values = list(distinct_keys.itertuples(index=False, name=None))
+        
+        rows = []
+        for start in range(0, len(values), self.batch_size):
+            batch = values[start:start + self.batch_size]
+            rows.extend(self.db.execute(
+                select(
+                    self.table.c.id.label("_id"),
+                    *[expr.label(name) for expr, name in zip(expressions, key_names)],
+                    *[self.table.c[column].label(f"{column}_db") for column in columns],
+                ).where(target.in_(batch))
+            ).all())
+        
+        existing = pd.DataFrame(
+            rows, columns=["_id", *key_names, *[f"{column}_db" for column in columns]]
+        )
+        if existing.empty:
+            existing = existing.astype(key_frame.dtypes.to_dict())
+        # Rows already duplicated in the table: the newest one is updated.
+        return existing.sort_values("_id").drop_duplicates(key_names, keep="last")
+    
+    @staticmethod
+    def _same(incoming: pd.Series, stored: pd.Series) -> pd.Series:
+        if pd.api.types.is_datetime64_any_dtype(incoming):
+            stored = pd.to_datetime(stored)
+        both_missing = incoming.isna() & stored.isna()
+        return both_missing | (incoming == stored).fillna(False).astype(bool)
+    
+    def _update_rows(self, updates: pd.DataFrame, columns: List[str]) -> int:
+        if updates.empty:
+            return 0
+        
+        values = {column: bindparam(f"new_{column}") for column in columns}
+        if "updated_at" in self.table.c:
+            values["updated_at"] = bindparam("new_updated_at")
+        stmt = (
+            update(self.table)
+            .where(self.table.c.id == bindparam("row_id"))
+            .values(values)
+        )
+        
+        now = datetime.utcnow()
+        records = frame_to_records(updates[columns])
+        params = []
+        for row_id, record in zip(updates["_id"].astype("int64").tolist(), records):
+            param = {f"new_{column}": value for column, value in record.items()}
+            param["row_id"] = row_id
+            if "updated_at" in self.table.c:
+                param["new_updated_at"] = now
+            params.append(param)
+        
+        for start in range(0, len(params), self.batch_size):
+            self.db.execute(stmt, params[start:start + self.batch_size])
+        return len(params)
\ No newline at end of file
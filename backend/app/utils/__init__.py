@@ -1,3 +1,5 @@
 from app.utils.seed_data import seed_database
+from app.utils.query_counter import QueryCounter
+from app.utils.rebuild_rollups import rebuild_rollups
 
-__all__ = ["seed_database"]
\ No newline at end of file
+__all__ = ["seed_database", "QueryCounter", "rebuild_rollups"]
\ No newline at end of file
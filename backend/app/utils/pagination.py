@@ -0,0 +1,113 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.types import DateTime
+
+
+class Pagination:
+    # Rows are ordered by (sort column, id) so the order is total and stable.
+    # A cursor carries the last row's sort value and id, and the next page
+    # starts strictly after it: no OFFSET scan, and concurrent inserts cannot
+    # shift rows between pages. skip/limit keeps working for older clients.
+    def __init__(
+        self,
+        model,
+        sort: str = "id",
+        limit: int = 50,
+        skip: int = 0,
+        cursor: Optional[str] = None,
+    ):
+        if cursor and skip:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Use either cursor or skip, not both",
+            )
+        self.model = model
+        self.sort = sort
+        self.sort_column = getattr(model, sort)
+        self.id_column = model.id
+        self.limit = limit
+        self.skip = skip
+        self.after = self._decode(cursor) if cursor else None
+        self.next_cursor: Optional[str] = None
+    
+    def apply(self, stmt: Select) -> Select:
+        if self.after is not None:
+            stmt = stmt.where(self._after(*self.after))
+        if self.sort == "id":
+            stmt = stmt.order_by(self.id_column)
+        else:
+            stmt = stmt.order_by(self.sort_column.asc().nulls_last(), self.id_column)
+        if self.skip:
+            stmt = stmt.offset(self.skip)
+        # One row beyond the page tells whether there is a next page.
+        return stmt.limit(self.limit + 1)
+    
+    def page(self, rows: List[Any]) -> List[Any]:
+        rows = list(rows)
+        if len(rows) > self.limit > 0:
+            last = rows[self.limit - 1]
+            self.next_cursor = self._encode(getattr(last, self.sort), last.id)
+        return rows[:max(self.limit, 0)]
+    
+    def set_headers(self, response: Response, total_estimate: Optional[int] = None):
+        if self.next_cursor:
+            response.headers["X-Next-Cursor"] = self.next_cursor
+        if total_estimate is not None:
+            response.headers["X-Total-Count-Estimate"] = str(total_estimate)
+    
+    def _after(self, value, row_id: int):
+        if self.sort == "id":
+            return self.id_column > row_id
+        column = self.sort_column
+        if not column.nullable:
+            return tuple_(column, self.id_column) > tuple_(value, row_id)
+        # NULLs sort last, so they follow every non-NULL value.
+        if value is None:
+            return and_(column.is_(None), self.id_column > row_id)
+        return or_(
+            column > value,
+            and_(column == value, self.id_column > row_id),
+            column.is_(None),
+        )
+    
+    def _encode(self, value, row_id: int) -> str:
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps([self.sort, value, row_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+    
+    def _decode(self, cursor: str):
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            sort, value, row_id = json.loads(payload)
+            if sort != self.sort or not isinstance(row_id, int):
+                raise ValueError("cursor was issued for a different sort")
+            if value is not None and isinstance(self.sort_column.type, DateTime):
+                value = datetime.fromisoformat(value)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        return value, row_id
+
+
+def estimate_count(session: Session, stmt: Select) -> Optional[int]:
+    # The planner's row estimate for the filtered query: it comes from table
+    # statistics, so it costs no scan but can be off after bulk changes.
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    sql = stmt.order_by(None).limit(None).offset(None).compile(
+        dialect=bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
\ No newline at end of file
@@ -0,0 +1,24 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class QueryCounter:
+    def __init__(self, db: Session):
+        self.connection = db.connection()
+        self.count = 0
+    
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        self.count += 1
+    
+    def __enter__(self) -> "QueryCounter":
+        event.listen(
+            self.connection, "before_cursor_execute", self._before_cursor_execute
+        )
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(
+            self.connection, "before_cursor_execute", self._before_cursor_execute
+        )
\ No newline at end of file
@@ -0,0 +1,30 @@
+#Run with: docker-compose exec backend python -m app.utils.rebuild_rollups [project_id ...]
+
+import sys
+from app.database import SessionLocal
+from app.services.rollup_service import RollupService
+
+
+def rebuild_rollups(project_ids=None):
+    db = SessionLocal()
+    
+    try:
+        scope = "all projects" if project_ids is None else f"projects {project_ids}"
+        print(f"Rebuilding project rollups for {scope}...")
+        
+        count = RollupService(db).rebuild(project_ids)
+        db.commit()
+        
+        print(f"Rebuilt {count} project rollups")
+        return count
+    except Exception as e:
+        print(f"Error rebuilding rollups: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    ids = [int(arg) for arg in sys.argv[1:]] or None
+    rebuild_rollups(ids)
\ No newline at end of file
@@ -8,6 +8,7 @@ from app.models import (
     Resource, ResourceType, ResourceStatus,
     Budget
 )
+from app.services.rollup_service import RollupService
 
 
 def seed_database():
@@ -290,6 +291,10 @@ def seed_database():
         db.commit()
         print(f"Created {len(budgets)} budget entries")
         
+        RollupService(db).rebuild([proj.id for proj in projects])
+        db.commit()
+        print(f"Built {len(projects)} project rollups")
+        
         print("\nDatabase seeding completed successfully!")
         print(f"📊 Summary:")
         print(f"   - Projects: {len(projects)}")
@@ -79,7 +79,7 @@ const Budgets: React.FC = () => {
       };
 
       if (editingBudget) {
-        await budgetsAPI.update(editingBudget.id, submitData);
+        await budgetsAPI.update(editingBudget.id, { ...submitData, version: editingBudget.version });
       } else {
         await budgetsAPI.create(submitData);
       }
@@ -1,22 +1,106 @@
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
 import { Card, CardHeader, CardBody } from "../components/Card";
 import Button from "../components/Button";
-import { importAPI } from "../services/API";
+import {
+  importAPI,
+  ImportJob,
+  ImportMode,
+  ImportValidationReport,
+} from "../services/API";
+
+const POLL_INTERVAL_MS = 1000;
+
+const isActive = (job: ImportJob | null) =>
+  job !== null && (job.status === "queued" || job.status === "running");
 
 const Import: React.FC = () => {
   const [selectedFile, setSelectedFile] = useState<File | null>(null);
   const [uploading, setUploading] = useState(false);
+  const [job, setJob] = useState<ImportJob | null>(null);
+  const [mode, setMode] = useState<ImportMode>("insert");
+  const [report, setReport] = useState<ImportValidationReport | null>(null);
   const [result, setResult] = useState<any>(null);
   const [error, setError] = useState<string | null>(null);
 
+  useEffect(() => {
+    if (!job || !isActive(job)) return;
+
+    const timer = setTimeout(async () => {
+      try {
+        const response = await importAPI.getJob(job.id);
+        const updated = response.data;
+        setJob(updated);
+        if (updated.status === "completed") {
+          setResult(updated);
+        } else if (updated.status === "cancelled") {
+          setError("Import cancelled. Batches committed before the cancel were kept.");
+        } else if (!isActive(updated)) {
+          setError(updated.error || `Import ${updated.status}`);
+        }
+      } catch (err: any) {
+        setError(err.response?.data?.detail || "Failed to fetch import status");
+        setJob(null);
+      }
+    }, POLL_INTERVAL_MS);
+
+    return () => clearTimeout(timer);
+  }, [job]);
+
+  const handleCancel = async () => {
+    if (!job) return;
+    try {
+      const response = await importAPI.cancelJob(job.id);
+      setJob(response.data);
+    } catch (err: any) {
+      setError(err.response?.data?.detail || "Failed to cancel import");
+    }
+  };
+
   const handleFileChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     if (e.target.files && e.target.files[0]) {
       setSelectedFile(e.target.files[0]);
       setResult(null);
+      setReport(null);
       setError(null);
     }
   };
 
+  const upload = (file: File, dryRun: boolean) => {
+    if (file.name.endsWith(".xlsx") || file.name.endsWith(".xls")) {
+      return importAPI.uploadExcel(file, mode, dryRun);
+    } else if (file.name.endsWith(".csv")) {
+      return importAPI.uploadCSV(file, mode, dryRun);
+    } else if (file.name.endsWith(".parquet")) {
+      return importAPI.uploadParquet(file, mode, dryRun);
+    }
+    throw new Error(
+      "Invalid file type. Please upload .xlsx, .xls, .csv, or .parquet files"
+    );
+  };
+
+  const handleValidate = async () => {
+    if (!selectedFile) {
+      setError("Please select a file first");
+      return;
+    }
+
+    setUploading(true);
+    setError(null);
+    setResult(null);
+    setReport(null);
+
+    try {
+      const response = await upload(selectedFile, true);
+      setReport(response.data);
+    } catch (err: any) {
+      setError(
+        err.response?.data?.detail || err.message || "Failed to validate file"
+      );
+    } finally {
+      setUploading(false);
+    }
+  };
+
   const handleUpload = async () => {
     if (!selectedFile) {
       setError("Please select a file first");
@@ -26,23 +110,18 @@ const Import: React.FC = () => {
     setUploading(true);
     setError(null);
     setResult(null);
+    setReport(null);
+    setJob(null);
 
     try {
-      let response;
-      if (
-        selectedFile.name.endsWith(".xlsx") ||
-        selectedFile.name.endsWith(".xls")
-      ) {
-        response = await importAPI.uploadExcel(selectedFile);
-      } else if (selectedFile.name.endsWith(".csv")) {
-        response = await importAPI.uploadCSV(selectedFile);
+      const response = await upload(selectedFile, false);
+
+      if (response.data.duplicate) {
+        setResult(response.data);
       } else {
-        throw new Error(
-          "Invalid file type. Please upload .xlsx, .xls, or .csv files"
-        );
+        const jobResponse = await importAPI.getJob(response.data.job_id);
+        setJob(jobResponse.data);
       }
-
-      setResult(response.data);
       setSelectedFile(null);
       const fileInput = document.getElementById(
         "file-upload"
@@ -104,7 +183,7 @@ const Import: React.FC = () => {
                     name="file-upload"
                     type="file"
                     className="sr-only"
-                    accept=".xlsx,.xls,.csv"
+                    accept=".xlsx,.xls,.csv,.parquet"
                     onChange={handleFileChange}
                   />
                 </label>
@@ -113,7 +192,7 @@ const Import: React.FC = () => {
                 </p>
               </div>
               <p className="text-xs text-gray-500 mt-2">
-                XLSX, XLS, or CSV up to 10MB
+                XLSX or XLS up to 10MB, CSV or Parquet up to 4GB
               </p>
             </div>
           </div>
@@ -155,15 +234,106 @@ const Import: React.FC = () => {
             </div>
           )}
 
-          <div className="flex justify-end">
-            <Button
-              onClick={handleUpload}
-              disabled={!selectedFile || uploading}
-            >
-              {uploading ? "Uploading..." : "Upload and Import"}
-            </Button>
+          <div className="flex justify-between items-center">
+            <label className="flex items-center text-sm text-gray-700">
+              <input
+                type="checkbox"
+                className="mr-2"
+                checked={mode === "upsert"}
+                onChange={(e) => setMode(e.target.checked ? "upsert" : "insert")}
+              />
+              Update existing records instead of adding duplicates
+            </label>
+            <div className="flex space-x-2">
+              <Button
+                variant="secondary"
+                onClick={handleValidate}
+                disabled={!selectedFile || uploading || isActive(job)}
+              >
+                Validate only
+              </Button>
+              <Button
+                onClick={handleUpload}
+                disabled={!selectedFile || uploading || isActive(job)}
+              >
+                {uploading ? "Uploading..." : "Upload and Import"}
+              </Button>
+            </div>
           </div>
 
+          {report && (
+            <div className="bg-gray-50 border border-gray-300 text-gray-800 px-4 py-3 rounded">
+              <h4 className="font-semibold mb-2">
+                Validation report (nothing was imported)
+              </h4>
+              <p className="text-sm mb-2">
+                Detected:{" "}
+                {Object.entries(report.detected)
+                  .map(([entity, sheet]) => (sheet ? `${entity} (${sheet})` : entity))
+                  .join(", ")}
+              </p>
+              {Object.entries(report.entities).map(([entity, summary]) => (
+                <div key={entity} className="text-sm mb-3">
+                  <p className="font-medium">
+                    {entity}: {summary.imported} of {summary.processed} rows
+                    would be imported
+                    {report.mode === "upsert" &&
+                      ` (${summary.inserted} new, ${summary.updated} updated, ${summary.unchanged} unchanged)`}
+                  </p>
+                  <ul className="list-disc list-inside">
+                    {summary.reasons.map((reason) => (
+                      <li key={reason.reason}>
+                        {reason.count} rejected: {reason.reason} (rows{" "}
+                        {reason.sample_rows.join(", ")}
+                        {reason.count > reason.sample_rows.length ? ", ..." : ""})
+                      </li>
+                    ))}
+                  </ul>
+                  {summary.unresolved_projects.length > 0 && (
+                    <p>
+                      Unresolved projects:{" "}
+                      {summary.unresolved_projects
+                        .slice(0, 10)
+                        .map((ref) => `${ref.reference} (${ref.rows})`)
+                        .join(", ")}
+                    </p>
+                  )}
+                </div>
+              ))}
+            </div>
+          )}
+
+          {job && isActive(job) && (
+            <div className="bg-blue-50 border border-blue-400 text-blue-700 px-4 py-3 rounded">
+              <div className="flex justify-between items-center">
+                <h4 className="font-semibold">
+                  {job.status === "queued" ? "Import queued" : "Importing"}{" "}
+                  {job.filename}...
+                </h4>
+                <Button
+                  variant="secondary"
+                  size="sm"
+                  onClick={handleCancel}
+                  disabled={job.cancel_requested}
+                >
+                  {job.cancel_requested ? "Cancelling..." : "Cancel"}
+                </Button>
+              </div>
+              <div className="text-sm space-y-1 mt-2">
+                {Object.entries(job.progress).map(([entity, counts]) => (
+                  <p key={entity}>
+                    {entity}: {counts.imported} imported, {counts.rejected}{" "}
+                    rejected of {counts.processed} rows
+                  </p>
+                ))}
+                <p>
+                  {job.rows_processed} rows in {job.elapsed_seconds}s (
+                  {job.rows_per_second} rows/s)
+                </p>
+              </div>
+            </div>
+          )}
+
           {error && (
             <div className="bg-red-50 border border-red-400 text-red-700 px-4 py-3 rounded">
               {error}
@@ -173,6 +343,11 @@ const Import: React.FC = () => {
           {result && (
             <div className="bg-green-50 border border-green-400 text-green-700 px-4 py-3 rounded">
               <h4 className="font-semibold mb-2">Import Successful!</h4>
+              {result.duplicate && (
+                <p className="text-sm mb-2">
+                  This file was already imported; nothing was changed.
+                </p>
+              )}
               <div className="text-sm space-y-1">
                 {result.stats?.projects !== undefined && (
                   <p>Projects imported: {result.stats.projects}</p>
@@ -186,6 +361,15 @@ const Import: React.FC = () => {
                 {result.stats?.budgets !== undefined && (
                   <p>Budgets imported: {result.stats.budgets}</p>
                 )}
+                {result.mode === "upsert" &&
+                  Object.entries(result.progress || {}).map(
+                    ([entity, counts]: [string, any]) => (
+                      <p key={entity}>
+                        {entity}: {counts.inserted} new, {counts.updated}{" "}
+                        updated, {counts.unchanged} unchanged
+                      </p>
+                    )
+                  )}
               </div>
             </div>
           )}
@@ -233,9 +417,9 @@ const Import: React.FC = () => {
                 CSV Format (Single entity type)
               </h4>
               <p className="text-sm text-gray-600">
-                CSV files should contain columns matching one of the formats
-                above. The system will auto-detect the entity type based on
-                the columns.
+                CSV and Parquet files should contain columns matching one of
+                the formats above. The system will auto-detect the entity type
+                based on the columns.
               </p>
             </div>
           </div>
@@ -77,7 +77,7 @@ const Projects: React.FC = () => {
       }
 
       if (editingProject) {
-        await projectsAPI.update(editingProject.id, submitData);
+        await projectsAPI.update(editingProject.id, { ...submitData, version: editingProject.version });
       } else {
         await projectsAPI.create(submitData);
       }
@@ -74,7 +74,7 @@ const Resources: React.FC = () => {
     };
 
     if (editingResource) {
-      await resourcesAPI.update(editingResource.id, submitData);
+      await resourcesAPI.update(editingResource.id, { ...submitData, version: editingResource.version });
     } else {
       await resourcesAPI.create(submitData);
     }
@@ -87,7 +87,7 @@ const Tasks: React.FC = () => {
       }
 
       if (editingTask) {
-        await tasksAPI.update(editingTask.id, submitData);
+        await tasksAPI.update(editingTask.id, { ...submitData, version: editingTask.version });
       } else {
         await tasksAPI.create(submitData);
       }
@@ -50,6 +50,7 @@ export interface Project {
   location?: string;
   created_at: string;
   updated_at: string;
+  version: number;
 }
 
 export interface Task {
@@ -67,6 +68,7 @@ export interface Task {
   is_overdue: boolean;
   created_at: string;
   updated_at: string;
+  version: number;
 }
 
 export interface Resource {
@@ -83,6 +85,7 @@ export interface Resource {
   allocated_date: string;
   created_at: string;
   updated_at: string;
+  version: number;
 }
 
 export interface Budget {
@@ -97,6 +100,7 @@ export interface Budget {
   budget_date: string;
   created_at: string;
   updated_at: string;
+  version: number;
 }
 
 export interface DashboardStats {
@@ -222,25 +226,87 @@ export const analyticsAPI = {
     ),
 };
 
+export type ImportMode = "insert" | "upsert";
+
+export interface ImportJob {
+  id: number;
+  kind: "csv" | "excel" | "parquet";
+  mode: ImportMode;
+  filename: string;
+  status: "queued" | "running" | "completed" | "failed" | "cancelled" | "interrupted";
+  cancel_requested: boolean;
+  progress: Record<
+    string,
+    {
+      processed: number;
+      imported: number;
+      rejected: number;
+      inserted: number;
+      updated: number;
+      unchanged: number;
+    }
+  >;
+  stats: { projects: number; tasks: number; resources: number; budgets: number };
+  rows_processed: number;
+  rows_rejected: number;
+  elapsed_seconds: number;
+  rows_per_second: number;
+  error: string | null;
+}
+
+export interface ImportValidationReport {
+  dry_run: boolean;
+  mode: ImportMode;
+  detected: Record<string, string | null>;
+  entities: Record<
+    string,
+    {
+      processed: number;
+      imported: number;
+      rejected: number;
+      inserted: number;
+      updated: number;
+      unchanged: number;
+      reasons: { reason: string; count: number; sample_rows: number[] }[];
+      unresolved_projects: { reference: string; rows: number }[];
+    }
+  >;
+}
+
 export const importAPI = {
-  uploadExcel: (file: File) => {
+  uploadExcel: (file: File, mode: ImportMode = "insert", dryRun = false) => {
     const formData = new FormData();
     formData.append("file", file);
     return api.post("/api/import/excel", formData, {
+      params: { mode, dry_run: dryRun },
       headers: {
         "Content-Type": "multipart/form-data",
       },
     });
   },
-  uploadCSV: (file: File) => {
+  uploadCSV: (file: File, mode: ImportMode = "insert", dryRun = false) => {
     const formData = new FormData();
     formData.append("file", file);
     return api.post("/api/import/csv", formData, {
+      params: { mode, dry_run: dryRun },
+      headers: {
+        "Content-Type": "multipart/form-data",
+      },
+    });
+  },
+  uploadParquet: (file: File, mode: ImportMode = "insert", dryRun = false) => {
+    const formData = new FormData();
+    formData.append("file", file);
+    return api.post("/api/import/parquet", formData, {
+      params: { mode, dry_run: dryRun },
       headers: {
         "Content-Type": "multipart/form-data",
       },
     });
   },
+  getJob: (jobId: number) => api.get<ImportJob>(`/api/import/jobs/${jobId}`),
+  cancelJob: (jobId: number) =>
+    api.post<ImportJob>(`/api/import/jobs/${jobId}/cancel`),
 };
 
 export const authAPI = {